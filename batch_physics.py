@@ -0,0 +1,377 @@
+"""CS 108 A Final Project
+
+Part of the model for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the BatchSimulation class which steps many copies of a level
+at once using NumPy arrays, for level testing and difficulty analysis. NumPy
+is needed only by this module (see README.md); the game runs without it.
+
+Each copy (simulation) holds one Avatar per layout of the level, and every
+copy can be given its own input flags each tick. The results are the same as
+stepping a LevelState with the engine: Avatar.move, apply_gravity,
+prevent_obstructed_motion, is_impaled, and reached_exit are reproduced
+operation for operation, in the same order, against boolean tile bitmaps built
+from each Layout's blocks, spikes, and exits.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import numpy as np
+
+from engine import MOVE_LEFT, MOVE_RIGHT, JUMP
+from level_graphics_objects import Avatar
+
+# Avatar constants, shared with Avatar.
+GROUND_X_SPEED = Avatar.GROUND_X_SPEED
+JUMP_VEL = Avatar.JUMP_VEL
+TERMINAL_VELOCITY = Avatar.TERMINAL_VELOCITY
+
+# Bits marking the kinds of objects in a tile of a combined tile map.
+BLOCK_BIT = 1
+SPIKES_BIT = 2
+EXIT_BIT = 4
+
+# The number of empty tiles bordering each combined tile map, which must be at
+# least the number of rows or columns of tiles an Avatar can reach in a tick.
+TILE_MAP_BORDER = 8
+
+
+class BatchSimulation:
+    """Represents many simultaneous simulations of the same level, with the
+       state of every Avatar stored in NumPy arrays indexed by
+       [layout, simulation]."""
+
+    def __init__(self, layouts, num_simulations):
+        """Receives the list of Layouts making up the level and the number of
+           simulations to run at once, and places every Avatar at its spawn
+           point."""
+
+        self.num_layouts = len(layouts)
+        self.num_simulations = num_simulations
+        self.UNIT = layouts[0].UNIT
+        self.avatar_size = layouts[0].avatar.size
+
+        # Per-layout constants, shaped to broadcast over the simulations.
+        self.widths = np.array([[layout.layout_width] for layout in layouts],
+                               dtype=float)
+        self.heights = np.array([[layout.layout_height] for layout in layouts],
+                                dtype=float)
+        self.starting_x = np.array([[layout.avatar.starting_x]
+                                    for layout in layouts], dtype=float)
+        self.starting_y = np.array([[layout.avatar.starting_y]
+                                    for layout in layouts], dtype=float)
+
+        # Boolean [row, column] tile bitmaps of each layout's objects, all of
+        # the same shape.
+        self.max_rows = max(layout.height_in_layout_units
+                            for layout in layouts)
+        self.max_columns = max(layout.width_in_layout_units
+                               for layout in layouts)
+        for layout in layouts:
+            for level_object in layout.blocks + layout.spikes + layout.exits:
+                self.max_rows = max(self.max_rows,
+                                    int(level_object.y // self.UNIT) + 1)
+                self.max_columns = max(self.max_columns,
+                                       int(level_object.x // self.UNIT) + 1)
+        self.blocks = [self.tile_bitmap(layout, layout.blocks)
+                       for layout in layouts]
+        self.spikes = [self.tile_bitmap(layout, layout.spikes)
+                       for layout in layouts]
+        self.exits = [self.tile_bitmap(layout, layout.exits)
+                      for layout in layouts]
+
+        # The bitmaps combined into one flattened map of object bits per
+        # layout, with a border of empty tiles all around so that windows of
+        # tiles outside of the layout can be clipped onto the border.
+        border = TILE_MAP_BORDER
+        self.tile_map_rows = self.max_rows + 2*border
+        self.tile_map_columns = self.max_columns + 2*border
+        self.tile_maps = []
+        for blocks, spikes, exits in zip(self.blocks, self.spikes, self.exits):
+            tile_map = np.zeros((self.tile_map_rows, self.tile_map_columns),
+                                dtype=np.uint8)
+            tile_map[border:-border, border:-border] = (blocks * BLOCK_BIT |
+                                                        spikes * SPIKES_BIT |
+                                                        exits * EXIT_BIT)
+            self.tile_maps.append(tile_map.ravel())
+
+        shape = (self.num_layouts, num_simulations)
+        self.x = np.empty(shape)
+        self.y = np.empty(shape)
+        self.x_vel = np.zeros(shape)
+        self.y_vel = np.zeros(shape)
+        # A new Avatar is not in the air until gravity is first applied.
+        self.in_air = np.zeros(shape, dtype=bool)
+        self.beaten_layouts = np.zeros(shape, dtype=bool)
+        self.num_deaths = np.zeros(num_simulations, dtype=np.int64)
+        self.tick = 0
+
+        self.reset()
+
+
+    def tile_bitmap(self, layout, level_objects):
+        """Returns a boolean array, indexed by [row, column], marking the tiles
+           of the received Layout occupied by the received list of
+           LevelGraphicsObjects."""
+
+        columns = [int(level_object.x // self.UNIT)
+                   for level_object in level_objects]
+        rows = [int(level_object.y // self.UNIT)
+                for level_object in level_objects]
+
+        bitmap = np.zeros((max(rows + [self.max_rows - 1]) + 1,
+                           max(columns + [self.max_columns - 1]) + 1),
+                          dtype=bool)
+        bitmap[rows, columns] = True
+
+        return bitmap
+
+
+    def reset(self):
+        """Resets every simulation to the beginning state of the level."""
+
+        self.x[:] = self.starting_x
+        self.y[:] = self.starting_y
+        self.x_vel[:] = 0
+        self.y_vel[:] = 0
+        self.in_air[:] = False
+        self.beaten_layouts[:] = False
+        self.num_deaths[:] = 0
+        self.tick = 0
+
+
+    def beaten(self):
+        """Returns a boolean array marking the simulations in which every
+           layout has been beaten."""
+
+        return self.beaten_layouts.all(axis=0)
+
+
+    def restart(self, restarting):
+        """Respawns every Avatar of the simulations of the received indices (or
+           marked in the received boolean array) and marks their layouts as not
+           beaten."""
+
+        self.x[:, restarting] = self.starting_x
+        self.y[:, restarting] = self.starting_y
+        self.x_vel[:, restarting] = 0
+        self.y_vel[:, restarting] = 0
+        self.beaten_layouts[:, restarting] = False
+
+
+    def step(self, inputs):
+        """Advances every simulation by one tick, receiving either one int of
+           input flags (see engine) for all of the simulations or an array
+           holding each simulation's input flags."""
+
+        inputs = np.broadcast_to(np.asarray(inputs, dtype=np.int64),
+                                 (self.num_simulations,))
+        moving_left = (inputs & MOVE_LEFT) != 0
+        moving_right = (inputs & MOVE_RIGHT) != 0
+        jumping = (inputs & JUMP) != 0
+
+        horizontal_vel = np.where(moving_right & ~moving_left, GROUND_X_SPEED,
+                                  np.where(moving_left & ~moving_right,
+                                           -GROUND_X_SPEED, 0))
+
+        for layout_index in range(self.num_layouts):
+            self.step_layout(layout_index, horizontal_vel, jumping)
+
+        self.tick += 1
+
+
+    def step_layout(self, layout_index, horizontal_vel, jumping):
+        """Updates the Avatars of the layout of the received index for one
+           tick, in the simulations where that layout is not yet beaten."""
+
+        d = layout_index
+        active = ~self.beaten_layouts[d]
+        half_size = self.avatar_size/2
+
+        # Set velocities from the inputs, then apply gravity.
+        x_vel = np.where(active, horizontal_vel, self.x_vel[d])
+        y_vel = np.where(active & jumping & ~self.in_air[d], JUMP_VEL,
+                         self.y_vel[d])
+        y_vel = np.where(active & (y_vel < TERMINAL_VELOCITY), y_vel + 1, y_vel)
+        in_air = self.in_air[d] | active
+
+        # Move, stopping at the left, right, and bottom layout boundaries.
+        x = np.where(active, self.x[d] + x_vel, self.x[d])
+        y = np.where(active, self.y[d] + y_vel, self.y[d])
+
+        width = self.widths[d, 0]
+        height = self.heights[d, 0]
+        past_right = active & (x + half_size > width)
+        x = np.where(past_right, width - half_size, x)
+        x_vel = np.where(past_right, 0, x_vel)
+        past_left = active & (x - half_size < 0)
+        x = np.where(past_left, half_size, x)
+        x_vel = np.where(past_left, 0, x_vel)
+        on_floor = active & (y + half_size + 1 >= height)
+        y_vel = np.where(on_floor, 0, y_vel)
+        y = np.where(on_floor, height - half_size - 1, y)
+        in_air = in_air & ~on_floor
+
+        self.x[d] = x
+        self.y[d] = y
+        self.x_vel[d] = x_vel
+        self.y_vel[d] = y_vel
+        self.in_air[d] = in_air
+
+        # Find the window of tiles each Avatar could touch this tick, exactly
+        # as Layout.objects_near does.
+        x_reach = half_size + np.abs(x_vel)
+        y_reach = half_size + np.abs(y_vel)
+        first_column = (np.floor_divide(x - x_reach, self.UNIT) - 1).astype(int)
+        last_column = (np.floor_divide(x + x_reach, self.UNIT) + 1).astype(int)
+        first_row = (np.floor_divide(y - y_reach, self.UNIT) - 1).astype(int)
+        last_row = (np.floor_divide(y + y_reach, self.UNIT) + 1).astype(int)
+
+        # Visit the window's tiles in file order (top to bottom, left to
+        # right), once for each kind of object, as the engine does.
+        if not active.any():
+            return
+        num_rows = int((last_row - first_row)[active].max()) + 1
+        num_columns = int((last_column - first_column)[active].max()) + 1
+        if max(num_rows, num_columns) > TILE_MAP_BORDER:
+            raise ValueError('Avatars move too fast for TILE_MAP_BORDER')
+
+        # Look up the object bits of every tile in the windows, skipping
+        # tiles which are empty for every simulation. Windows reaching past
+        # the border are clipped onto it, where every tile is empty just as
+        # every tile beyond it would be.
+        border = TILE_MAP_BORDER
+        map_rows = np.clip(first_row + border, 0, self.tile_map_rows - num_rows)
+        map_columns = np.clip(first_column + border, 0,
+                              self.tile_map_columns - num_columns)
+        window_corners = map_rows * self.tile_map_columns + map_columns
+        row_spans = np.where(active, last_row - first_row, -1)
+        column_spans = last_column - first_column
+        tile_map = self.tile_maps[d]
+
+        tiles = []
+        for row_offset in range(num_rows):
+            in_rows = row_offset <= row_spans
+            for column_offset in range(num_columns):
+                kinds = tile_map[window_corners + (row_offset *
+                                                   self.tile_map_columns +
+                                                   column_offset)]
+                kinds = np.where(in_rows & (column_offset <= column_spans),
+                                 kinds, 0)
+                if kinds.any():
+                    tiles.append((first_row + row_offset,
+                                  first_column + column_offset, kinds))
+
+        # Resolve each tile only for the simulations whose windows hold the
+        # right kind of object there.
+        for row, column, kinds in tiles:
+            blocked = np.flatnonzero(kinds & BLOCK_BIT)
+            if len(blocked):
+                self.prevent_obstructed_motion(d, blocked, row[blocked],
+                                               column[blocked])
+
+        for row, column, kinds in tiles:
+            spiked = np.flatnonzero(kinds & SPIKES_BIT)
+            if len(spiked):
+                impaled = spiked[self.is_impaled(d, spiked, row[spiked],
+                                                 column[spiked])]
+                if len(impaled):
+                    self.num_deaths[impaled] += 1
+                    self.restart(impaled)
+
+        for row, column, kinds in tiles:
+            exiting = np.flatnonzero(kinds & EXIT_BIT)
+            if len(exiting):
+                reached = self.reached_exit(d, exiting, row[exiting],
+                                            column[exiting])
+                self.beaten_layouts[d, exiting[reached]] = True
+
+
+    def tile_centers(self, row, column):
+        """Returns the x and y coordinates of the centers of the tiles of the
+           received rows and columns (int arrays)."""
+
+        return (self.UNIT * column + self.UNIT/2,
+                self.UNIT * row + self.UNIT/2)
+
+
+    def colliding(self, x, y, block_x, block_y):
+        """Returns a boolean array marking which Avatars centered on the
+           received coordinates overlap the blocks centered on the received
+           coordinates, as in Avatar.colliding_with_block."""
+
+        half_size = self.avatar_size/2
+
+        return ((block_x - self.UNIT/2 < x + half_size) &
+                (block_x + self.UNIT/2 > x - half_size) &
+                (block_y - self.UNIT/2 < y + half_size) &
+                (block_y + self.UNIT/2 > y - half_size))
+
+
+    def prevent_obstructed_motion(self, d, indices, row, column):
+        """Prevents the Avatars of the layout of index d in the simulations of
+           the received indices from moving through the blocks in the received
+           tile rows and columns, as in Avatar.prevent_obstructed_motion."""
+
+        half_size = self.avatar_size/2
+        block_x, block_y = self.tile_centers(row, column)
+        x = self.x[d, indices]
+        y = self.y[d, indices]
+        x_vel = self.x_vel[d, indices]
+        y_vel = self.y_vel[d, indices]
+        in_air = self.in_air[d, indices]
+
+        y = y - y_vel
+        hit = self.colliding(x, y, block_x, block_y)
+        x = np.where(hit & (x_vel > 0), block_x - self.UNIT/2 - half_size, x)
+        x = np.where(hit & (x_vel < 0), block_x + self.UNIT/2 + half_size, x)
+        x_vel = np.where(hit, 0, x_vel)
+        y = y + y_vel
+
+        x = x - x_vel
+        hit = self.colliding(x, y, block_x, block_y)
+        pushed_up = hit & (y_vel > 0)
+        y = np.where(pushed_up, block_y - self.UNIT/2 - half_size, y)
+        in_air = in_air & ~pushed_up
+        y = np.where(hit & (y_vel < 0), block_y + self.UNIT/2 + half_size, y)
+        y_vel = np.where(hit, 0, y_vel)
+        x = x + x_vel
+
+        self.x[d, indices] = x
+        self.y[d, indices] = y
+        self.x_vel[d, indices] = x_vel
+        self.y_vel[d, indices] = y_vel
+        self.in_air[d, indices] = in_air
+
+
+    def is_impaled(self, d, indices, row, column):
+        """Returns a boolean array marking which Avatars of the layout of index
+           d in the simulations of the received indices touch the spikes in the
+           received tile rows and columns, as in Avatar.is_impaled."""
+
+        half_size = self.avatar_size/2
+        spikes_x, spikes_y = self.tile_centers(row, column)
+        x = self.x[d, indices]
+        y = self.y[d, indices]
+
+        return ((spikes_x - self.UNIT/2 < x + half_size) &
+                (spikes_x + self.UNIT/2 > x - half_size) &
+                (spikes_y + self.UNIT/2 > y - half_size) &
+                (spikes_y < y + half_size))
+
+
+    def reached_exit(self, d, indices, row, column):
+        """Returns a boolean array marking which Avatars of the layout of index
+           d in the simulations of the received indices are sufficiently
+           'inside' the exits in the received tile rows and columns, as in
+           Avatar.reached_exit."""
+
+        exit_x, exit_y = self.tile_centers(row, column)
+        x = self.x[d, indices]
+        y = self.y[d, indices]
+
+        return ((exit_x - self.UNIT/4 <= x) & (x <= exit_x + self.UNIT/4) &
+                (exit_y - self.UNIT/4 <= y) & (y <= exit_y + self.UNIT/4))
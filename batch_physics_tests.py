@@ -0,0 +1,51 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that batched simulations match the engine exactly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import importlib.util
+import random
+import sys
+
+# Batched simulations need NumPy, which the game itself does not.
+if importlib.util.find_spec('numpy') is None:
+    print('NumPy is not installed; skipping the batched simulation tests.')
+    sys.exit()
+
+from batch_physics import BatchSimulation
+from engine import load_level, step, MOVE_LEFT, MOVE_RIGHT, JUMP
+
+INPUT_CHOICES = [0, MOVE_LEFT, MOVE_RIGHT, JUMP, MOVE_LEFT | JUMP,
+                 MOVE_RIGHT | JUMP, MOVE_LEFT | MOVE_RIGHT]
+NUM_SIMULATIONS = 8
+NUM_TICKS = 600
+
+# Each batched simulation should end every tick in exactly the same state as
+# an engine LevelState given the same random inputs, on every level.
+for level_id in range(1, 4):
+    generator = random.Random(level_id)
+    levels = [load_level(level_id) for simulation in range(NUM_SIMULATIONS)]
+    batch = BatchSimulation(levels[0].layouts, NUM_SIMULATIONS)
+
+    for tick in range(NUM_TICKS):
+        # Hold each random input for a while, as a player would.
+        if tick % 15 == 0:
+            inputs = [generator.choice(INPUT_CHOICES)
+                      for simulation in range(NUM_SIMULATIONS)]
+        batch.step(inputs)
+
+        for simulation, level in enumerate(levels):
+            step(level, inputs[simulation])
+            assert batch.num_deaths[simulation] == level.num_deaths
+            for d, layout in enumerate(level.layouts):
+                assert batch.x[d, simulation] == layout.avatar.x
+                assert batch.y[d, simulation] == layout.avatar.y
+                assert batch.y_vel[d, simulation] == layout.avatar.y_vel
+                assert batch.in_air[d, simulation] == bool(layout.avatar.in_air)
+                assert batch.beaten_layouts[d, simulation] == layout.beaten
@@ -0,0 +1,367 @@
+"""CS 108 A Final Project
+
+Part of the "Out of Sync" parallel-dimensional 2D platforming puzzle, supplying
+the run_benchmarks function, which times the game's main costs on synthetic
+levels of increasing size, so changes can be checked for speed regressions.
+
+Each benchmark level is a pair of random layouts of a given size (in tiles)
+and density of blocks and spikes, with a floor of blocks along the bottom and
+an exit at the far right. For each size, the following are timed separately:
+ - parse: parsing both layout files (parse_layout_file)
+ - layout_init: creating both Layouts from files not yet cached (Layout)
+ - layout_init_cached: creating both Layouts from the disk cache
+ - tick: simulating one tick of the level (engine.step)
+ - collision: resolving one tick's collisions of every Avatar
+   (engine.resolve_collisions, or engine.resolve_swept_motion in the swept
+   collision mode)
+ - draw: drawing both Layouts (Layout.draw), on a stand-in Drawing which does
+   nothing, so only the game's own drawing work is timed, with no chunk
+   images rendered yet (see static_layer)
+ - draw_cached: drawing both Layouts again, with their chunk images rendered
+   and cached in memory
+
+Every timing is the best of several repeats, in seconds (per tick for tick and
+collision). Results are written as JSON, and can be compared against the
+results of an earlier run; any timing slower than the earlier one by more than
+a threshold ratio is reported as a regression.
+
+Run this file to benchmark from the command line, e.g.
+'python benchmarks.py --output new.json --compare old.json'.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+
+import level_cache
+import static_layer
+from engine import (LevelState, step, move_avatar, accelerate_avatar,
+                    resolve_collisions, resolve_swept_motion,
+                    CLASSIC_COLLISION, SWEPT_COLLISION,
+                    MOVE_LEFT, MOVE_RIGHT, JUMP)
+from layout import Layout, OBJECT_STORAGE, ARRAY_STORAGE
+from layout_map import parse_layout_file
+
+# The (width, height) sizes of the benchmark levels, in tiles.
+LEVEL_SIZES = [(10, 5), (100, 20), (1000, 100), (10000, 1000)]
+
+# The default chance of each tile of a benchmark level holding a block or
+# spikes.
+BLOCK_DENSITY = 0.15
+SPIKE_DENSITY = 0.03
+
+# The number of times each timing is repeated (keeping the best), and the
+# number of ticks simulated in each repeat of the tick and collision timings.
+REPEATS = 3
+NUM_TICKS = 1000
+
+# The slowdown ratio beyond which a timing counts as a regression.
+REGRESSION_THRESHOLD = 1.25
+
+# The names of the timings, in the order they are run.
+TIMING_NAMES = ['parse', 'layout_init', 'layout_init_cached', 'tick',
+                'collision', 'draw', 'draw_cached']
+
+
+def write_synthetic_layout(file_name, width, height, block_density,
+                           spike_density, generator):
+    """Writes a layout file of the received width and height (in tiles) whose
+       tiles hold blocks and spikes at random with the received densities
+       (chances from 0 to 1), using the received random.Random; the bottom row
+       is a floor of blocks, the Avatar spawns in the bottom left corner above
+       it with a few clear tiles around it, and an exit is placed at the far
+       right."""
+
+    rows = []
+    for row in range(height - 1):
+        line = []
+        for column in range(width):
+            roll = generator.random()
+            if column < 3 and row >= height - 4:
+                line.append('-')
+            elif roll < block_density:
+                line.append('#')
+            elif roll < block_density + spike_density:
+                line.append('^')
+            else:
+                line.append('-')
+        rows.append(line)
+    rows.append(['#'] * width)
+
+    if height > 1:
+        rows[-2][-1] = '@'
+
+    with open(file_name, 'w') as level_map:
+        for line in rows:
+            level_map.write(''.join(line) + '\n')
+        level_map.write('0, 1')
+
+
+def write_synthetic_level(directory, level_id, width, height,
+                          block_density=BLOCK_DENSITY,
+                          spike_density=SPIKE_DENSITY, seed=0):
+    """Writes the main and alt layout files ('level#.txt' and 'level#a.txt')
+       of a synthetic level of the received size and densities to the
+       received directory, and returns the layout file names."""
+
+    generator = random.Random(seed)
+    file_names = [os.path.join(directory, 'level' + str(level_id) + '.txt'),
+                  os.path.join(directory, 'level' + str(level_id) + 'a.txt')]
+    for file_name in file_names:
+        write_synthetic_layout(file_name, width, height, block_density,
+                               spike_density, generator)
+
+    return file_names
+
+
+class NullDrawing:
+    """A stand-in for a GuiZero Drawing (and its Tk canvas) which does nothing
+       with the items drawn on it."""
+
+    def __init__(self):
+        self.tk = self
+        self.num_items = 0
+        self.width = None
+        self.height = None
+        self.bg = None
+
+    def add_item(self, *args, **kwargs):
+        self.num_items += 1
+        return self.num_items
+
+    rectangle = triangle = oval = line = image = add_item
+
+    def ignore(self, *args, **kwargs):
+        pass
+
+    delete = coords = configure = xview_moveto = yview_moveto = ignore
+    tag_raise = ignore
+
+
+def best_time(function, repeats=REPEATS):
+    """Returns the shortest time (in seconds) taken by the received function
+       over the received number of calls, each preceded by nothing else."""
+
+    times = []
+    for repeat in range(repeats):
+        start_time = perf_counter()
+        function()
+        times.append(perf_counter() - start_time)
+
+    return min(times)
+
+
+def benchmark_inputs(tick):
+    """Returns the input flags held during the received tick of a benchmark:
+       mostly running right and jumping, with some running left."""
+
+    if tick % 200 < 150:
+        return MOVE_RIGHT | (JUMP if tick % 40 < 10 else 0)
+    return MOVE_LEFT | (JUMP if tick % 40 < 10 else 0)
+
+
+def benchmark_level(directory, width, height, storage=OBJECT_STORAGE,
+                    block_density=BLOCK_DENSITY, spike_density=SPIKE_DENSITY,
+                    num_ticks=NUM_TICKS, repeats=REPEATS,
+                    collision=CLASSIC_COLLISION):
+    """Writes a synthetic level of the received size and densities to the
+       received directory and returns a dictionary of its timings (see
+       TIMING_NAMES), with Layouts storing their objects in the received
+       way, simulated with the received collision mode (see engine)."""
+
+    file_names = write_synthetic_level(directory, 1, width, height,
+                                       block_density, spike_density)
+    timings = {}
+
+    timings['parse'] = best_time(
+        lambda: [parse_layout_file(file_name) for file_name in file_names],
+        repeats)
+
+    def load_uncached():
+        level_cache.memory_cache.clear()
+        for file_name in file_names:
+            cache_file_name = level_cache.cache_file_name(
+                os.path.abspath(file_name))
+            if os.path.exists(cache_file_name):
+                os.remove(cache_file_name)
+        return [Layout(file_name, storage=storage) for file_name in file_names]
+
+    def load_cached():
+        level_cache.memory_cache.clear()
+        return [Layout(file_name, storage=storage) for file_name in file_names]
+
+    timings['layout_init'] = best_time(load_uncached, repeats)
+    timings['layout_init_cached'] = best_time(load_cached, repeats)
+
+    state = LevelState(load_cached(), collision)
+    start = state.snapshot()
+
+    def run_ticks():
+        state.restore(start)
+        for tick in range(num_ticks):
+            step(state, benchmark_inputs(tick))
+
+    timings['tick'] = best_time(run_ticks, repeats) / num_ticks
+
+    def run_collisions():
+        state.restore(start)
+        collision_time = 0
+        for tick in range(num_ticks):
+            inputs = benchmark_inputs(tick)
+            for layout in state.layouts:
+                if not layout.beaten:
+                    if collision == SWEPT_COLLISION:
+                        accelerate_avatar(layout.avatar, inputs)
+                        collision_start_time = perf_counter()
+                        resolve_swept_motion(state, layout)
+                    else:
+                        move_avatar(layout, inputs)
+                        collision_start_time = perf_counter()
+                        resolve_collisions(state, layout)
+                    collision_time += perf_counter() - collision_start_time
+        return collision_time
+
+    timings['collision'] = min(run_collisions()
+                               for repeat in range(repeats)) / num_ticks
+
+    # Rendered chunk images are cached beside the layout files.
+    chunk_cache_directory = os.path.join(
+        os.path.dirname(os.path.abspath(file_names[0])),
+        level_cache.CACHE_DIRECTORY_NAME)
+
+    def draw(cached):
+        layouts = load_cached()
+        if not cached:
+            static_layer.clear_cache(chunk_cache_directory)
+        start_time = perf_counter()
+        for layout in layouts:
+            layout.drawing = NullDrawing()
+            layout.draw()
+        return perf_counter() - start_time
+
+    timings['draw'] = min(draw(False) for repeat in range(repeats))
+    timings['draw_cached'] = min(draw(True) for repeat in range(repeats))
+
+    return timings
+
+
+def git_commit():
+    """Returns the current git commit hash of the game's directory, or None if
+       it cannot be found."""
+
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'],
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(level_sizes=LEVEL_SIZES, storage=OBJECT_STORAGE,
+                   block_density=BLOCK_DENSITY, spike_density=SPIKE_DENSITY,
+                   num_ticks=NUM_TICKS, repeats=REPEATS,
+                   collision=CLASSIC_COLLISION):
+    """Benchmarks a synthetic level of each of the received (width, height)
+       sizes and returns a dictionary report of the timings of each size,
+       keyed by 'WIDTHxHEIGHT'."""
+
+    results = {}
+    for width, height in level_sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            results[str(width) + 'x' + str(height)] = benchmark_level(
+                directory, width, height, storage, block_density,
+                spike_density, num_ticks, repeats, collision)
+
+    return dict(commit=git_commit(), python=platform.python_version(),
+                storage=storage, collision=collision,
+                block_density=block_density,
+                spike_density=spike_density, num_ticks=num_ticks,
+                repeats=repeats, results=results)
+
+
+def compare_reports(report, baseline, threshold=REGRESSION_THRESHOLD):
+    """Returns a list of (size, timing name, ratio) regressions: timings of the
+       received report slower than the same timings of the received baseline
+       report by more than the received ratio."""
+
+    regressions = []
+    for size, timings in report['results'].items():
+        baseline_timings = baseline['results'].get(size, {})
+        for timing_name in TIMING_NAMES:
+            if (timing_name in timings and
+                baseline_timings.get(timing_name)):
+                ratio = timings[timing_name] / baseline_timings[timing_name]
+                if ratio > threshold:
+                    regressions.append((size, timing_name, ratio))
+
+    return regressions
+
+
+def parse_size(size):
+    """Returns the (width, height) tuple of the received 'WIDTHxHEIGHT'
+       string."""
+
+    width, height = size.lower().split('x')
+    return int(width), int(height)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Time parsing, simulation, and drawing on synthetic levels.')
+    parser.add_argument('--sizes', type=lambda sizes: [
+                            parse_size(size) for size in sizes.split(',')],
+                        default=LEVEL_SIZES,
+                        help='comma-separated WIDTHxHEIGHT level sizes, in '
+                             'tiles (default: 10x5,100x20,1000x100,10000x1000)')
+    parser.add_argument('--storage', choices=[OBJECT_STORAGE, ARRAY_STORAGE],
+                        default=OBJECT_STORAGE)
+    parser.add_argument('--collision',
+                        choices=[CLASSIC_COLLISION, SWEPT_COLLISION],
+                        default=CLASSIC_COLLISION)
+    parser.add_argument('--block-density', type=float, default=BLOCK_DENSITY)
+    parser.add_argument('--spike-density', type=float, default=SPIKE_DENSITY)
+    parser.add_argument('--ticks', type=int, default=NUM_TICKS)
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--output', help='file to write the JSON report to')
+    parser.add_argument('--compare', help='earlier JSON report to check for '
+                                          'regressions against')
+    parser.add_argument('--threshold', type=float,
+                        default=REGRESSION_THRESHOLD,
+                        help='slowdown ratio counted as a regression')
+    arguments = parser.parse_args()
+
+    report = run_benchmarks(arguments.sizes, arguments.storage,
+                            arguments.block_density, arguments.spike_density,
+                            arguments.ticks, arguments.repeats,
+                            arguments.collision)
+
+    for size, timings in report['results'].items():
+        print(size.rjust(11) + '  ' + '  '.join(
+            timing_name + ' ' + format(timings[timing_name] * 1000, '.3f') +
+            ' ms' for timing_name in TIMING_NAMES))
+
+    if arguments.output:
+        with open(arguments.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as baseline_file:
+            regressions = compare_reports(report, json.load(baseline_file),
+                                          arguments.threshold)
+        for size, timing_name, ratio in regressions:
+            print('REGRESSION ' + size + ' ' + timing_name + ': ' +
+                  format(ratio, '.2f') + 'x slower', file=sys.stderr)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,43 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that the benchmarks build and time synthetic levels properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import tempfile
+
+from benchmarks import (TIMING_NAMES, benchmark_level, compare_reports,
+                        parse_size, write_synthetic_level)
+from layout import Layout
+
+with tempfile.TemporaryDirectory() as directory:
+    # A synthetic level should have layouts of the requested size, with a
+    # floor, an exit, and a clear spawn point.
+    main_file, alt_file = write_synthetic_level(directory, 1, 40, 12,
+                                                block_density=0.5)
+    for file_name in [main_file, alt_file]:
+        layout = Layout(file_name)
+        assert layout.width_in_layout_units == 40
+        assert layout.height_in_layout_units == 12
+        assert len(layout.exits) == 1
+        assert len(layout.blocks) > 40
+        for block in layout.blocks:
+            assert not layout.avatar.colliding_with_block(block)
+
+    # Every timing should be measured.
+    timings = benchmark_level(directory, 10, 5, num_ticks=20, repeats=1)
+    assert sorted(timings) == sorted(TIMING_NAMES)
+    assert all(timing > 0 for timing in timings.values())
+
+# Only timings slower than the baseline by more than the threshold should be
+# reported as regressions.
+baseline = dict(results={'10x5': dict(parse=1.0, tick=1.0, draw=1.0)})
+report = dict(results={'10x5': dict(parse=1.1, tick=2.0, draw=0.5),
+                       '20x5': dict(parse=5.0)})
+assert compare_reports(report, baseline, 1.25) == [('10x5', 'tick', 2.0)]
+assert parse_size('100X20') == (100, 20)
@@ -0,0 +1,176 @@
+"""CS 108 A Final Project
+
+Part of the GUI view for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the Controls class, which turns key press and release events
+into the movement input flags (see engine) held during each tick, through a
+remappable table of key bindings.
+
+The held input flags are kept up to date as a single bitmask as keys are
+pressed and released, so reading them each tick is a single lookup shared by
+every layout. Releasing a key which was never pressed (e.g. one held down when
+the level opened) is ignored. Every change to the held inputs is timestamped,
+so the delay between a key event and the first tick moving the Avatars with it
+(input latency) can be measured.
+
+Key bindings can be changed by writing a JSON file mapping key names (Tk key
+symbols, e.g. "a", "Left", or "space", in any case) to actions ("left",
+"right", "jump", "switch", "rewind", or "restart"), e.g. {"Left": "left",
+"Right": "right", "Up": "jump", "space": "switch"}, and loading it with
+load_key_bindings.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import json
+from collections import deque
+from time import perf_counter
+
+from engine import NO_INPUT, MOVE_LEFT, MOVE_RIGHT, JUMP
+
+# The action of the key which switches to the next of a level's layouts.
+SWITCH = 'switch'
+
+# The actions of the keys which rewind the level a few seconds and restart it
+# (see rewind).
+REWIND = 'rewind'
+RESTART = 'restart'
+
+# The actions carried out once per key press rather than held.
+COMMAND_ACTIONS = [SWITCH, REWIND, RESTART]
+
+# The input flags of each movement action.
+ACTION_FLAGS = {'left': MOVE_LEFT, 'right': MOVE_RIGHT, 'jump': JUMP}
+
+# The original WASD and space bar controls, with Z to rewind and R to
+# restart.
+DEFAULT_KEY_BINDINGS = {'a': 'left', 'd': 'right', 'w': 'jump',
+                        'space': SWITCH, 'z': REWIND, 'r': RESTART}
+
+# The number of recent input latencies kept.
+LATENCY_WINDOW = 100
+
+
+def load_key_bindings(file_name):
+    """Returns the key bindings dictionary (key name to action) stored in the
+       received JSON file; raises a ValueError for unknown actions."""
+
+    with open(file_name) as key_bindings_file:
+        key_bindings = json.load(key_bindings_file)
+
+    for key, action in key_bindings.items():
+        if action not in COMMAND_ACTIONS and action not in ACTION_FLAGS:
+            raise ValueError('unknown action ' + repr(action) + ' for key ' +
+                             repr(key))
+
+    return key_bindings
+
+
+class Controls:
+    """Represents the keys the player is holding and the movement input flags
+       they add up to."""
+
+    def __init__(self, key_bindings=DEFAULT_KEY_BINDINGS, clock=perf_counter):
+        """Receives a dictionary mapping key names to actions and the function
+           returning the current time in seconds."""
+
+        self.clock = clock
+        self.held_keys = set()
+        self.inputs = NO_INPUT
+
+        # The time of the earliest change to the held inputs not yet used by a
+        # tick (None if there is none), and the recent input latencies.
+        self.change_time = None
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+        self.key_actions = {}
+        for key, action in key_bindings.items():
+            self.bind(key, action)
+
+
+    def bind(self, key, action):
+        """Binds the received key name to the received action (replacing any
+           other binding of the key)."""
+
+        self.key_actions[key.lower()] = action
+        if key.lower() in self.held_keys:
+            self.held_keys.remove(key.lower())
+            self.update_inputs()
+
+
+    def unbind(self, key):
+        """Removes any binding of the received key name."""
+
+        self.key_actions.pop(key.lower(), None)
+        self.held_keys.discard(key.lower())
+        self.update_inputs()
+
+
+    def press(self, key):
+        """Records the press of the key of the received name and returns its
+           action (None if it is not bound)."""
+
+        key = key.lower()
+        action = self.key_actions.get(key)
+
+        if action in ACTION_FLAGS and key not in self.held_keys:
+            self.held_keys.add(key)
+            self.update_inputs()
+
+        return action
+
+
+    def release(self, key):
+        """Records the release of the key of the received name, if it was held
+           down."""
+
+        key = key.lower()
+        if key in self.held_keys:
+            self.held_keys.remove(key)
+            self.update_inputs()
+
+
+    def clear(self):
+        """Forgets every held key."""
+
+        self.held_keys.clear()
+        self.update_inputs()
+        self.change_time = None
+
+
+    def update_inputs(self):
+        """Recomputes the held input flags from the held keys, timestamping any
+           change."""
+
+        inputs = NO_INPUT
+        for key in self.held_keys:
+            inputs |= ACTION_FLAGS[self.key_actions[key]]
+
+        if inputs != self.inputs:
+            self.inputs = inputs
+            if self.change_time is None:
+                self.change_time = self.clock()
+
+
+    def tick_inputs(self):
+        """Returns the input flags to simulate the next tick with, recording
+           the input latency if they include a change not yet simulated."""
+
+        if self.change_time is not None:
+            self.latencies.append(self.clock() - self.change_time)
+            self.change_time = None
+
+        return self.inputs
+
+
+    def average_latency(self):
+        """Returns the average of the recent input latencies in seconds, or
+           None if there are none."""
+
+        if not self.latencies:
+            return None
+
+        return sum(self.latencies) / len(self.latencies)
@@ -0,0 +1,94 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that key events are turned into movement inputs properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import json
+import os
+import tempfile
+
+from controls import Controls, REWIND, RESTART, SWITCH, load_key_bindings
+from engine import NO_INPUT, MOVE_LEFT, MOVE_RIGHT, JUMP
+
+
+# A clock whose current time (in seconds) is set by the tests.
+now = [0.0]
+def clock():
+    return now[0]
+
+controls = Controls(clock=clock)
+assert controls.tick_inputs() == NO_INPUT
+
+# Held movement keys should add up to input flags, in either case, and the
+# switch key should only be reported.
+assert controls.press('d') == 'right'
+assert controls.press('W') == 'jump'
+assert controls.press('space') == SWITCH
+assert controls.press('z') == REWIND
+assert controls.press('r') == RESTART
+assert controls.press('q') is None
+assert controls.tick_inputs() == MOVE_RIGHT | JUMP
+
+# Releasing keys, including ones never pressed, should never fail.
+controls.release('w')
+controls.release('a')
+controls.release('Escape')
+assert controls.tick_inputs() == MOVE_RIGHT
+
+# Pressing the upper and lower case of a key should count as one key.
+controls.press('D')
+controls.release('d')
+assert controls.tick_inputs() == NO_INPUT
+
+# The latency should be measured from the first change not yet simulated to
+# the tick that simulates it, once per change.
+latencies = len(controls.latencies)
+now[0] = 1.0
+controls.press('a')
+now[0] = 1.25
+controls.release('a')
+controls.press('d')
+now[0] = 1.5
+assert controls.tick_inputs() == MOVE_RIGHT
+assert list(controls.latencies)[latencies:] == [0.5]
+controls.tick_inputs()
+assert len(controls.latencies) == latencies + 1
+
+# Keys should be remappable, including while held.
+controls.bind('Right', 'right')
+controls.bind('d', 'jump')
+assert controls.tick_inputs() == NO_INPUT
+controls.press('Right')
+controls.press('d')
+assert controls.tick_inputs() == MOVE_RIGHT | JUMP
+controls.unbind('d')
+assert controls.tick_inputs() == MOVE_RIGHT
+controls.clear()
+assert controls.tick_inputs() == NO_INPUT
+
+with tempfile.TemporaryDirectory() as directory:
+    # Key bindings should be loaded from JSON files, refusing unknown actions.
+    file_name = os.path.join(directory, 'key_bindings.json')
+    with open(file_name, 'w') as key_bindings_file:
+        json.dump({'Left': 'left', 'Up': 'jump', 'Return': 'switch',
+                   'BackSpace': 'rewind'}, key_bindings_file)
+    controls = Controls(load_key_bindings(file_name))
+    controls.press('left')
+    controls.press('a')
+    assert controls.tick_inputs() == MOVE_LEFT
+    assert controls.press('Return') == SWITCH
+    assert controls.press('BackSpace') == REWIND
+
+    with open(file_name, 'w') as key_bindings_file:
+        json.dump({'x': 'fly'}, key_bindings_file)
+    try:
+        load_key_bindings(file_name)
+        assert False
+    except ValueError:
+        pass
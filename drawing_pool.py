@@ -0,0 +1,50 @@
+"""CS 108 A Final Project
+
+Part of the GUI view for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the DrawingPool class, which keeps the layout Drawings of
+closed levels to be cleared and reused by the next level opened, rather than
+destroying them and creating new GuiZero widgets every time a level is opened.
+
+A Drawing taken from the pool is hidden, empty, and scrolled to its top left
+corner; it is resized when its layout is drawn (see viewport).
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+
+class DrawingPool:
+    """Represents the Drawings available for reuse and the way to create more
+       of them."""
+
+    def __init__(self, create_drawing):
+        """Receives a function returning a new, hidden GuiZero Drawing."""
+
+        self.create_drawing = create_drawing
+        self.free_drawings = []
+        self.num_created = 0
+
+
+    def acquire(self):
+        """Returns a hidden, empty Drawing, reusing a released one if there is
+           one."""
+
+        if self.free_drawings:
+            return self.free_drawings.pop()
+
+        self.num_created += 1
+        return self.create_drawing()
+
+
+    def release(self, drawing):
+        """Hides and clears the received Drawing and keeps it for reuse."""
+
+        drawing.hide()
+        # Deletes every item drawn and forgets the images shown.
+        drawing.clear()
+        drawing.tk.xview_moveto(0)
+        drawing.tk.yview_moveto(0)
+        self.free_drawings.append(drawing)
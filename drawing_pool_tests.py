@@ -0,0 +1,56 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that layout Drawings are reused properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+from drawing_pool import DrawingPool
+
+
+class PoolDrawing:
+    """A stand-in for a GuiZero Drawing which records how it is reset."""
+
+    def __init__(self):
+        self.tk = self
+        self.visible = True
+        self.items = ['block', 'avatar']
+        self.scroll = [0.5, 0.5]
+
+    def hide(self):
+        self.visible = False
+
+    def clear(self):
+        self.items = []
+
+    def xview_moveto(self, fraction):
+        self.scroll[0] = fraction
+
+    def yview_moveto(self, fraction):
+        self.scroll[1] = fraction
+
+
+pool = DrawingPool(PoolDrawing)
+
+# Drawings should be created until some are released.
+main_drawing = pool.acquire()
+alt_drawing = pool.acquire()
+assert main_drawing is not alt_drawing
+assert pool.num_created == 2
+
+# Released drawings should be hidden, cleared, scrolled back, and reused
+# rather than new ones created.
+pool.release(main_drawing)
+pool.release(alt_drawing)
+assert not main_drawing.visible
+assert main_drawing.items == []
+assert main_drawing.scroll == [0, 0]
+assert {id(pool.acquire()), id(pool.acquire())} == {id(main_drawing),
+                                                    id(alt_drawing)}
+assert pool.num_created == 2
+pool.acquire()
+assert pool.num_created == 3
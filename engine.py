@@ -0,0 +1,261 @@
+"""CS 108 A Final Project
+
+Part of the model for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the LevelState class and the step function which simulate a
+level's layouts one tick at a time without any GuiZero widgets, so levels can
+be played by the GUI or run headless for testing, replays, and solvers.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+from time import perf_counter
+
+from layout import Layout, OBJECT_STORAGE
+from level_index import level_file_paths
+from level_graphics_objects import Block, Spikes, LevelEnding
+from swept_collision import sweep_avatar, swept_spikes
+
+# Bit flags for the movement inputs held down during a tick; combine them with
+# | to hold several at once (e.g. MOVE_RIGHT | JUMP).
+NO_INPUT = 0
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+JUMP = 4
+
+# The colors used to draw the avatars of a level's layouts, in order (levels
+# with more layouts start over from the first color).
+AVATAR_COLORS = ['gray', 'dark gray', 'slate gray', 'dim gray']
+
+# The ways Avatars can be kept out of blocks: by moving them and then pushing
+# them out of each block they overlap (the levels, records, solver, and batch
+# physics all use this), or by sweeping them along their path and stopping
+# them at the first block in the way (see swept_collision).
+CLASSIC_COLLISION = 'classic'
+SWEPT_COLLISION = 'swept'
+
+
+def level_file_names(level_id):
+    """Returns a list of the layout file names of the level of the received
+       level ID (int), one per dimension, in the format 'level#.txt' (main
+       level layout file) followed by 'level#a.txt' (alt level layout file)
+       and any further layout files ('level#b.txt', 'level#c.txt', ...; see
+       level_index)."""
+
+    return level_file_paths('', level_id)
+
+
+def load_level(level_id, storage=OBJECT_STORAGE,
+               collision=CLASSIC_COLLISION):
+    """Returns a new LevelState for the level of the received level ID (int),
+       with layouts that have no drawings yet and that store their level
+       objects in the received way (see Layout), simulated with the received
+       collision mode."""
+
+    layouts = []
+    for index, file_name in enumerate(level_file_names(level_id)):
+        layouts.append(Layout(file_name=file_name,
+                              avatar_color=AVATAR_COLORS[index %
+                                                         len(AVATAR_COLORS)],
+                              storage=storage))
+
+    return LevelState(layouts, collision)
+
+
+class LevelState:
+    """Represents the simulated state of a level: its synchronized Layouts, the
+       number of times the Avatars have died, and the number of ticks
+       simulated."""
+
+    def __init__(self, layouts, collision=CLASSIC_COLLISION):
+        """Receives the list of Layouts making up the level and the collision
+           mode (CLASSIC_COLLISION or SWEPT_COLLISION) to simulate it with."""
+
+        if collision not in [CLASSIC_COLLISION, SWEPT_COLLISION]:
+            raise ValueError('unknown collision mode: ' + repr(collision))
+
+        self.layouts = layouts
+        self.collision = collision
+        self.num_deaths = 0
+        self.tick = 0
+
+
+    def beaten(self):
+        """Returns whether or not every layout in the level has been beaten."""
+
+        for layout in self.layouts:
+            if not layout.beaten:
+                return False
+
+        return True
+
+
+    def restart(self):
+        """Reset the level to its beginning state."""
+
+        for layout in self.layouts:
+            layout.beaten = False
+            layout.avatar.respawn()
+
+
+    def snapshot(self):
+        """Returns a hashable tuple of everything about the level's layouts
+           which affects future ticks: each Avatar's position, vertical
+           velocity, and whether it is in the air, and whether each layout is
+           beaten. (The Avatars' horizontal velocities are left out since every
+           tick replaces them based on the inputs.)"""
+
+        avatar_states = []
+        for layout in self.layouts:
+            avatar = layout.avatar
+            avatar_states.append((avatar.x, avatar.y, avatar.y_vel,
+                                  bool(avatar.in_air), layout.beaten))
+
+        return tuple(avatar_states)
+
+
+    def restore(self, snapshot):
+        """Returns the level's layouts to the state of the received snapshot
+           (see snapshot)."""
+
+        for layout, avatar_state in zip(self.layouts, snapshot):
+            avatar = layout.avatar
+            avatar.x, avatar.y, avatar.y_vel, avatar.in_air, layout.beaten = \
+                avatar_state
+            avatar.x_vel = 0
+
+
+def step(state, inputs, profiler=None):
+    """Advances the received LevelState by one tick, moving the Avatar of every
+       unbeaten layout according to the received input flags (an int combining
+       MOVE_LEFT, MOVE_RIGHT, and JUMP), restarting the level when an Avatar is
+       impaled, and marking layouts beaten when their Avatar reaches an exit.
+       Adds the time spent on physics and collisions to the received
+       FrameProfiler (see profiler), if any."""
+
+    # The layouts are stepped one at a time, in order, so that a death
+    # respawns the layouts after it before they move; the solver and saved
+    # recordings rely on that order. Each layout takes around a hundredth of
+    # a millisecond, so even a 16-dimension tick fits well inside a frame.
+    for layout in state.layouts:
+        if not layout.beaten:
+            step_layout(state, layout, inputs, profiler)
+
+    state.tick += 1
+
+
+def step_layout(state, layout, inputs, profiler=None):
+    """Updates the position of the Avatar in the received Layout of the
+       received LevelState for one tick of the received input flags, adding
+       the time spent to the received FrameProfiler, if any."""
+
+    if profiler is not None:
+        start_time = perf_counter()
+
+    if state.collision == SWEPT_COLLISION:
+        accelerate_avatar(layout.avatar, inputs)
+    else:
+        move_avatar(layout, inputs)
+
+    if profiler is not None:
+        moved_time = perf_counter()
+
+    if state.collision == SWEPT_COLLISION:
+        resolve_swept_motion(state, layout)
+    else:
+        resolve_collisions(state, layout)
+
+    if profiler is not None:
+        profiler.add('physics', moved_time - start_time)
+        profiler.add('collision', perf_counter() - moved_time)
+
+
+def move_avatar(layout, inputs):
+    """Sets the velocities of the Avatar in the received Layout for the
+       received input flags, applies gravity, and moves it, without regard for
+       the layout's level objects."""
+
+    avatar = layout.avatar
+    accelerate_avatar(avatar, inputs)
+
+    # Change the avatar's position based on its current velocities.
+    avatar.move(layout.layout_width, layout.layout_height)
+
+
+def accelerate_avatar(avatar, inputs):
+    """Sets the velocities of the received Avatar for the received input
+       flags and applies gravity to it."""
+
+    # If the player is holding right but not left:
+    if inputs & MOVE_RIGHT and not inputs & MOVE_LEFT:
+
+        # Set the avatar to move right at a preset speed.
+        avatar.x_vel = avatar.GROUND_X_SPEED
+
+    # Else if the player is holding left but not right:
+    elif inputs & MOVE_LEFT and not inputs & MOVE_RIGHT:
+
+        # Set the avatar to move left at a preset speed.
+        avatar.x_vel = -avatar.GROUND_X_SPEED
+
+    else:
+        avatar.x_vel = 0
+
+    if inputs & JUMP and not avatar.in_air:
+        # Set the avatar to move up at a preset speed.
+        avatar.y_vel = avatar.JUMP_VEL
+
+    # Apply gravity to the avatar, which modifies its y velocity.
+    avatar.apply_gravity()
+
+
+def resolve_collisions(state, layout):
+    """Pushes the Avatar of the received Layout of the received LevelState out
+       of the blocks it has moved into, restarting the level if it is impaled
+       on spikes and marking the layout beaten if it has reached an exit."""
+
+    avatar = layout.avatar
+
+    # Look up only the level objects in the tiles around the avatar rather
+    # than every object in the Layout.
+    nearby_objects = layout.objects_near(avatar)
+
+    # Iterate through the nearby Block objects in the Layout.
+    for block in nearby_objects:
+        if isinstance(block, Block):
+            avatar.prevent_obstructed_motion(block)
+
+    # Iterate through the nearby Spike objects in the Layout.
+    for spikes in nearby_objects:
+        if isinstance(spikes, Spikes) and avatar.is_impaled(spikes):
+            state.num_deaths += 1
+            state.restart()
+
+    # Iterate through the nearby LevelEnding objects in the Layout.
+    for exit_portal in nearby_objects:
+        if (isinstance(exit_portal, LevelEnding) and
+            avatar.reached_exit(exit_portal)):
+            layout.beaten = True
+
+
+def resolve_swept_motion(state, layout):
+    """Moves the Avatar of the received Layout of the received LevelState by
+       its velocities, stopping it at the first block in its way, restarting
+       the level if it passes through spikes and marking the layout beaten if
+       it ends within an exit."""
+
+    swept_boxes = sweep_avatar(layout)
+
+    if swept_spikes(layout, swept_boxes):
+        state.num_deaths += 1
+        state.restart()
+        return
+
+    avatar = layout.avatar
+    for exit_portal in layout.objects_near(avatar):
+        if (isinstance(exit_portal, LevelEnding) and
+            avatar.reached_exit(exit_portal)):
+            layout.beaten = True
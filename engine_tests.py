@@ -0,0 +1,75 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that levels simulate properly without the GUI.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+from engine import (AVATAR_COLORS, load_level, step, NO_INPUT, MOVE_LEFT,
+                    MOVE_RIGHT, JUMP)
+from solver import solve_level
+
+# A level should be loaded from both of its layout files, with its avatars at
+# their spawn points.
+level = load_level(1)
+assert len(level.layouts) == 2
+for layout in level.layouts:
+    assert layout.drawing is None
+    assert layout.avatar.x == layout.avatar.starting_x
+    assert layout.avatar.y == layout.avatar.starting_y
+
+# Without input, the avatars should settle onto the blocks beneath them and
+# stay there.
+for tick in range(50):
+    step(level, NO_INPUT)
+assert level.tick == 50
+for layout in level.layouts:
+    assert not layout.avatar.in_air
+    assert layout.avatar.y_vel == 0
+    assert layout.avatar.x == layout.avatar.starting_x
+resting_y = [layout.avatar.y for layout in level.layouts]
+
+# Holding both left and right should not move the avatars.
+step(level, MOVE_LEFT | MOVE_RIGHT)
+for layout in level.layouts:
+    assert layout.avatar.x == layout.avatar.starting_x
+
+# Jumping should lift both avatars off the ground at the same time.
+step(level, JUMP)
+for layout, y in zip(level.layouts, resting_y):
+    assert layout.avatar.in_air
+    assert layout.avatar.y < y
+
+# Walking right from the spawn point should land an avatar on spikes, which
+# counts a death and restarts the level.
+level = load_level(1)
+for tick in range(100):
+    step(level, MOVE_RIGHT)
+    if level.num_deaths > 0:
+        break
+assert level.num_deaths == 1
+assert not level.beaten()
+
+# Simulating the same inputs twice should give the same results.
+positions = []
+for attempt in range(2):
+    level = load_level(2)
+    for tick in range(300):
+        step(level, [MOVE_RIGHT, MOVE_RIGHT | JUMP, MOVE_LEFT][tick//40 % 3])
+    positions.append([(layout.avatar.x, layout.avatar.y)
+                      for layout in level.layouts])
+assert positions[0] == positions[1]
+
+# A level with more dimensions should be loaded from every one of its layout
+# files, and beaten by stepping all of its avatars together.
+level = load_level(4)
+assert len(level.layouts) == 4
+assert [layout.avatar.color for layout in level.layouts] == AVATAR_COLORS
+assert level.layouts[3].file_name == 'level4c.txt'
+for inputs in solve_level(4).inputs:
+    step(level, inputs)
+assert level.beaten()
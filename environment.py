@@ -0,0 +1,368 @@
+"""CS 108 A Final Project
+
+Part of the model for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the Environment class, which wraps a level's layouts in the
+reset/step interface used by reinforcement learning libraries (in the style of
+Gymnasium, without depending on it), and the VectorEnvironment class, which
+steps many Environments at once in worker processes.
+
+An Environment's actions are the engine's input flags (see engine): any int
+from 0 to NUM_ACTIONS - 1 combining MOVE_LEFT, MOVE_RIGHT, and JUMP. Its
+observations are lists of OBSERVATION_FEATURES floats per layout: the Avatar's
+position (in tiles), its velocities (in tiles per tick), whether it is in the
+air, and whether its layout is beaten, followed by the kinds (see
+EMPTY_CODE...OUTSIDE_CODE) of the square patch of tiles around it, row by row.
+Each layout an Avatar beats gives EXIT_REWARD; an episode is over (terminated)
+when an Avatar is impaled or every layout is beaten, and is cut short
+(truncated) after max_ticks ticks.
+
+A VectorEnvironment keeps its Environments' actions, observations, rewards, and
+episode ends in a single block of shared memory, so its worker processes only
+exchange short messages with it each step. Its Environments are reset as soon
+as their episodes end.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import multiprocessing
+import os
+from array import array
+from multiprocessing import shared_memory
+
+from engine import (CLASSIC_COLLISION, JUMP, MOVE_LEFT, MOVE_RIGHT,
+                    load_level, step)
+from layout import OBJECT_STORAGE
+from level_graphics_objects import Block, Spikes, LevelEnding
+
+# The number of actions (input flag combinations).
+NUM_ACTIONS = (MOVE_LEFT | MOVE_RIGHT | JUMP) + 1
+
+# The number of tiles between the Avatar's tile and the edges of its patch.
+PATCH_RADIUS = 2
+
+# The number of features observed about each Avatar before its patch.
+AVATAR_FEATURES = 6
+
+# The codes of the kinds of tiles in a patch.
+EMPTY_CODE = 0
+BLOCK_CODE = 1
+SPIKES_CODE = 2
+EXIT_CODE = 3
+OUTSIDE_CODE = 4
+
+# The reward for each layout beaten.
+EXIT_REWARD = 1.0
+
+# The number of ticks after which an episode is cut short.
+MAX_TICKS = 3000
+
+
+def observation_features(patch_radius=PATCH_RADIUS):
+    """Returns the number of features observed about each layout with patches
+       of the received radius."""
+
+    return AVATAR_FEATURES + (2 * patch_radius + 1) ** 2
+
+
+# The number of features observed about each layout.
+OBSERVATION_FEATURES = observation_features()
+
+
+def tile_code(layout, column, row):
+    """Returns the code of the kind of the tile of the received column and row
+       of the received Layout."""
+
+    if not (0 <= column < layout.width_in_layout_units and
+            0 <= row < layout.height_in_layout_units):
+        return OUTSIDE_CODE
+
+    level_object = layout.tiles.get((column, row))
+    if isinstance(level_object, Block):
+        return BLOCK_CODE
+    if isinstance(level_object, Spikes):
+        return SPIKES_CODE
+    if isinstance(level_object, LevelEnding):
+        return EXIT_CODE
+
+    return EMPTY_CODE
+
+
+class Environment:
+    """Represents a level played one tick at a time by an agent."""
+
+    def __init__(self, level_id, storage=OBJECT_STORAGE,
+                 collision=CLASSIC_COLLISION, max_ticks=MAX_TICKS,
+                 patch_radius=PATCH_RADIUS):
+        """Receives the level ID (int) of the level to play, how to store its
+           level objects and simulate it (see load_level), the number of ticks
+           after which an episode is cut short, and the radius of the patch of
+           tiles observed around each Avatar."""
+
+        self.state = load_level(level_id, storage, collision)
+        # Every episode starts from the level's fresh state (restarting the
+        # level after a death leaves whether the Avatars are in the air).
+        self.spawn_snapshot = self.state.snapshot()
+        self.max_ticks = max_ticks
+        self.patch_radius = patch_radius
+        self.observation_size = (len(self.state.layouts) *
+                                 observation_features(patch_radius))
+        self.episode_ticks = 0
+
+
+    def reset(self, seed=None):
+        """Starts a new episode and returns (observation, info). The level is
+           deterministic, so the received seed is only accepted for
+           compatibility."""
+
+        self.state.restore(self.spawn_snapshot)
+        self.state.num_deaths = 0
+        self.episode_ticks = 0
+
+        return self.observe(), self.info()
+
+
+    def step(self, action):
+        """Advances the episode by one tick holding the received action (input
+           flags) and returns (observation, reward, terminated, truncated,
+           info)."""
+
+        num_deaths = self.state.num_deaths
+        was_beaten = [layout.beaten for layout in self.state.layouts]
+
+        step(self.state, action)
+        self.episode_ticks += 1
+
+        # Being impaled restarts the level, unbeating every layout.
+        impaled = self.state.num_deaths != num_deaths
+        reward = 0.0
+        if not impaled:
+            for layout, beaten in zip(self.state.layouts, was_beaten):
+                if layout.beaten and not beaten:
+                    reward += EXIT_REWARD
+
+        terminated = impaled or self.state.beaten()
+        truncated = not terminated and self.episode_ticks >= self.max_ticks
+        info = self.info()
+        info['impaled'] = impaled
+
+        return self.observe(), reward, terminated, truncated, info
+
+
+    def observe(self):
+        """Returns the current observation (a list of floats)."""
+
+        observation = []
+        for layout in self.state.layouts:
+            avatar = layout.avatar
+            observation += [avatar.x / layout.UNIT, avatar.y / layout.UNIT,
+                            avatar.x_vel / layout.UNIT,
+                            avatar.y_vel / layout.UNIT,
+                            float(bool(avatar.in_air)), float(layout.beaten)]
+
+            avatar_column = int(avatar.x // layout.UNIT)
+            avatar_row = int(avatar.y // layout.UNIT)
+            for row in range(avatar_row - self.patch_radius,
+                             avatar_row + self.patch_radius + 1):
+                for column in range(avatar_column - self.patch_radius,
+                                    avatar_column + self.patch_radius + 1):
+                    observation.append(float(tile_code(layout, column, row)))
+
+        return observation
+
+
+    def info(self):
+        """Returns a dictionary of details about the episode which are not
+           part of the observation."""
+
+        return dict(episode_ticks=self.episode_ticks,
+                    num_deaths=self.state.num_deaths)
+
+
+def shared_arrays(memory, num_environments, observation_size):
+    """Returns the (observations, rewards, actions, terminated, truncated)
+       arrays (memoryviews) laid out in the received block of shared
+       memory."""
+
+    sizes = [('d', num_environments * observation_size),
+             ('d', num_environments), ('i', num_environments),
+             ('B', num_environments), ('B', num_environments)]
+
+    arrays = []
+    offset = 0
+    for type_code, length in sizes:
+        item_size = {'d': 8, 'i': 4, 'B': 1}[type_code]
+        arrays.append(memory.buf[offset:offset + item_size * length]
+                      .cast(type_code))
+        offset += item_size * length
+
+    return arrays
+
+
+def shared_memory_size(num_environments, observation_size):
+    """Returns the number of bytes shared_arrays needs."""
+
+    return num_environments * (8 * observation_size + 8 + 4 + 1 + 1)
+
+
+def run_worker(connection, memory_name, first_index, num_environments,
+               total_environments, environment_arguments):
+    """Runs Environments first_index to first_index + num_environments - 1 of
+       a VectorEnvironment in a worker process, carrying out the commands
+       ('reset', 'step', or 'close') received over the connection, reading
+       actions from and writing results to the shared memory of the received
+       name."""
+
+    environments = [Environment(*environment_arguments)
+                    for index in range(num_environments)]
+    observation_size = environments[0].observation_size
+    memory = shared_memory.SharedMemory(name=memory_name)
+    (observations, rewards, actions, terminated,
+     truncated) = shared_arrays(memory, total_environments, observation_size)
+
+    try:
+        while True:
+            command = connection.recv()
+            if command == 'close':
+                break
+
+            for offset, environment in enumerate(environments):
+                index = first_index + offset
+                if command == 'reset':
+                    observation, info = environment.reset()
+                    rewards[index] = 0.0
+                    terminated[index] = truncated[index] = 0
+                else:
+                    (observation, rewards[index], ended, cut_short,
+                     info) = environment.step(actions[index])
+                    terminated[index] = ended
+                    truncated[index] = cut_short
+                    # Episodes which have ended are started again at once.
+                    if ended or cut_short:
+                        observation, info = environment.reset()
+                observations[index * observation_size:
+                             (index + 1) * observation_size] = \
+                    array('d', observation)
+
+            connection.send(command)
+    finally:
+        # Views of the shared memory must be released before closing it.
+        del observations, rewards, actions, terminated, truncated
+        memory.close()
+        connection.close()
+
+
+class VectorEnvironment:
+    """Represents many Environments of the same level stepped together across
+       a pool of worker processes."""
+
+    def __init__(self, level_id, num_environments, num_workers=None,
+                 storage=OBJECT_STORAGE, collision=CLASSIC_COLLISION,
+                 max_ticks=MAX_TICKS, patch_radius=PATCH_RADIUS):
+        """Receives the level ID (int) of the level to play, the number of
+           Environments to step, the number of worker processes to step them
+           in (one per CPU core, up to one per Environment, if None), and the
+           settings of each Environment (see Environment)."""
+
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        num_workers = max(1, min(num_workers, num_environments))
+
+        self.num_environments = num_environments
+        # Load the level here too, so missing files are reported right away.
+        self.observation_size = Environment(level_id, storage, collision,
+                                            max_ticks,
+                                            patch_radius).observation_size
+
+        self.memory = shared_memory.SharedMemory(
+            create=True, size=shared_memory_size(num_environments,
+                                                 self.observation_size))
+        (self.observations, self.rewards, self.actions, self.terminated,
+         self.truncated) = shared_arrays(self.memory, num_environments,
+                                         self.observation_size)
+
+        # Divide the Environments between the workers as evenly as possible.
+        self.connections = []
+        self.workers = []
+        first_index = 0
+        for worker_index in range(num_workers):
+            count = ((num_environments + worker_index) // num_workers)
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=run_worker, daemon=True,
+                args=(worker_connection, self.memory.name, first_index, count,
+                      num_environments,
+                      (level_id, storage, collision, max_ticks, patch_radius)))
+            worker.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.workers.append(worker)
+            first_index += count
+
+
+    def run(self, command):
+        """Sends the received command to every worker and waits for them all
+           to carry it out."""
+
+        for connection in self.connections:
+            connection.send(command)
+        for connection in self.connections:
+            connection.recv()
+
+
+    def reset(self):
+        """Starts a new episode in every Environment and returns the list of
+           their observations (lists of floats)."""
+
+        self.run('reset')
+        return self.observation_lists()
+
+
+    def step(self, actions):
+        """Advances every Environment by one tick holding the received list of
+           actions (one per Environment), and returns lists of their
+           (observations, rewards, terminated, truncated); Environments whose
+           episodes ended have been reset, and return the observation of the
+           new episode."""
+
+        self.actions[:] = array('i', actions)
+
+        self.run('step')
+
+        return (self.observation_lists(), self.rewards.tolist(),
+                [bool(ended) for ended in self.terminated],
+                [bool(cut_short) for cut_short in self.truncated])
+
+
+    def observation_lists(self):
+        """Returns the list of every Environment's observation (lists of
+           floats) in the shared memory."""
+
+        observations = self.observations.tolist()
+        return [observations[index * self.observation_size:
+                             (index + 1) * self.observation_size]
+                for index in range(self.num_environments)]
+
+
+    def close(self):
+        """Stops the worker processes and frees the shared memory."""
+
+        if self.memory is None:
+            return
+
+        for connection in self.connections:
+            connection.send('close')
+            connection.close()
+        for worker in self.workers:
+            worker.join()
+
+        # Views of the shared memory must be released before closing it.
+        for array in [self.observations, self.rewards, self.actions,
+                      self.terminated, self.truncated]:
+            array.release()
+        self.memory.close()
+        self.memory.unlink()
+        self.memory = None
@@ -0,0 +1,80 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that levels are played properly through the environment interface.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+from engine import MOVE_RIGHT, NO_INPUT
+from environment import (BLOCK_CODE, EXIT_REWARD, OBSERVATION_FEATURES,
+                         OUTSIDE_CODE, Environment, VectorEnvironment)
+from solver import solve_level
+
+environment = Environment(1)
+observation, info = environment.reset()
+assert len(observation) == environment.observation_size == \
+    2 * OBSERVATION_FEATURES
+assert info == dict(episode_ticks=0, num_deaths=0)
+
+# The Avatar of level 1 spawns in the third column of the fourth row, on
+# a block, one row above the bottom of its layout.
+assert observation[:6] == [2.5, 3.5, 0.0, 0.0, 0.0, 0.0]
+patch = observation[6:OBSERVATION_FEATURES]
+assert patch[3 * 5 + 2] == BLOCK_CODE
+assert patch[4 * 5:] == [OUTSIDE_CODE] * 5
+
+# Following a solution should reward beating each layout and end the
+# episode once both are beaten.
+solution = solve_level(1).inputs
+total_reward = 0
+for tick, inputs in enumerate(solution):
+    observation, reward, terminated, truncated, info = \
+        environment.step(inputs)
+    total_reward += reward
+    assert terminated == (tick == len(solution) - 1)
+    assert not truncated
+assert total_reward == 2 * EXIT_REWARD
+
+# Being impaled should end the episode without a reward.
+first_observation = environment.reset()[0]
+terminated = False
+while not terminated:
+    observation, reward, terminated, truncated, info = \
+        environment.step(MOVE_RIGHT)
+    assert reward == 0
+assert info['impaled'] and info['num_deaths'] == 1
+assert environment.reset()[0] == first_observation
+
+# Episodes should be cut short after the maximum number of ticks.
+short_environment = Environment(1, max_ticks=3)
+short_environment.reset()
+for tick in range(3):
+    truncated = short_environment.step(NO_INPUT)[3]
+assert truncated
+
+# A vector of environments should step each environment with its own actions,
+# the same way as a single environment, resetting the ones whose episodes end.
+# Its worker processes may re-import this module, so it only runs when the
+# tests are run directly.
+if __name__ == '__main__':
+    vector = VectorEnvironment(1, 3, num_workers=2)
+    try:
+        observations = vector.reset()
+        assert observations == [first_observation] * 3
+        total_rewards = [0] * 3
+        for inputs in solution:
+            observations, rewards, terminated, truncated = \
+                vector.step([inputs, inputs, MOVE_RIGHT])
+            total_rewards = [total + reward for total, reward
+                             in zip(total_rewards, rewards)]
+            if terminated[2]:
+                assert observations[2] == first_observation
+        assert total_rewards == [2 * EXIT_REWARD, 2 * EXIT_REWARD, 0]
+        assert terminated[:2] == [True, True]
+        assert observations[0] == first_observation
+    finally:
+        vector.close()
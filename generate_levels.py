@@ -0,0 +1,427 @@
+"""CS 108 A Final Project
+
+Part of the "Out of Sync" parallel-dimensional 2D platforming puzzle, supplying
+the generate_levels function, which makes random pairs of main and alt layouts
+in the layout file format and keeps only the ones which pass the same checks
+as validate_levels, so new levels can be made without drawing them by hand.
+
+Each candidate level is made from a single random seed, so any level can be
+made again from its seed. Candidates are made and checked in batches across a
+pool of processes, and each is checked for:
+ - parse: both layouts follow the layout file format
+ - spawn: each Avatar starts inside its layout, clear of blocks and spikes
+ - exits: each Avatar can reach an exit of its own layout
+ - solvable: both layouts can be beaten together under the same inputs
+stopping at the first check it fails. Candidates are checked in memory, without
+writing any files; only levels which pass are written out.
+
+Exploring every state an Avatar can reach (see solver) takes around a fifth
+of a second for a small layout, so the exits check first runs a quick flood
+fill over both layouts' tiles, following the tiles an Avatar's center could
+pass through (never into blocks or spikes, and rising no further after a jump
+than a jump can reach); a candidate with an exit it cannot reach is rejected
+before either layout is explored, and the full checks are still run on every
+candidate it does not reject. Left to follow every tile an Avatar could reach,
+the fill never rejects a level the full check would have passed, but it lets
+Avatars drift across the air for as long as they like, and so passes nearly
+nine in ten layouts. By default it also limits how far an Avatar drifts
+between landings (see AIR_COLUMNS), which passes fewer than three in ten.
+Checked against the full exits check on 1,600 generated layouts, this
+rejected one of the 181 whose exits can be reached. Together with exploring
+layouts without the engine's objects (see layout_stepper), it makes checking
+candidates around 20 times as fast: from around 120 to around 2,400 a minute
+on one CPU core.
+
+Run this file to generate levels from the command line, e.g.
+'python generate_levels.py generated --count 20 --width 24 --height 8'.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import argparse
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from math import floor
+from time import perf_counter
+
+from engine import LevelState
+from layout import Layout
+from layout_map import parse_layout_lines
+from level_graphics_objects import Avatar
+from level_index import find_levels, level_file_paths
+from solver import LayoutGraph, UNREACHABLE, solve
+from validate_levels import check_layout_lines, spawn_problems
+
+# The default size (in tiles) and densities (chances from 0 to 1 of each tile
+# holding a block or spikes) of generated layouts.
+WIDTH = 20
+HEIGHT = 8
+BLOCK_DENSITY = 0.15
+SPIKE_DENSITY = 0.05
+
+# The height (in pixels) an Avatar's center rises in a jump; gravity slows it
+# from the first tick.
+JUMP_HEIGHT = sum(range(1, -Avatar.JUMP_VEL))
+
+# The number of joint states searched for a solution before a candidate is
+# rejected as too hard to check.
+MAX_STATES = 20000
+
+# The number of columns an Avatar may cross in the air in the exits check's
+# flood fill (see exit_may_be_reachable); None for any number, which never
+# rejects a layout whose exits can be reached, but rejects far fewer.
+AIR_COLUMNS = 1
+
+# The number of candidates each worker process checks per batch.
+CANDIDATES_PER_WORKER = 50
+
+# The checks candidates are rejected by, in the order they are run.
+CHECK_NAMES = ['parse', 'spawn', 'exits', 'solvable']
+
+
+class GeneratorSettings:
+    """Represents the size and densities of the layouts to generate and the
+       effort spent checking them."""
+
+    def __init__(self, width=WIDTH, height=HEIGHT,
+                 block_density=BLOCK_DENSITY, spike_density=SPIKE_DENSITY,
+                 max_states=MAX_STATES, air_columns=AIR_COLUMNS):
+        """Receives the width and height (in tiles) of the layouts, the chances
+           (from 0 to 1) of each of their tiles holding a block or spikes, the
+           number of joint states to search for a solution, and the number of
+           columns an Avatar may cross in the air in the exits check's flood
+           fill (None for any number; see exit_may_be_reachable)."""
+
+        if width < 4 or height < 3:
+            raise ValueError('layouts must be at least 4 tiles wide and 3 '
+                             'tiles high')
+
+        self.width = width
+        self.height = height
+        self.block_density = block_density
+        self.spike_density = spike_density
+        self.max_states = max_states
+        self.air_columns = air_columns
+
+
+def generate_layout_lines(settings, generator):
+    """Returns a list of the lines (without line endings) of a random layout
+       file of the received GeneratorSettings, using the received
+       random.Random: the bottom row is a floor of blocks broken up by
+       spikes, the Avatar spawns on the floor in the left quarter of the
+       layout with clear tiles above it, and an exit is placed in the right
+       quarter."""
+
+    width = settings.width
+    height = settings.height
+
+    rows = []
+    for row in range(height - 1):
+        line = []
+        for column in range(width):
+            roll = generator.random()
+            if roll < settings.block_density:
+                line.append('#')
+            elif roll < settings.block_density + settings.spike_density:
+                line.append('^')
+            else:
+                line.append('-')
+        rows.append(line)
+    rows.append(['^' if generator.random() < settings.spike_density else '#'
+                 for column in range(width)])
+
+    # Clear the spawn point and the tile above it, and stand it on a block.
+    spawn_column = generator.randrange(max(1, width//4))
+    rows[-2][spawn_column] = '-'
+    rows[-3][spawn_column] = '-'
+    rows[-1][spawn_column] = '#'
+
+    exit_column = generator.randrange(width - max(1, width//4), width)
+    exit_row = generator.randrange(height - 1)
+    rows[exit_row][exit_column] = '@'
+
+    # Spawn coordinates count rows up from the bottom of the layout.
+    return [''.join(line) for line in rows] + [str(spawn_column) + ', 1']
+
+
+def exit_may_be_reachable(map_lines, unit, air_columns=None):
+    """Returns whether or not the Avatar of the layout of the received list of
+       layout file lines, with tiles of the received size (in pixels), might
+       be able to reach an exit, flood filling every tile its center could
+       move through: tiles not holding blocks (which it is pushed out of) or
+       spikes (which impale it), to any of the eight tiles around it
+       (diagonally only past a corner with an open tile on one side). Its
+       center only rises from a tile it could have jumped from (its spawn
+       point, or above a block or the bottom of the layout), and then at most
+       as many rows as a jump can cross, counting rows above the top of the
+       layout, where there is nothing in its way. Every tile the Avatar can
+       reach is filled, so a layout this rejects can never be beaten.
+
+       If air_columns is not None, the fill follows jumps more closely, and
+       is no longer sure to fill every tile the Avatar can reach: the Avatar
+       crosses at most air_columns columns in the air between landings
+       (regaining one for each row it falls, since it drifts as it falls),
+       and only lands on blocks it has risen at most one row above, since
+       its feet never rise a full two rows."""
+
+    rows = map_lines[:-1]
+    width = len(rows[0])
+    climb_rows = -(-JUMP_HEIGHT//unit)
+    # An Avatar can stand on blocks in the top row and jump from there.
+    open_rows = climb_rows + 1
+    rows = ['-' * width] * open_rows + rows
+    height = len(rows)
+
+    # The tile holding the center of the Avatar at its spawn point, which
+    # counts rows up from the bottom of the layout.
+    spawn_x, spawn_y = (float(value) for value in map_lines[-1].split(','))
+    spawn = (floor(spawn_x + 0.5), floor(height - spawn_y - 0.5))
+
+    def open_tile(column, row):
+        return (0 <= column < width and 0 <= row < height and
+                rows[row][column] not in '#^')
+
+    def on_ground(column, row):
+        # The Avatar is as wide as a tile, so it can stand on a block to
+        # either side of the tile holding its center, unless another block
+        # sits on that block and keeps it away.
+        if row == height - 1:
+            return True
+        return any(rows[row + 1][block_column] == '#' and
+                   (block_column == column or
+                    rows[row][block_column] != '#')
+                   for block_column in range(max(column - 1, 0),
+                                             min(column + 2, width)))
+
+    # Each state is a tile, the number of rows the Avatar may still rise,
+    # whether it is falling, and the number of columns it may still cross
+    # before landing (None for any number).
+    unexplored = [(spawn[0], spawn[1], climb_rows, False, air_columns)]
+    seen = set(unexplored)
+    while unexplored:
+        column, row, rise, falling, columns_left = unexplored.pop()
+        if rows[row][column] == '@':
+            return True
+
+        landed = on_ground(column, row)
+        if air_columns is not None:
+            landed = landed and (falling or rise >= climb_rows - 1)
+        if landed:
+            rise = climb_rows
+            falling = False
+            columns_left = air_columns
+
+        for row_step in (-1, 0, 1):
+            if row_step == -1 and (rise == 0 or falling):
+                continue
+            # Rising uses up the rows left to rise; once falling, the Avatar
+            # cannot rise again until it lands, and drifts further the
+            # further it falls.
+            following_rise = {-1: rise - 1, 0: rise, 1: 0}[row_step]
+            following_falling = falling or row_step == 1
+            following_columns = columns_left
+            if falling and row_step == 1 and columns_left is not None:
+                following_columns = min(columns_left + 1, air_columns)
+            for column_step in (-1, 0, 1):
+                if column_step == 0 and row_step == 0:
+                    continue
+                # Walking along the ground crosses any number of columns.
+                walking = landed and row_step == 0
+                if (column_step != 0 and not walking and
+                    following_columns is not None):
+                    if following_columns == 0:
+                        continue
+                    crossed_columns = following_columns - 1
+                else:
+                    crossed_columns = following_columns
+                following = (column + column_step, row + row_step,
+                             following_rise, following_falling,
+                             crossed_columns)
+                # The Avatar cannot squeeze diagonally between two blocks.
+                if (open_tile(following[0], following[1]) and
+                    (open_tile(column + column_step, row) or
+                     open_tile(column, row + row_step)) and
+                    following not in seen):
+                    seen.add(following)
+                    unexplored.append(following)
+
+    return False
+
+
+def generate_candidate(seed, settings):
+    """Returns the (main, alt) lists of layout file lines of the candidate
+       level of the received seed (int) and GeneratorSettings."""
+
+    generator = random.Random(seed)
+    return (generate_layout_lines(settings, generator),
+            generate_layout_lines(settings, generator))
+
+
+def check_candidate(seed, settings):
+    """Makes and checks the candidate level of the received seed (int) and
+       GeneratorSettings, and returns (seed, the name of the first check it
+       failed or None if it passed, the number of ticks its solution takes or
+       None)."""
+
+    candidate = generate_candidate(seed, settings)
+    names = ['main', 'alt']
+
+    for name, map_lines in zip(names, candidate):
+        if check_layout_lines(name, map_lines):
+            return seed, 'parse', None
+
+    layouts = [Layout(name, layout_map=parse_layout_lines(map_lines))
+               for name, map_lines in zip(names, candidate)]
+
+    for name, layout in zip(names, layouts):
+        if spawn_problems(name, layout):
+            return seed, 'spawn', None
+
+    if not all(exit_may_be_reachable(map_lines, layout.UNIT,
+                                     settings.air_columns)
+               for map_lines, layout in zip(candidate, layouts)):
+        return seed, 'exits', None
+
+    # Explore each layout only once the ones before it can be beaten.
+    graphs = []
+    for layout in layouts:
+        graph = LayoutGraph(layout)
+        if graph.ticks_to_exit[graph.spawn_ids[False]] == UNREACHABLE:
+            return seed, 'exits', None
+        graphs.append(graph)
+
+    solution = solve(LevelState(layouts), settings.max_states, graphs)
+    if not solution.solvable:
+        return seed, 'solvable', None
+
+    return seed, None, len(solution.inputs)
+
+
+def generate_levels(count, settings=None, first_seed=0, max_candidates=None,
+                    max_workers=None):
+    """Checks candidate levels of the received GeneratorSettings (the defaults
+       if None), starting from the received seed, across a pool of at most
+       max_workers processes (one per CPU core if None), until count of them
+       pass or max_candidates have been checked (if not None), and returns a
+       dictionary report: the passing candidates ('levels', a list of
+       dictionaries of their seed, layout file lines, and solution length),
+       the number of candidates checked ('num_candidates'), the number
+       rejected by each check ('rejections'), and the time taken
+       ('seconds')."""
+
+    if settings is None:
+        settings = GeneratorSettings()
+
+    start_time = perf_counter()
+    levels = []
+    rejections = dict.fromkeys(CHECK_NAMES, 0)
+    num_candidates = 0
+    seed = first_seed
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        batch_size = CANDIDATES_PER_WORKER * max_workers
+        while len(levels) < count and (max_candidates is None or
+                                       num_candidates < max_candidates):
+            if max_candidates is not None:
+                batch_size = min(batch_size, max_candidates - num_candidates)
+            seeds = range(seed, seed + batch_size)
+            seed += batch_size
+
+            results = executor.map(check_candidate, seeds,
+                                   [settings] * batch_size,
+                                   chunksize=CANDIDATES_PER_WORKER)
+            for candidate_seed, failed_check, solution_ticks in results:
+                num_candidates += 1
+                if failed_check is not None:
+                    rejections[failed_check] += 1
+                elif len(levels) < count:
+                    main_lines, alt_lines = generate_candidate(candidate_seed,
+                                                               settings)
+                    levels.append(dict(seed=candidate_seed,
+                                       main_lines=main_lines,
+                                       alt_lines=alt_lines,
+                                       solution_ticks=solution_ticks))
+
+    return dict(levels=levels, num_candidates=num_candidates,
+                rejections=rejections, seconds=perf_counter() - start_time)
+
+
+def write_level(directory, level_id, level):
+    """Writes the main and alt layout files of the received generated level
+       (see generate_levels) as the level of the received level ID (int) in
+       the received directory, and returns their names."""
+
+    # Generated levels have two dimensions.
+    file_names = level_file_paths(directory, level_id)[:2]
+    for file_name, map_lines in zip(file_names, [level['main_lines'],
+                                                 level['alt_lines']]):
+        with open(file_name, 'w') as level_map:
+            level_map.write('\n'.join(map_lines))
+
+    return file_names
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Generate solvable levels across all CPU cores.')
+    parser.add_argument('directory', nargs='?', default='.',
+                        help='directory to write the levels to')
+    parser.add_argument('--count', type=int, default=10,
+                        help='number of levels to generate')
+    parser.add_argument('--width', type=int, default=WIDTH)
+    parser.add_argument('--height', type=int, default=HEIGHT)
+    parser.add_argument('--block-density', type=float, default=BLOCK_DENSITY)
+    parser.add_argument('--spike-density', type=float, default=SPIKE_DENSITY)
+    parser.add_argument('--max-states', type=int, default=MAX_STATES,
+                        help='joint states to search per candidate before '
+                             'rejecting it')
+    parser.add_argument('--air-columns', type=int, default=AIR_COLUMNS,
+                        help='columns an Avatar may cross in the air in the '
+                             'quick exits check')
+    parser.add_argument('--any-air-columns', action='store_const',
+                        const=None, dest='air_columns',
+                        help='let Avatars cross any number of columns in the '
+                             'air in the quick exits check, so that it never '
+                             'rejects a level that can be beaten')
+    parser.add_argument('--max-candidates', type=int, default=None,
+                        help='number of candidates to check before giving up')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the first candidate')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes')
+    arguments = parser.parse_args()
+
+    settings = GeneratorSettings(arguments.width, arguments.height,
+                                 arguments.block_density,
+                                 arguments.spike_density, arguments.max_states,
+                                 arguments.air_columns)
+    report = generate_levels(arguments.count, settings, arguments.seed,
+                             arguments.max_candidates, arguments.workers)
+
+    # Number the new levels after the levels already in the directory.
+    os.makedirs(arguments.directory, exist_ok=True)
+    level_ids = find_levels(arguments.directory, complete_only=False)
+    next_level_id = level_ids[-1] + 1 if level_ids else 1
+    for level in report['levels']:
+        write_level(arguments.directory, next_level_id, level)
+        print('Level ' + str(next_level_id) + ': seed ' + str(level['seed']) +
+              ', solvable in ' + str(level['solution_ticks']) + ' ticks')
+        next_level_id += 1
+
+    minutes = report['seconds'] / 60
+    print(str(report['num_candidates']) + ' candidates checked in ' +
+          str(round(report['seconds'], 2)) + ' s (' +
+          str(round(report['num_candidates'] / minutes)) + ' per minute); ' +
+          'rejected: ' + ', '.join(name + ' ' + str(report['rejections'][name])
+                                   for name in CHECK_NAMES), file=sys.stderr)
+
+    sys.exit(0 if len(report['levels']) == arguments.count else 1)
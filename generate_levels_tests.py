@@ -0,0 +1,155 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that generated levels are made and filtered properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import os
+import tempfile
+
+from generate_levels import (GeneratorSettings, check_candidate,
+                             exit_may_be_reachable, generate_candidate,
+                             generate_levels, write_level)
+from layout import Layout
+from layout_map import parse_layout_lines
+from solver import LayoutGraph, UNREACHABLE
+from validate_levels import check_layout_lines, validate_level
+
+
+def exit_reachable(map_lines):
+    """Returns whether or not the Avatar of the layout of the received list of
+       layout file lines can reach an exit, by exploring every state it can
+       reach (see solver)."""
+
+    graph = LayoutGraph(Layout('candidate',
+                               layout_map=parse_layout_lines(map_lines)))
+    return graph.ticks_to_exit[graph.spawn_ids[False]] != UNREACHABLE
+
+
+def check_written_level(level):
+    """Writes the received generated level (see generate_levels) to a new
+       directory and asserts that it passes validation there."""
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_names = write_level(directory, 5, level)
+        assert [os.path.basename(file_name) for file_name in file_names] == \
+            ['level5.txt', 'level5a.txt']
+        checks = validate_level(directory, 5)['checks']
+        for name in ['parse', 'spawn', 'exits', 'solvable']:
+            assert checks[name]['passed']
+
+
+UNIT = Layout('level1.txt').UNIT
+
+# Candidates should be layout files of the requested size, made the same way
+# every time from the same seed.
+settings = GeneratorSettings(width=12, height=5)
+main_lines, alt_lines = generate_candidate(3, settings)
+assert (main_lines, alt_lines) == generate_candidate(3, settings)
+assert generate_candidate(4, settings) != (main_lines, alt_lines)
+for map_lines in [main_lines, alt_lines]:
+    assert check_layout_lines('candidate', map_lines) == []
+    assert len(map_lines) == 6
+    assert all(len(line) == 12 for line in map_lines[:-1])
+    assert sum(line.count('@') for line in map_lines) == 1
+
+# The quick exits check should follow walks, falls, jumps onto blocks, and
+# climbs over the top of the layout, but not jumps up to exits far above the
+# floor, climbs up walls, or paths through spikes.
+with open('level1.txt') as level_map:
+    assert exit_may_be_reachable(level_map.read().splitlines(), UNIT)
+assert exit_may_be_reachable(['------',
+                              '----@-',
+                              '------',
+                              '--#---',
+                              '######',
+                              '0, 1'], UNIT)
+over_the_top = ['---#-',
+                '--##-',
+                '-###@',
+                '#####',
+                '0, 1']
+assert exit_may_be_reachable(over_the_top, UNIT)
+assert exit_reachable(over_the_top)
+assert not exit_may_be_reachable(['----@-',
+                                  '------',
+                                  '------',
+                                  '------',
+                                  '------',
+                                  '######',
+                                  '0, 1'], UNIT)
+assert not exit_may_be_reachable(['--#@',
+                                  '--#-',
+                                  '--#-',
+                                  '--#-',
+                                  '####',
+                                  '0, 1'], UNIT)
+assert not exit_may_be_reachable(['--^---',
+                                  '--^---',
+                                  '--^-@-',
+                                  '##^###',
+                                  '0, 1'], UNIT)
+
+# Limiting the columns crossed in the air should still follow those paths,
+# and jumps across one-tile gaps, but not across wide pits which the Avatar
+# could only cross by hovering.
+with open('level1.txt') as level_map:
+    assert exit_may_be_reachable(level_map.read().splitlines(), UNIT, 1)
+assert exit_may_be_reachable(over_the_top, UNIT, 1)
+assert exit_may_be_reachable(['--------',
+                              '--------',
+                              '------@-',
+                              '##^^####',
+                              '0, 1'], UNIT, 1)
+wide_pit = ['--------',
+            '--------',
+            '-------@',
+            '#^^^^^##',
+            '0, 1']
+assert exit_may_be_reachable(wide_pit, UNIT)
+assert not exit_may_be_reachable(wide_pit, UNIT, 1)
+assert not exit_reachable(wide_pit)
+
+# The quick exits check should never reject a layout whose exit the Avatar
+# can reach, and limiting the columns crossed in the air should not here
+# either.
+settings = GeneratorSettings(width=8, height=5, block_density=0.25,
+                             spike_density=0.1)
+for seed in range(20):
+    for map_lines in generate_candidate(seed, settings):
+        if exit_reachable(map_lines):
+            assert exit_may_be_reachable(map_lines, UNIT)
+            assert exit_may_be_reachable(map_lines, UNIT, 1)
+
+# Every candidate which passes its checks should pass validation once written
+# out.
+settings = GeneratorSettings(width=8, height=4, block_density=0.1)
+num_passed = 0
+for seed in range(12):
+    candidate_seed, failed_check, solution_ticks = check_candidate(seed,
+                                                                   settings)
+    assert candidate_seed == seed
+    if failed_check is None:
+        num_passed += 1
+        assert solution_ticks > 0
+        main_lines, alt_lines = generate_candidate(seed, settings)
+        check_written_level(dict(seed=seed, main_lines=main_lines,
+                                 alt_lines=alt_lines,
+                                 solution_ticks=solution_ticks))
+assert num_passed > 0
+
+# Levels checked across a pool of processes should be kept only if they pass,
+# and should pass validation once written out. The worker processes may
+# re-import this module, so this only runs when the tests are run directly.
+if __name__ == '__main__':
+    report = generate_levels(3, settings, max_candidates=12, max_workers=2)
+    assert report['num_candidates'] == 12
+    assert len(report['levels']) == 3
+    for level in report['levels']:
+        assert level['solution_ticks'] > 0
+        check_written_level(level)
@@ -1,9 +1,10 @@
 """CS 108 A Final Project
 
 This GUI view for "Out of Sync" (a parallel-dimensional 2D platforming puzzle)
-presents the user with levels consisting of two alternate layouts made of
-Block, Spikes, and LevelEnding objects (provided by the model), each layout
-containing user-controlled avatars that make simultaneous movements.
+presents the user with levels consisting of two or more alternate layouts
+(dimensions) made of Block, Spikes, and LevelEnding objects (provided by the
+model), each layout containing user-controlled avatars that make simultaneous
+movements.
 
 FEATURES ADDED SINCE WALKTHROUGH
  - Avatar movement, both in response to player input and due to gravity
@@ -20,6 +21,8 @@ FEATURES ADDED SINCE WALKTHROUGH
    the current level attempt.
  - A "fewest attempts" counter which stores and displays the fewest attempts
    ever needed to beat the current level.
+ - Rewinding the last few seconds of play (Z) and restarting the level from
+   the beginning (R) at any time; deaths undone this way still count.
    
 TO ADD/CREATE A LEVEL
  - Create a text file named with the format 'level#.txt' (for the main level
@@ -36,10 +39,11 @@ TO ADD/CREATE A LEVEL
         level.
       - Underneath the text block, write the desired starting coordinates for
         each layout's avatar in the format '#, #', without parentheses.
- - Create an empty text file named with the format 'min_attempts#.txt' (to store
-   the record of fewest attempts needed to beat the corresponding level).
- - Change NUM_LEVELS under the create_menu method to the number of desired
-   levels.
+ - To add more dimensions to a level, create further layout files in the same
+   format named 'level#b.txt', 'level#c.txt', and so on; the space bar cycles
+   through every layout in order.
+ - The level menu finds every 'level#.txt' file beside the game on its own
+   (see level_index), so no code needs changing to add a level.
 
 @author: Jason Chew (jgc23)
 @author: Serita Nelesen (smn4)
@@ -48,18 +52,65 @@ TO ADD/CREATE A LEVEL
 
 """
 
+import argparse
+import os
+from time import perf_counter
+
 from guizero import App, Box, Drawing, PushButton, Text
-from layout import Layout
+from controls import (Controls, DEFAULT_KEY_BINDINGS, RESTART, REWIND,
+                      SWITCH, load_key_bindings)
+from drawing_pool import DrawingPool
+from engine import step
+from level_index import LevelIndex
+from level_preloader import LevelPreloader
+from profiler import FrameProfiler
+from records import RecordsStore
+from render_scheduler import HudText, RenderScheduler
+from replay import InputRecorder
+from rewind import RewindBuffer
+from scheduler import FixedTimestep
+
+# The directory level attempts are recorded to when the game is run with
+# --record (see replay).
+RECORDING_DIRECTORY = 'recordings'
+
+# The file of custom key bindings loaded at startup, if it exists (see
+# controls).
+KEY_BINDINGS_FILE = 'key_bindings.json'
+
+# The number of level buttons shown on each page of the level menu.
+LEVELS_PER_PAGE = 30
+
+# The number of frames between updates of the profiling overlay, which is
+# itself a Tk update and so should not happen every frame.
+OVERLAY_FRAMES = 30
+
+# The number of seconds of play each press of the rewind key undoes, and the
+# number of seconds of play kept to rewind (see rewind).
+REWIND_SECONDS = 3
+HISTORY_SECONDS = 300
 
 class GameWindow:
     
-    def __init__(self, app):
-        """Receives an app to initialize/open game widgets within, and initializes
-           attributes storing level information."""
+    def __init__(self, app, tick_rate=100, recording_directory=None,
+                 profiler=None, key_bindings=DEFAULT_KEY_BINDINGS):
+        """Receives an app to initialize/open game widgets within, the number
+           of simulation ticks to run per second, the directory to save a
+           recording of every level attempt to (or None to not record them),
+           a FrameProfiler to time every frame with and show the timings of
+           (or None to not profile), and the key bindings (see controls), and
+           initializes attributes storing level information."""
         
         # Establish app as class attribute for easier access.
         self.app = app
         
+        # The schedule deciding how many ticks to simulate and when to render
+        # each time run_level is called, independent of timer delays.
+        self.timestep = FixedTimestep(tick_rate=tick_rate)
+        
+        self.recording_directory = recording_directory
+        self.profiler = profiler
+        
         # A box to contain the level selection box, a level completion
         # message box, and the quit button box.
         self.menu_box = Box(self.app)
@@ -72,6 +123,12 @@ class GameWindow:
         # A box to contain the level selection buttons.
         self.level_select_box = Box(self.menu_box, layout='grid')
         
+        # A box to contain the buttons turning pages of levels.
+        self.page_box = Box(self.menu_box, layout='grid')
+        
+        # A Text widget showing the details of the level under the mouse.
+        self.level_details = Text(self.menu_box, text='', size=9)
+        
         # A box to contain the quit button.
         self.quit_button_box = Box(self.menu_box, layout='grid', align='bottom')
         
@@ -91,37 +148,75 @@ class GameWindow:
         self.fewest_attempts_score = Text(self.control_panel_box,
                                           text=self.attempts_str, size=8,
                                           width=21, grid=[0, 0])
+        # The attempt score, updated only when the record shown changes.
+        self.fewest_attempts_hud = HudText(self.fewest_attempts_score,
+                                           self.attempts_str)
         
         # The base string used in the death count Text widget.
         self.deaths_str = 'DEATH COUNT\n'
         # A Text widget detailing the player's death count.
         self.death_score = Text(self.control_panel_box, text=self.deaths_str,
                                 size=8, width=21, grid=[2, 0])
+        # The death count, updated only when the number of deaths changes.
+        self.death_hud = HudText(self.death_score, self.deaths_str)
         
         # A quit button to exit the level and return to the menu.
         PushButton(self.control_panel_box, text='Return to Menu', width=30,
                    height=3, grid=[1, 0], command=self.close_level)
         
-        # Initialize class attributes to store Layout objects for main and
-        # alternate layouts.
-        self.main_layout = None
-        self.alt_layout = None
+        # A Text widget showing the profiler's timings, when profiling.
+        self.profile_overlay = Text(self.control_panel_box, text='', size=7,
+                                    width=30, grid=[3, 0],
+                                    visible=profiler is not None)
+        
+        # Decides which layouts to redraw each frame, skipping the hidden
+        # layout and layouts which have not changed.
+        self.render_scheduler = RenderScheduler()
+        
+        # Keeps the Drawings of closed levels to reuse for the next level.
+        self.drawing_pool = DrawingPool(
+            lambda: Drawing(self.level_box, grid=[0, 1], visible=False))
+        
+        # Initialize class attributes to store the simulated LevelState, the
+        # index of its Layout currently shown, and the level's title.
+        self.level = None
+        self.shown_index = 0
+        self.level_title = None
+        
+        # The recording of the current level attempt's inputs, and the
+        # history of the level's states kept for rewinding it.
+        self.recorder = None
+        self.rewind_buffer = None
+        
+        # The levels installed beside the game and their details.
+        self.level_index = LevelIndex()
+        
+        # Every level's record and the statistics of every attempt.
+        self.records = RecordsStore()
+        
+        # The tick the current attempt at the level began on, the number of
+        # deaths counted so far, and the number of those deaths undone by
+        # rewinding or restarting (which still count towards records).
+        self.attempt_start_tick = 0
+        self.num_deaths_counted = 0
+        self.num_deaths_rewound = 0
+        
+        # Loads the level the player is likely to open next in the background.
+        self.preloader = LevelPreloader()
 
         # Create and open the initial level selection screen.
         self.create_menu()
         self.open_menu()
         
-        # Stores movement keys pressed while in a level.
-        self.pressed_movement_keys = []
-        
-        # Death counter, starting at 0.
-        self.num_deaths = 0
+        # Tracks the keys pressed while in a level and the movement inputs
+        # they add up to.
+        self.controls = Controls(key_bindings)
         
         
     def create_menu(self):
-        """Create the level menu, with a variable number of level buttons."""
-        
-        NUM_LEVELS = 3
+        """Create the level menu, with one page of level buttons for the
+           levels installed (see show_menu_page); only a page's worth of
+           buttons is ever created, however many levels there are."""
         
         BUTTONS_PER_ROW = 10
         
@@ -135,52 +230,128 @@ class GameWindow:
         # Approximate pixel height of a 1-character-tall GuiZero button.
         BUTTON_HEIGHT_PIXELS = 45
         
-        # Determine the number of rows of buttons. Ceiling division idea sourced
-        # from DelftStack:
+        # Find the levels installed beside the game.
+        NUM_LEVELS = len(self.level_index.level_ids())
+        
+        # The level buttons are reused for every page of levels.
+        NUM_BUTTONS = min(NUM_LEVELS, LEVELS_PER_PAGE)
+        
+        # Determine the number of rows of buttons and pages of levels. Ceiling
+        # division idea sourced from DelftStack:
         # https://www.delftstack.com/howto/python/python-round-up/
-        NUM_ROWS = -(-NUM_LEVELS//BUTTONS_PER_ROW)
+        NUM_ROWS = -(-NUM_BUTTONS//BUTTONS_PER_ROW)
+        NUM_PAGES = -(-NUM_LEVELS//LEVELS_PER_PAGE)
        
         # Determine menu width from approximate pixel width of a 7-character
         # button.
         MENU_WIDTH = MIN_BUTTON_WIDTH_PIXELS * BUTTONS_PER_ROW
         
         # Make menu height a minimum of 3 button heights or higher based on the
-        # number of button rows.
-        MENU_HEIGHT = BUTTON_HEIGHT_PIXELS * (NUM_ROWS + 2)
+        # number of button rows, plus a row for the level details and one for
+        # turning pages when there is more than one.
+        MENU_HEIGHT = BUTTON_HEIGHT_PIXELS * (NUM_ROWS + 3 + (NUM_PAGES > 1))
         
         # Resize the box responsible for the level select screen so its
         # size can be reliably referenced to reset the app window size.
         self.menu_box.resize(MENU_WIDTH, MENU_HEIGHT)
         
-        # Add the number of level buttons specified by NUM_LEVELS.
-        for current_num in range(1, NUM_LEVELS + 1):
+        # Add a page's worth of level buttons, which are given their levels by
+        # show_menu_page.
+        self.level_buttons = []
+        for button_index in range(NUM_BUTTONS):
             
-            PushButton(self.level_select_box,
+            button = PushButton(self.level_select_box,
                        
                        # Button width becomes progressively smaller as levels
                        # are added from 1-9, until it reaches a minimum of 7
                        # characters.
                        width=max(MIN_BUTTON_WIDTH, -(-MIN_BUTTON_WIDTH *
                                                      BUTTONS_PER_ROW//
-                                                     NUM_LEVELS)
+                                                     NUM_BUTTONS)
                                  ),
                        height=1,
-                       # Add button to the appropriate column based on level
-                       # number and specified buttons per row.
-                       grid=[((current_num - 1) % BUTTONS_PER_ROW),
-                       # Add button to the appropriate row based on level number
-                       # and specified buttons per row.
-                             (current_num - 1)//BUTTONS_PER_ROW],
-                       # Label button with appropriate level number.
-                       text='Level ' + str(current_num),
-                       # Set the button to open the corresponding level.
-                       command=self.open_level, args=[current_num])
+                       # Add button to the appropriate column based on its
+                       # place on the page and specified buttons per row.
+                       grid=[(button_index % BUTTONS_PER_ROW),
+                       # Add button to the appropriate row based on its place
+                       # on the page and specified buttons per row.
+                             button_index//BUTTONS_PER_ROW])
+            
+            # Show the details of a level when the mouse is over its button.
+            button.when_mouse_enters = self.show_level_details
+            self.level_buttons.append(button)
+        
+        # Buttons to turn the pages of levels.
+        PushButton(self.page_box, text='<', grid=[0, 0],
+                   command=self.turn_menu_page, args=[-1])
+        self.page_number = Text(self.page_box, text='', width=20, grid=[1, 0])
+        PushButton(self.page_box, text='>', grid=[2, 0],
+                   command=self.turn_menu_page, args=[1])
+        self.page_box.visible = NUM_PAGES > 1
+        
+        self.show_menu_page(0)
         
         # A button to quit the game.
         PushButton(self.quit_button_box, text='Quit Game',
                    width=QUIT_BUTTON_WIDTH, height=2, grid=[0, 0], command=exit)
     
     
+    def show_menu_page(self, page):
+        """Shows the received page (int, counting from 0) of levels on the
+           level buttons, hiding any buttons left over on the last page."""
+        
+        level_ids = self.level_index.level_ids()
+        num_pages = max(1, -(-len(level_ids)//LEVELS_PER_PAGE))
+        self.menu_page = min(max(page, 0), num_pages - 1)
+        
+        page_level_ids = level_ids[self.menu_page * LEVELS_PER_PAGE:
+                                   (self.menu_page + 1) * LEVELS_PER_PAGE]
+        for button_index, button in enumerate(self.level_buttons):
+            if button_index < len(page_level_ids):
+                level_id = page_level_ids[button_index]
+                # Label button with appropriate level number.
+                button.text = 'Level ' + str(level_id)
+                # Set the button to open the corresponding level.
+                button.update_command(self.open_level, args=[level_id])
+                button.show()
+            else:
+                button.hide()
+        
+        self.page_number.value = ('Page ' + str(self.menu_page + 1) + ' of ' +
+                                  str(num_pages))
+        self.level_details.value = ''
+    
+    
+    def turn_menu_page(self, direction):
+        """Shows the next (direction 1) or previous (direction -1) page of
+           levels."""
+        
+        self.show_menu_page(self.menu_page + direction)
+    
+    
+    def show_level_details(self, event):
+        """Shows the size and record of the level whose button the mouse has
+           entered, according to the received event data."""
+        
+        button_index = self.level_buttons.index(event.widget)
+        level_id = self.level_index.level_ids()[self.menu_page *
+                                                LEVELS_PER_PAGE + button_index]
+        metadata = self.level_index.metadata(level_id)
+        
+        # The player is likely to open the level they are pointing at.
+        self.preloader.preload(level_id)
+        
+        width, height = metadata['main_size']
+        details = ('Level ' + str(level_id) + ': ' + str(width) + ' x ' +
+                   str(height) + ' tiles, fewest attempts: ')
+        record = self.records.record(level_id)
+        if record is None:
+            details += 'none yet'
+        else:
+            details += str(record)
+        self.level_details.value = details
+    
+    
     def open_menu(self):
         """Opens the level selection main menu."""
         
@@ -193,46 +364,39 @@ class GameWindow:
         """Close the level menu and open the level of the received level ID,
            which is signified by an integer. Expects to find one file with name
            format 'level#.txt'(main level layout file) and another file with
-           name format 'level#a.txt' (alt level layout file)."""
+           name format 'level#a.txt' (alt level layout file), and optionally
+           further files for more dimensions ('level#b.txt', 'level#c.txt',
+           ...)."""
         
         # Hide the main menu.
         self.menu_box.hide()
         
-        # Set GameWindow attribute main_layout to a Layout object and pass it
-        # the main level layout file name of the requested level for reference.
-        self.main_layout = Layout(file_name='level' + str(level_id) + '.txt',
-                                  # Create a drawing which will contain the main
-                                  # layout's graphics and pass it to this main
-                                  # Layout object to use.
-                                  drawing=Drawing(self.level_box, grid=[0, 1],
-                                          visible = False),
-                                  # Set the main layout's avatar color to be a
-                                  # lighter gray to distinguish it from the alt
-                                  # avatar.
-                                  avatar_color = 'gray'
-                                  )
-        
-        # Set GameWindow attribute alt_layout to a Layout object and pass it
-        # the alt level layout file name of the requested level for reference.
-        self.alt_layout = Layout(file_name='level' + str(level_id) + 'a.txt',
-                                 # Create a drawing which will contain the alt
-                                 # layout's graphics and pass it to this alt
-                                 # Layout object to use.
-                                 drawing=Drawing(self.level_box, grid=[0, 1],
-                                         visible = False),
-                                 # Set the alt layout's avatar color to be a
-                                 # darker gray to distinguish it from the main
-                                 # avatar.
-                                 avatar_color = 'dark gray'
-                                 )
-        
-        # Draw both level layouts in their level_box.
-        self.main_layout.draw()
-        self.alt_layout.draw()
-        
-        # Tell the app to start executing run_level every 10 milliseconds and
-        # pass it the requested level id.
-        self.app.repeat(10, self.run_level, args=[level_id])
+        # Take the simulated state of the requested level from the preloader,
+        # which reads the main ('level#.txt'), alt ('level#a.txt'), and any
+        # further layout files unless it already has in the background.
+        self.level = self.preloader.take(level_id)
+        self.shown_index = 0
+        self.recorder = InputRecorder(level_id)
+        self.attempt_start_tick = self.level.tick
+        self.num_deaths_counted = self.level.num_deaths
+        self.num_deaths_rewound = 0
+        self.rewind_buffer = RewindBuffer(
+            self.level, round(HISTORY_SECONDS / self.timestep.tick_interval))
+        
+        # Give each layout a drawing which will contain its graphics, reusing
+        # the drawings of closed levels.
+        for layout in self.level.layouts:
+            layout.drawing = self.drawing_pool.acquire()
+        
+        # Draw every level layout in their level_box.
+        for layout in self.level.layouts:
+            layout.draw()
+        
+        # Tell the app to start executing run_level frequently enough to keep
+        # up with the tick and frame rates and pass it the requested level id.
+        self.timestep.start()
+        self.app.repeat(self.timestep.callback_interval(), self.run_level,
+                        args=[level_id])
         
         # Set the commands to execute when a key is pressed.
         self.app.when_key_pressed = self.handle_key_press
@@ -241,24 +405,35 @@ class GameWindow:
         self.app.when_key_released = self.handle_key_release
         
         # Change app title to match the current level.
-        self.app.title = 'Level ' + str(level_id)
+        self.level_title = 'Level ' + str(level_id)
         
-        self.open_layout(self.main_layout)
+        self.open_layout(self.level.layouts[0])
         
-        # Open the file storing the current level's record minimum attempt
-        # count for reading.
-        with open('min_attempts' + str(level_id) + '.txt') as min_attempts:
-            # Display the minimum attempt count stored in the file.
-            score = min_attempts.readline()
-            self.fewest_attempts_score.value = self.attempts_str + score
+        # Display the current level's record minimum attempt count.
+        self.fewest_attempts_hud.show(self.records.record(level_id))
+        self.level_index.save()
             
         
         # Open level layout Box.
         self.level_box.show()
+        
+        # While this level is played, load the one after it, which the player
+        # is likely to open next.
+        level_ids = self.level_index.level_ids()
+        if level_id in level_ids and level_id != level_ids[-1]:
+            self.preloader.preload(level_ids[level_ids.index(level_id) + 1])
                             
     
     def open_layout(self, layout):
-        """Opens the received layout in the game window."""
+        """Opens the received layout in the game window, naming it in the
+           window title when the level has more than two layouts."""
+        
+        title = self.level_title
+        num_layouts = len(self.level.layouts)
+        if num_layouts > 2:
+            title += (' (dimension ' + str(self.shown_index + 1) + ' of ' +
+                      str(num_layouts) + ')')
+        self.app.title = title
         
         # Resize the box responsible for displaying the level layouts so its
         # size can be reliably referenced to adjust the app window size.
@@ -271,112 +446,91 @@ class GameWindow:
     
     
     def alternate_layout(self):
-        """Switch the current level layout Drawing to the alternate level
-           layout Drawing."""
+        """Switch the current level layout Drawing to the next level layout
+           Drawing, going back to the main layout after the last one."""
          
-        # If the main layout is currently open:
-        if self.main_layout.drawing.visible:
-            self.open_layout(self.alt_layout)
-            self.main_layout.drawing.hide()
-
-        # Otherwise, if the alternate layout is currently open:
-        elif self.alt_layout.drawing.visible:
-            self.open_layout(self.main_layout)
-            self.alt_layout.drawing.hide()
+        self.recorder.record_switch()
+        
+        hidden_layout = self.level.layouts[self.shown_index]
+        self.shown_index = (self.shown_index + 1) % len(self.level.layouts)
+        shown_layout = self.level.layouts[self.shown_index]
+        self.open_layout(shown_layout)
+        hidden_layout.drawing.hide()
+        
+        # The newly shown layout was not drawn while hidden, so bring it up
+        # to date at once rather than waiting for the next frame.
+        self.render_scheduler.render_layout(shown_layout)
             
             
     def run_level(self, level_id):
-        """Updates the death count every frame, draws each respective frame
-           of the level's layouts as long as the respective layout is not
-           beaten, removes avatars from beaten layouts, saves new records to a
-           file corresponding to the received level ID (int), and ends the game
-           once both layouts are beaten."""
-        
-        if not self.main_layout.beaten:
-            self.draw_frame(self.main_layout)
-        else:
-            self.main_layout.clear_avatar()
+        """Advances the level simulation by as many ticks as the real time
+           since the last call requires, counting each attempt at the level of
+           the received level ID (int), ends the game (saving any new record)
+           once every layout is beaten, and otherwise renders a frame if one
+           is due."""
+        
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start_frame()
+        
+        for tick in range(self.timestep.ticks_due()):
+            inputs = self.controls.tick_inputs()
+            self.recorder.record_tick(inputs)
+            step(self.level, inputs, profiler)
+            self.rewind_buffer.record(self.level)
+            if profiler is not None:
+                profiler.add_tick()
             
-        if not self.alt_layout.beaten:
-            self.draw_frame(self.alt_layout)
-        else:
-            self.alt_layout.clear_avatar()
+            # An attempt ends each time the Avatars die.
+            if self.level.num_deaths != self.num_deaths_counted:
+                self.records.add_attempt(
+                    level_id, self.level.tick - self.attempt_start_tick, False)
+                self.attempt_start_tick = self.level.tick
+                self.num_deaths_counted = self.level.num_deaths
+            
+            if self.level.beaten():
+                self.end_level(level_id)
+                return
+        
+        if self.timestep.frame_due():
+            self.render_frame()
+        
+        if profiler is not None:
+            profiler.end_frame()
+            if profiler.num_frames % OVERLAY_FRAMES == 0:
+                summary = profiler.summary()
+                latency = self.controls.average_latency()
+                if latency is not None:
+                    summary += ('\nINPUT LATENCY  ' +
+                                format(latency * 1000, '.2f'))
+                self.profile_overlay.value = summary
+    
+    
+    def render_frame(self):
+        """Updates the death count if it has changed, and brings the drawing of
+           the visible layout up to date if it has changed (see
+           render_scheduler); the hidden layout is drawn once it is shown."""
+        
+        profiler = self.profiler
+        if profiler is not None:
+            start_time = perf_counter()
+        
+        # Scroll the visible layout to follow its avatar, and move its
+        # avatar drawing to its updated position (or remove it, once beaten).
+        self.render_scheduler.render(self.level.layouts)
+        
+        if profiler is not None:
+            drawn_time = perf_counter()
+            profiler.add('canvas', drawn_time - start_time)
         
         # Update the death count displayed in the level to show the current
-        # number of deaths.
-        self.death_score.value = self.deaths_str + str(self.num_deaths)
+        # number of deaths, if it has changed.
+        self.death_hud.show(self.level.num_deaths + self.num_deaths_rewound)
         
-        if self.main_layout.beaten and self.alt_layout.beaten:
-            self.end_level(level_id)
+        if profiler is not None:
+            profiler.add('hud', perf_counter() - drawn_time)
     
     
-    def draw_frame(self, layout):
-        """Updates the avatar's position and draws a frame with its updated
-           position within the received Layout object."""
-        
-        layout.clear_avatar()
-        
-        # If the user is not pressing the 'A' key and is pressing the 'D' key:
-        if (not ('a' in self.pressed_movement_keys or
-                 'A' in self.pressed_movement_keys) and
-            ('d' in self.pressed_movement_keys or
-             'D' in self.pressed_movement_keys)):
-                        
-            # Set the level layout's avatar to move right at a preset speed.
-            layout.avatar.x_vel = layout.avatar.GROUND_X_SPEED
-
-        # Else if the user is not pressing the 'D' key and is pressing the 'A'
-        # key:
-        elif (not ('d' in self.pressed_movement_keys or
-                    'D' in self.pressed_movement_keys) and
-              ('a' in self.pressed_movement_keys or
-               'A' in self.pressed_movement_keys)):
-        
-            # Set the level layout's avatar to move left at a preset speed.
-            layout.avatar.x_vel = -layout.avatar.GROUND_X_SPEED
-            
-        else:
-            layout.avatar.x_vel = 0
-            
-        if (('w' in self.pressed_movement_keys or
-             'W' in self.pressed_movement_keys) and
-            (not layout.avatar.in_air)):
-                # Set the layout's avatar to move up at a preset speed.
-                layout.avatar.y_vel = layout.avatar.JUMP_VEL
-        
-        # Apply gravity to the avatar, which modifies its y velocity.
-        layout.avatar.apply_gravity()
-        
-        # Change the avatar's internal position based on its current velocities.
-        layout.avatar.move(layout.drawing)
-        
-        # Iterate through all the Block objects in the Layout.
-        for block in layout.blocks:
-            layout.avatar.prevent_obstructed_motion(block)
-        
-        # Iterate through all the Spike objects in the Layout.
-        for spikes in layout.spikes:
-            if layout.avatar.is_impaled(spikes):
-                self.num_deaths += 1
-                self.restart_level()
-                
-        # Iterate through all the LevelEnding objects in the Layout.
-        for exit_portal in layout.exits:
-            if layout.avatar.reached_exit(exit_portal):
-                layout.beaten = True
-        
-        # Draw the avatar with its updated position.
-        layout.avatar_graphic = layout.avatar.draw(layout.drawing)
-
-    def restart_level(self):
-        """Reset the level to its beginning state."""
-        
-        self.main_layout.beaten = False
-        self.alt_layout.beaten = False
-        self.main_layout.avatar.respawn()
-        self.alt_layout.avatar.respawn()
-
-
     def close_level(self):
         """Close the current level and return to the level selection menu."""
         
@@ -385,55 +539,51 @@ class GameWindow:
         # Link to post: https://piazza.com/class/ksp2tiztwas2ev?cid=236
         self.app.cancel(self.run_level)
         
-        # Close the level layout.
-        self.main_layout.drawing.destroy()
-        self.alt_layout.drawing.destroy()
-        self.level_box.hide()
+        # Save the recording of the attempt.
+        self.recorder.finish(self.level)
+        if self.recording_directory is not None:
+            self.recorder.save(self.recording_directory)
         
-        self.num_deaths = 0
+        # Write the level's new attempts and any new record together.
+        self.records.flush()
+        
+        # Close the level layout, keeping its drawings for the next level.
+        self.render_scheduler.forget()
+        for layout in self.level.layouts:
+            self.drawing_pool.release(layout.drawing)
+            layout.drawing = None
+        self.level_box.hide()
         
-        # Reset the "fewest attempts" score display.
-        self.fewest_attempts_score.value = self.attempts_str
+        # Reset the "fewest attempts" score and death count displays.
+        self.fewest_attempts_hud.show(None)
+        self.death_hud.show(None)
         
         # Stop the app from responding to key presses.
         self.app.when_key_pressed = None
         self.app.when_key_released = None
         
         # Clear leftover key inputs.
-        self.pressed_movement_keys = []
+        self.controls.clear()
                 
         # (Re)open the level menu.
         self.open_menu()
         
         
     def end_level(self, level_id):
-        """Briefly shows a success message, saves any new record scores to a
-           file corresponding to the received level ID (int), and closes the
-           level if the player successfully beats it. Expects to find a file
-           with name format 'min_attempts#'"""
+        """Briefly shows a success message, saves the winning attempt and any
+           new record of the level of the received level ID (int), and closes
+           the level if the player successfully beats it."""
         
         # Show the success message.
         self.end_message_box.show()
         
-        # Open the file storing the current level's record minimum attempt
-        # count for reading and writing.
-        with open('min_attempts' + str(level_id) + '.txt', 'r+') as min_attempts:
-            
-            score = min_attempts.readline()
-            # If the file is empty or the player's death count is lower than the
-            # established record:
-            if score == '' or self.num_deaths < int(score):
-                # Delete the current file contents.
-                # (Idea to use seek() sourced from Joyce Chew and:
-                # https://pynative.com/python-file-seek/)
-                min_attempts.seek(0)
-                # (Idea to use truncate() sourced from Joyce Chew and:
-                # https://www.delftstack.com/howto/python/python-overwrite-file/)
-                min_attempts.truncate()
-                
-                # Update the record minimum attempt count to the player's death
-                # count plus 1.
-                min_attempts.write(str(self.num_deaths + 1))
+        # Count the winning attempt, and make the player's death count plus 1
+        # the level's record if it is lower than the established record (the
+        # store is written when the level closes).
+        self.records.add_attempt(
+            level_id, self.level.tick - self.attempt_start_tick, True)
+        self.records.submit_record(
+            level_id, self.level.num_deaths + self.num_deaths_rewound + 1)
                 
         self.close_level()
         
@@ -453,25 +603,103 @@ class GameWindow:
         """Processes user key inputs from the received event data and responds
            accordingly."""
         
-        # If the user has pressed the space bar:
-        if event.key == ' ':
+        action = self.controls.press(event.tk_event.keysym)
+        
+        # If the user has pressed the key switching layouts (the space bar,
+        # unless remapped):
+        if action == SWITCH:
             self.alternate_layout()
         
-        # Store non-spacebar key inputs in a list for reference.
-        elif not event.key in self.pressed_movement_keys:
-            self.pressed_movement_keys.append(event.key)
+        # If the user has pressed the key rewinding the level (Z, unless
+        # remapped):
+        elif action == REWIND:
+            self.rewind_level()
+        
+        # If the user has pressed the key restarting the level (R, unless
+        # remapped):
+        elif action == RESTART:
+            self.restart_level()
+    
+    
+    def rewind_level(self):
+        """Returns the level to how it was REWIND_SECONDS seconds of play ago
+           (or as long ago as is kept)."""
+        
+        self.rewind_buffer.rewind(
+            self.level, self.level.tick - round(REWIND_SECONDS /
+                                                self.timestep.tick_interval))
+        self.account_for_rewind()
+    
+    
+    def restart_level(self):
+        """Returns the level to how it was when it was opened, ending the
+           current attempt."""
+        
+        self.records.add_attempt(self.recorder.recording.level_id,
+                                 self.level.tick - self.attempt_start_tick,
+                                 False)
+        self.rewind_buffer.restart(self.level)
+        self.account_for_rewind()
+    
+    
+    def account_for_rewind(self):
+        """Brings the attempt and its recording in line with the level after
+           it has been rewound or restarted, keeping count of the deaths
+           undone."""
+        
+        self.num_deaths_rewound += (self.num_deaths_counted -
+                                    self.level.num_deaths)
+        self.num_deaths_counted = self.level.num_deaths
+        self.attempt_start_tick = min(self.attempt_start_tick,
+                                      self.level.tick)
+        
+        # The recording began with the level at tick 0, so it keeps one input
+        # per tick up to the level's current tick.
+        self.recorder.rewind(self.level.tick)
         
      
     def handle_key_release(self, event):
         """Processes the release of user key inputs from the received event data
            and responds accordingly."""
         
-        if event.key != ' ':
-            # Remove non-spacebar key inputs from the list of pressed keys
-            # once the respective keys are released.
-            self.pressed_movement_keys.remove(event.key)
+        # Keys released without having been pressed in the level are ignored.
+        self.controls.release(event.tk_event.keysym)
             
         
-app = App()
-GameWindow(app)
-app.display()
\ No newline at end of file
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Play Out of Sync.')
+    parser.add_argument('--profile', action='store_true',
+                        help='show the time each phase of a frame takes')
+    parser.add_argument('--profile-output',
+                        help='file to stream every frame\'s phase times to '
+                             '(CSV for .csv files, JSON lines otherwise); '
+                             'implies --profile')
+    parser.add_argument('--record', action='store_true',
+                        help='save each attempt\'s inputs to the ' +
+                             RECORDING_DIRECTORY + ' directory for replaying')
+    arguments = parser.parse_args()
+    
+    profiler = None
+    if arguments.profile or arguments.profile_output:
+        profiler = FrameProfiler(output_file_name=arguments.profile_output)
+    
+    key_bindings = DEFAULT_KEY_BINDINGS
+    if os.path.exists(KEY_BINDINGS_FILE):
+        key_bindings = load_key_bindings(KEY_BINDINGS_FILE)
+    
+    # Attempts are only written to disk when asked for.
+    recording_directory = None
+    if arguments.record:
+        recording_directory = RECORDING_DIRECTORY
+    
+    app = App()
+    window = GameWindow(app, recording_directory=recording_directory,
+                        profiler=profiler, key_bindings=key_bindings)
+    try:
+        app.display()
+    finally:
+        window.level_index.save()
+        window.preloader.close()
+        window.records.close()
+        if profiler is not None:
+            profiler.close()
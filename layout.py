@@ -35,10 +35,8 @@ TO ADD/CREATE A LEVEL
         level.
       - Underneath the text block, write the desired starting coordinates for
         each layout's avatar in the format '#, #', without parentheses.
- - Create an empty text file named with the format 'min_attempts#.txt' (to store
-   the record of fewest attempts needed to beat the corresponding level).
- - Change NUM_LEVELS under the create_menu method to the number of desired
-   levels.
+ - The level menu finds every 'level#.txt' file beside the game on its own
+   (see level_index), so no code needs changing to add a level.
 
 @author: Jason Chew (jgc23)
 @author: Serita Nelesen (smn4)
@@ -47,117 +45,142 @@ TO ADD/CREATE A LEVEL
 
 """
 
-from level_graphics_objects import Block, Spikes, LevelEnding, Avatar
+from level_cache import load_layout_map
+from level_graphics_objects import Avatar
+from level_object_arrays import EMPTY_TILE
+from viewport import Viewport
+
+# The ways a Layout can store its level objects: as a Python object per tile,
+# or packed into typed arrays (see level_object_arrays) for very large layouts.
+OBJECT_STORAGE = 'objects'
+ARRAY_STORAGE = 'arrays'
 
 class Layout:
     """Represents a level layout of Block, Spikes, LevelEnding, and Avatar
        objects."""
     
-    def __init__(self, file_name, drawing, avatar_color):
-        """Receives and reads a file to initialize and store every
-           LevelGraphicsObject in the layout; receives a drawing on which to
-           draw the LevelGraphicsObjects and the color with which to draw its
-           Avatar; expects last file line to contain the Avatar's desired
-           starting coordinates in the format '#, #', without parentheses, and
-           sets layout width based on the length of the top line in the file."""
+    __slots__ = ('UNIT', 'file_name', 'storage', 'drawing', 'avatar_color',
+                 'avatar', 'avatar_graphic', 'avatar_graphic_position',
+                 'viewport', 'beaten', 'width_in_layout_units',
+                 'height_in_layout_units', 'blocks', 'spikes', 'exits', 'tiles',
+                 'tile_rows', 'object_arrays', 'layout_width', 'layout_height')
+    
+    def __init__(self, file_name, drawing=None, avatar_color='gray',
+                 storage=OBJECT_STORAGE, layout_map=None):
+        """Receives a file from which to initialize and store every
+           LevelGraphicsObject in the layout (parsed files are cached by
+           level_cache, so reopening a level does not read the file again),
+           unless the already parsed LayoutMap of a layout is received
+           instead, in which case file_name only names it. Also receives a
+           drawing on which to draw the LevelGraphicsObjects (which may be
+           left as None and assigned later, or never for a layout that is
+           only simulated), the color with which to draw its Avatar, and how
+           to store its level objects (OBJECT_STORAGE or ARRAY_STORAGE)."""
         
         self.UNIT = 50
         
+        self.file_name = file_name
+        self.storage = storage
         self.drawing = drawing
         self.avatar_color = avatar_color
         self.avatar = None
         self.avatar_graphic = None
-        self.blocks = []
-        self.exits = []
-        self.spikes = []
+        # The Avatar position the avatar_graphic was last drawn at.
+        self.avatar_graphic_position = None
+        # The scrolling view of the layout on its drawing, once drawn.
+        self.viewport = None
         self.beaten = False
-
-        with open(file_name) as level_map:
-            # Store file's contents to iterate through later.
-            map_lines = level_map.readlines()
-            
-            # Set the layout dimensions in layout units based on the length of
-            # the top line of the file and the number of lines in the file.
-            self.width_in_layout_units = len(map_lines[0].strip())
-            self.height_in_layout_units = len(map_lines) - 1
-            
-            # Iterate through the indexes of each line in the file.
-            for line_index in range(len(map_lines) - 1):
-                
-                # Remove newline character from each file line to allow accurate
-                # count of block spaces.
-                map_lines[line_index].strip()
-                
-                # Iterate through the indexes of each character in each line.
-                for char_index in range(len(map_lines[line_index])):
-                    
-                    # Initialize a Block when the '#' symbol is encountered in
-                    # the file, with the same relative scaled coordinates as the
-                    # relative location of the '#' among the other characters.
-                    if map_lines[line_index][char_index] == '#':
-                        
-                        # Initialize the Block object at the correct relative
-                        # position.
-                        block = Block(x_pos=self.UNIT * char_index + self.UNIT/2,
-                                      y_pos=self.UNIT * line_index + self.UNIT/2,
-                                      size=self.UNIT)
-                        
-                        # Store the Block in a list to be accessed later.
-                        self.blocks.append(block)
-                    
-                    
-                    # Initialize a Spike when the '^' symbol is encountered in
-                    # the file, with the same relative scaled coordinates as the
-                    # relative location of the '^' among the other characters.
-                    elif map_lines[line_index][char_index] == '^':
-                        
-                        # Initialize the Spike object at the correct relative
-                        # position.
-                        spike = Spikes(x_pos=self.UNIT * char_index + self.UNIT/2,
-                                       y_pos=self.UNIT * line_index + self.UNIT/2,
-                                       size=self.UNIT)
-                        
-                        # Store the Spike in a list to be accessed later.
-                        self.spikes.append(spike)
-                    
-                    
-                    # Initialize an Exit when the '@' symbol is encountered in
-                    # the file, with the same relative scaled coordinates as the
-                    # relative location of the '@' among the other characters.
-                    elif map_lines[line_index][char_index] == '@':
-                        
-                        # Initialize the Exit object at the correct relative
-                        # position.
-                        exit_portal = LevelEnding(x_pos=self.UNIT * char_index + self.UNIT/2,
-                                                  y_pos=self.UNIT * line_index + self.UNIT/2,
-                                                  size=self.UNIT)
-                        
-                        
-                        # Store the Exit in a list to be accessed later.
-                        self.exits.append(exit_portal)
-            
-            
-            # Determine the Avatar's starting x and y coordinates from the
-            # bottom line of the file.
-            avatar_coords = map_lines[-1].split(',')
-            avatar_x = float(avatar_coords[0].strip())
-            avatar_y = self.height_in_layout_units - float(avatar_coords[1].strip()) - 1
-            
-            # Create the Avatar at the desired position with the desired color.
-            self.avatar = Avatar(x_pos=self.UNIT * avatar_x + self.UNIT/2,
-                                 y_pos =self.UNIT * avatar_y + self.UNIT/2,
-                                 size=self.UNIT, color=self.avatar_color
-                                 )
+        
+        if layout_map is None:
+            layout_map = load_layout_map(file_name)
+        
+        # Set the layout dimensions in layout units.
+        self.width_in_layout_units = layout_map.width_in_layout_units
+        self.height_in_layout_units = layout_map.height_in_layout_units
+        
+        # Store every Block, Spikes, and LevelEnding object in lists to be
+        # accessed later, along with a tile-occupancy index mapping each
+        # (column, row) layout unit to the LevelGraphicsObject occupying it and
+        # the same index as a list of rows of tiles (None for empty tiles), so
+        # collision checks only need to look at the few tiles surrounding the
+        # Avatar. These are shared by every Layout of the same file, and must
+        # not be changed. With array storage, these are read-only sequences
+        # and mappings of views of the LevelObjectArrays instead, and
+        # tile_rows holds object indexes (EMPTY_TILE for empty tiles), taking
+        # about 30 bytes per object rather than about 250.
+        if storage == ARRAY_STORAGE:
+            self.object_arrays = layout_map.level_object_arrays(self.UNIT)
+            (self.blocks, self.spikes, self.exits,
+             self.tiles) = self.object_arrays.level_objects()
+            self.tile_rows = self.object_arrays.tile_rows
+        elif storage == OBJECT_STORAGE:
+            self.object_arrays = None
+            (self.blocks, self.spikes, self.exits, self.tiles,
+             self.tile_rows) = layout_map.level_objects(self.UNIT)
+        else:
+            raise ValueError('unknown layout storage: ' + repr(storage))
+        
+        # Determine the Avatar's starting x and y coordinates, measured from the
+        # top left of the layout.
+        avatar_x = layout_map.avatar_x
+        avatar_y = self.height_in_layout_units - layout_map.avatar_y - 1
+        
+        # Create the Avatar at the desired position with the desired color.
+        self.avatar = Avatar(x_pos=self.UNIT * avatar_x + self.UNIT/2,
+                             y_pos =self.UNIT * avatar_y + self.UNIT/2,
+                             size=self.UNIT, color=self.avatar_color
+                             )
                         
         self.layout_width = self.UNIT * self.width_in_layout_units + 1
         self.layout_height = self.UNIT * self.height_in_layout_units + 1
                         
 
+    def objects_near(self, avatar):
+        """Receives an Avatar and returns a list of the LevelGraphicsObjects in
+           the tiles its bounding box could touch this frame (its box widened by
+           its velocity, plus one tile of margin for collision corrections), in
+           the same top-to-bottom, left-to-right order as the layout file."""
+        
+        x_reach = avatar.size/2 + abs(avatar.x_vel)
+        y_reach = avatar.size/2 + abs(avatar.y_vel)
+        
+        first_column = int((avatar.x - x_reach)//self.UNIT) - 1
+        last_column = int((avatar.x + x_reach)//self.UNIT) + 1
+        first_row = int((avatar.y - y_reach)//self.UNIT) - 1
+        last_row = int((avatar.y + y_reach)//self.UNIT) + 1
+        
+        nearby_objects = []
+        for row in range(max(first_row, 0),
+                         min(last_row + 1, len(self.tile_rows))):
+            for tile in self.tile_rows[row][max(first_column, 0):
+                                            last_column + 1]:
+                if self.object_arrays is not None:
+                    if tile != EMPTY_TILE:
+                        nearby_objects.append(self.object_arrays.view(tile))
+                elif tile is not None:
+                    nearby_objects.append(tile)
+                    
+        return nearby_objects
+    
+    
+    def prepare_view(self):
+        """Sets up the layout's view and renders the level objects it will show
+           first, without needing the Layout Drawing, so that drawing the
+           layout later is quick (see level_preloader)."""
+        
+        self.viewport = Viewport(self)
+        self.viewport.prepare(self.avatar)
+    
+    
     def draw(self):
-        """Draws the layout's LevelGraphicsObjects on the Layout Drawing."""
+        """Draws the layout's LevelGraphicsObjects on the Layout Drawing, which
+           is sized to at most a window's worth of the layout (see viewport);
+           only the objects near the Avatar's part of the layout are drawn.
+           Uses the view set up by prepare_view, if any."""
         
-        self.drawing.width = self.layout_width
-        self.drawing.height = self.layout_height
+        if self.viewport is None or self.viewport.left is not None:
+            self.viewport = Viewport(self)
+        self.viewport.start()
         self.drawing.bg = 'light gray'
         
         # Add line to separate the bottom of the layout Drawing from additional
@@ -165,20 +188,40 @@ class Layout:
         self.drawing.line(0, self.layout_height - 1,
                           self.layout_width, self.layout_height - 1)
         
-        # Draw level map.               
-        for exit_portal in self.exits:
-            exit_portal.draw(self.drawing)
-            
-        for block in self.blocks:
-            block.draw(self.drawing)
-                
-        for spike in self.spikes:
-            spike.draw(self.drawing)
-        
         self.avatar_graphic = self.avatar.draw(self.drawing)
+        self.avatar_graphic_position = (self.avatar.x, self.avatar.y)
+        
+        # Draw the level map around the avatar.
+        self.viewport.follow(self.avatar)
+        
+        
+    def update_view(self):
+        """Scrolls the Layout Drawing to keep the Avatar in view, drawing the
+           level objects which come into view."""
+        
+        self.viewport.follow(self.avatar)
+        
+        
+    def update_avatar(self):
+        """Moves the existing GuiZero Drawing of the Avatar to the Avatar's
+           current position (drawing it if it has been cleared), rather than
+           drawing a new one; does nothing if the Avatar has not moved since it
+           was last drawn."""
+        
+        position = (self.avatar.x, self.avatar.y)
+        
+        if self.avatar_graphic is None:
+            self.avatar_graphic = self.avatar.draw(self.drawing)
+        elif position != self.avatar_graphic_position:
+            self.avatar.redraw(self.drawing, self.avatar_graphic)
+            
+        self.avatar_graphic_position = position
         
         
     def clear_avatar(self):
-        """Removes the current GuiZero Drawing of the Avatar."""
+        """Removes the current GuiZero Drawing of the Avatar, if any."""
         
-        self.drawing.delete(self.avatar_graphic)
\ No newline at end of file
+        if self.avatar_graphic is not None:
+            self.drawing.delete(self.avatar_graphic)
+            self.avatar_graphic = None
+            self.avatar_graphic_position = None
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""CS 108 A Final Project
+
+Part of the model for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the LayoutMap class, which holds the parsed contents of a
+level layout file in a compact form that can be saved and reloaded without
+parsing the file again, and the parse_layout_file and parse_layout_lines
+functions which create one.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+from array import array
+
+from level_graphics_objects import Block, Spikes, LevelEnding
+from level_object_arrays import LevelObjectArrays
+
+
+def parse_layout_file(file_name):
+    """Reads the received layout file and returns a LayoutMap of its contents
+       (see parse_layout_lines)."""
+
+    with open(file_name) as level_map:
+        # Store file's contents to iterate through later.
+        map_lines = level_map.readlines()
+
+    return parse_layout_lines(map_lines)
+
+
+def parse_layout_lines(map_lines):
+    """Returns a LayoutMap of the received list of layout file lines; expects
+       last line to contain the Avatar's desired starting coordinates in the
+       format '#, #', without parentheses, and sets layout width based on the
+       length of the top line."""
+
+    # The tiles of each kind of object, as alternating columns and rows.
+    block_coordinates = array('i')
+    spike_coordinates = array('i')
+    exit_coordinates = array('i')
+
+    # Set the layout dimensions in layout units based on the length of the top
+    # line of the file and the number of lines in the file.
+    width_in_layout_units = len(map_lines[0].strip())
+    height_in_layout_units = len(map_lines) - 1
+
+    # Iterate through the indexes of each line in the file.
+    for line_index in range(len(map_lines) - 1):
+
+        # Iterate through the indexes of each character in each line.
+        for char_index in range(len(map_lines[line_index])):
+
+            # Store the position of a Block when the '#' symbol is encountered
+            # in the file, at the same relative location as the '#' among the
+            # other characters.
+            if map_lines[line_index][char_index] == '#':
+                block_coordinates.extend((char_index, line_index))
+
+            # Store the position of a Spike when the '^' symbol is encountered.
+            elif map_lines[line_index][char_index] == '^':
+                spike_coordinates.extend((char_index, line_index))
+
+            # Store the position of an Exit when the '@' symbol is encountered.
+            elif map_lines[line_index][char_index] == '@':
+                exit_coordinates.extend((char_index, line_index))
+
+    # Determine the Avatar's starting x and y coordinates from the bottom line
+    # of the file.
+    avatar_coords = map_lines[-1].split(',')
+    avatar_x = float(avatar_coords[0].strip())
+    avatar_y = float(avatar_coords[1].strip())
+
+    return LayoutMap(width_in_layout_units, height_in_layout_units,
+                     block_coordinates, spike_coordinates, exit_coordinates,
+                     avatar_x, avatar_y)
+
+
+def layout_map_from_dict(map_data):
+    """Returns a LayoutMap from the received dictionary (see
+       LayoutMap.to_dict)."""
+
+    return LayoutMap(map_data['width'], map_data['height'],
+                     array('i', map_data['blocks']),
+                     array('i', map_data['spikes']),
+                     array('i', map_data['exits']),
+                     map_data['avatar'][0], map_data['avatar'][1])
+
+
+def pair_up(coordinates):
+    """Returns a list of (column, row) tuples from the received sequence of
+       alternating columns and rows."""
+
+    return list(zip(coordinates[0::2], coordinates[1::2]))
+
+
+class LayoutMap:
+    """Represents the parsed contents of a level layout file: its dimensions
+       and the tiles of its blocks, spikes, and exits (in layout units), and
+       its Avatar's starting coordinates as written in the file.
+
+       The tiles are kept as typed arrays of alternating columns and rows (8
+       bytes per tile), since maps stay cached (see level_cache) for as long
+       as the game runs; the block_tiles, spike_tiles, and exit_tiles
+       properties list them as (column, row) tuples when needed."""
+
+    def __init__(self, width_in_layout_units, height_in_layout_units,
+                 block_coordinates, spike_coordinates, exit_coordinates,
+                 avatar_x, avatar_y):
+        """Receives the layout dimensions, the arrays ('i') of alternating
+           columns and rows of the tiles of each kind of object in file order,
+           and the Avatar's starting coordinates (measured from the bottom
+           left of the layout)."""
+
+        self.width_in_layout_units = width_in_layout_units
+        self.height_in_layout_units = height_in_layout_units
+        self.block_coordinates = block_coordinates
+        self.spike_coordinates = spike_coordinates
+        self.exit_coordinates = exit_coordinates
+        self.avatar_x = avatar_x
+        self.avatar_y = avatar_y
+
+        # The LevelGraphicsObjects and LevelObjectArrays created from the map,
+        # by unit size.
+        self.level_objects_by_unit = {}
+        self.level_object_arrays_by_unit = {}
+
+
+    @property
+    def block_tiles(self):
+        """The list of (column, row) tiles of the map's blocks."""
+
+        return pair_up(self.block_coordinates)
+
+
+    @property
+    def spike_tiles(self):
+        """The list of (column, row) tiles of the map's spikes."""
+
+        return pair_up(self.spike_coordinates)
+
+
+    @property
+    def exit_tiles(self):
+        """The list of (column, row) tiles of the map's exits."""
+
+        return pair_up(self.exit_coordinates)
+
+
+    def to_dict(self):
+        """Returns a dictionary of the map's contents which can be stored as
+           JSON, with the tiles of each kind as alternating columns and
+           rows."""
+
+        return dict(width=self.width_in_layout_units,
+                    height=self.height_in_layout_units,
+                    blocks=self.block_coordinates.tolist(),
+                    spikes=self.spike_coordinates.tolist(),
+                    exits=self.exit_coordinates.tolist(),
+                    avatar=[self.avatar_x, self.avatar_y])
+
+
+    def level_objects(self, unit):
+        """Returns the lists of Block, Spikes, and LevelEnding objects for the
+           map scaled by the received unit size, along with the tile index and
+           the list of rows of tiles (see Layout) of all of them; creates them
+           the first time they are asked for and shares them afterwards, since
+           they never change."""
+
+        if unit not in self.level_objects_by_unit:
+            blocks = [Block(x_pos=unit * column + unit/2,
+                            y_pos=unit * row + unit/2, size=unit)
+                      for column, row in self.block_tiles]
+            spikes = [Spikes(x_pos=unit * column + unit/2,
+                             y_pos=unit * row + unit/2, size=unit)
+                      for column, row in self.spike_tiles]
+            exits = [LevelEnding(x_pos=unit * column + unit/2,
+                                 y_pos=unit * row + unit/2, size=unit)
+                     for column, row in self.exit_tiles]
+
+            tiles = {}
+            for kind_tiles, kind_objects in [(self.block_tiles, blocks),
+                                             (self.spike_tiles, spikes),
+                                             (self.exit_tiles, exits)]:
+                tiles.update(zip(kind_tiles, kind_objects))
+
+            num_rows = max([row + 1 for column, row in tiles] + [0])
+            num_columns = max([column + 1 for column, row in tiles] + [0])
+            tile_rows = [[None] * num_columns for row in range(num_rows)]
+            for (column, row), tile in tiles.items():
+                tile_rows[row][column] = tile
+
+            self.level_objects_by_unit[unit] = (blocks, spikes, exits, tiles,
+                                                tile_rows)
+
+        return self.level_objects_by_unit[unit]
+
+
+    def level_object_arrays(self, unit):
+        """Returns the LevelObjectArrays of the map scaled by the received unit
+           size, creating it the first time it is asked for and sharing it
+           afterwards, like level_objects."""
+
+        if unit not in self.level_object_arrays_by_unit:
+            self.level_object_arrays_by_unit[unit] = LevelObjectArrays(
+                self.block_coordinates, self.spike_coordinates,
+                self.exit_coordinates, unit)
+
+        return self.level_object_arrays_by_unit[unit]
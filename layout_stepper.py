@@ -0,0 +1,178 @@
+"""CS 108 A Final Project
+
+Part of the model for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the LayoutStepper class, which steps the Avatar of a single
+Layout from one state to the next far faster than the engine, for searches
+which step many thousands of states (see solver and generate_levels).
+
+The engine steps Avatar objects through a LevelState, looking up the level
+objects near the Avatar and calling each one's collision methods. A
+LayoutStepper instead takes and returns plain (x, y, vertical velocity, in
+the air, beaten) tuples, as held by LevelState snapshots, and looks the tiles
+around the Avatar up in a grid of the kinds of objects in them. The results
+are the same as stepping a one-layout LevelState in the classic collision mode
+(see engine): Avatar.move, apply_gravity, prevent_obstructed_motion,
+is_impaled, and reached_exit are reproduced operation for operation, in the
+same order, over the same tiles as Layout.objects_near.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+from engine import MOVE_LEFT, MOVE_RIGHT, JUMP
+from level_graphics_objects import Avatar
+
+# The kinds of objects a tile can hold.
+BLOCK = 1
+SPIKES = 2
+EXIT = 3
+
+
+class LayoutStepper:
+    """Represents the tiles of a Layout and its Avatar's constants, for
+       stepping the Avatar's state tick by tick."""
+
+    def __init__(self, layout):
+        """Receives the Layout whose Avatar to step; the Layout itself is not
+           changed."""
+
+        self.unit = layout.UNIT
+        self.avatar_size = layout.avatar.size
+        self.width = layout.layout_width
+        self.height = layout.layout_height
+        self.starting_x = layout.avatar.starting_x
+        self.starting_y = layout.avatar.starting_y
+
+        # The kind and center of the object in each tile (None for none), as
+        # a list of rows of the same length as the Layout's tile_rows.
+        self.num_rows = len(layout.tile_rows)
+        self.num_columns = max([len(row) for row in layout.tile_rows] + [0])
+        self.tiles = [[None] * self.num_columns
+                      for row in range(self.num_rows)]
+        for kind, level_objects in [(BLOCK, layout.blocks),
+                                    (SPIKES, layout.spikes),
+                                    (EXIT, layout.exits)]:
+            for level_object in level_objects:
+                self.tiles[int(level_object.y // self.unit)][
+                    int(level_object.x // self.unit)] = (kind, level_object.x,
+                                                         level_object.y)
+
+
+    def spawn_state(self, in_air):
+        """Returns the state of the Avatar at its spawn point, in the air or
+           not as received."""
+
+        return (self.starting_x, self.starting_y, 0, in_air, False)
+
+
+    def step(self, avatar_state, inputs):
+        """Returns the (x, y, vertical velocity, in the air, beaten) state the
+           Avatar reaches from the received one in one tick of the received
+           input flags, and whether or not it died along the way. The
+           received state should not be beaten."""
+
+        x, y, y_vel, in_air, beaten = avatar_state
+        half_size = self.avatar_size/2
+
+        # Set the velocities from the inputs (see engine.accelerate_avatar),
+        # and apply gravity.
+        if inputs & MOVE_RIGHT and not inputs & MOVE_LEFT:
+            x_vel = Avatar.GROUND_X_SPEED
+        elif inputs & MOVE_LEFT and not inputs & MOVE_RIGHT:
+            x_vel = -Avatar.GROUND_X_SPEED
+        else:
+            x_vel = 0
+        if inputs & JUMP and not in_air:
+            y_vel = Avatar.JUMP_VEL
+        if y_vel < Avatar.TERMINAL_VELOCITY:
+            y_vel += 1
+        in_air = True
+
+        # Move, staying within the layout (see Avatar.move).
+        x += x_vel
+        y += y_vel
+        if x + half_size > self.width:
+            x = self.width - half_size
+            x_vel = 0
+        if x - half_size < 0:
+            x = half_size
+            x_vel = 0
+        if y + half_size + 1 >= self.height:
+            y_vel = 0
+            y = self.height - half_size - 1
+            in_air = False
+
+        # Find the objects in the tiles Layout.objects_near would.
+        unit = self.unit
+        x_reach = half_size + abs(x_vel)
+        y_reach = half_size + abs(y_vel)
+        first_column = max(int((x - x_reach)//unit) - 1, 0)
+        last_column = int((x + x_reach)//unit) + 2
+        first_row = max(int((y - y_reach)//unit) - 1, 0)
+        last_row = max(min(int((y + y_reach)//unit) + 2, self.num_rows),
+                       first_row)
+        nearby = []
+        for row in self.tiles[first_row:last_row]:
+            for tile in row[first_column:last_column]:
+                if tile is not None:
+                    nearby.append(tile)
+        if not nearby:
+            return (x, y, y_vel, in_air, beaten), False
+
+        # Push the Avatar out of blocks (see
+        # Avatar.prevent_obstructed_motion).
+        for kind, block_x, block_y in nearby:
+            if kind != BLOCK:
+                continue
+            y -= y_vel
+            if (block_x - unit/2 < x + half_size and
+                block_x + unit/2 > x - half_size and
+                block_y - unit/2 < y + half_size and
+                block_y + unit/2 > y - half_size):
+                if x_vel > 0:
+                    x = block_x - unit/2 - half_size
+                elif x_vel < 0:
+                    x = block_x + unit/2 + half_size
+                x_vel = 0
+            y += y_vel
+
+            x -= x_vel
+            if (block_x - unit/2 < x + half_size and
+                block_x + unit/2 > x - half_size and
+                block_y - unit/2 < y + half_size and
+                block_y + unit/2 > y - half_size):
+                if y_vel > 0:
+                    y = block_y - unit/2 - half_size
+                    in_air = False
+                if y_vel < 0:
+                    y = block_y + unit/2 + half_size
+                y_vel = 0
+            x += x_vel
+
+        # Respawn the Avatar if it is impaled (see Avatar.is_impaled and
+        # LevelState.restart), still checking the rest of the nearby spikes.
+        died = False
+        for kind, spikes_x, spikes_y in nearby:
+            if (kind == SPIKES and
+                spikes_x - unit/2 < x + half_size and
+                spikes_x + unit/2 > x - half_size and
+                spikes_y + unit/2 > y - half_size and
+                spikes_y < y + half_size):
+                died = True
+                beaten = False
+                x = self.starting_x
+                y = self.starting_y
+                y_vel = 0
+
+        # Mark the layout beaten if the Avatar has reached an exit (see
+        # Avatar.reached_exit).
+        for kind, exit_x, exit_y in nearby:
+            if (kind == EXIT and
+                exit_x - unit/4 <= x <= exit_x + unit/4 and
+                exit_y - unit/4 <= y <= exit_y + unit/4):
+                beaten = True
+
+        return (x, y, y_vel, in_air, beaten), died
@@ -0,0 +1,78 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that LayoutSteppers step Avatars exactly like the engine.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import random
+
+from engine import LevelState, load_level, step, MOVE_LEFT, MOVE_RIGHT, JUMP
+from generate_levels import GeneratorSettings, generate_candidate
+from layout import Layout
+from layout_map import parse_layout_lines
+from layout_stepper import LayoutStepper
+
+INPUT_CHOICES = [0, MOVE_LEFT, MOVE_RIGHT, JUMP, MOVE_LEFT | JUMP,
+                 MOVE_RIGHT | JUMP, MOVE_LEFT | MOVE_RIGHT]
+NUM_TICKS = 1500
+
+# The layouts of the shipped levels, and of a few generated ones, which are
+# denser and kill their Avatars more often.
+layouts = [layout for level_id in range(1, 5)
+           for layout in load_level(level_id).layouts]
+for seed in range(4):
+    for map_lines in generate_candidate(seed, GeneratorSettings()):
+        layouts.append(Layout('generated',
+                              layout_map=parse_layout_lines(map_lines)))
+
+
+def assert_steps_match(state, stepper, snapshot, inputs):
+    """Asserts that the received LayoutStepper steps the received one-layout
+       snapshot with the received input flags just as engine.step steps the
+       received one-layout LevelState, and returns the resulting snapshot."""
+
+    state.restore(snapshot)
+    state.num_deaths = 0
+    step(state, inputs)
+    avatar_state, died = stepper.step(snapshot[0], inputs)
+    assert (avatar_state,) == state.snapshot()
+    assert died == (state.num_deaths > 0)
+    return state.snapshot()
+
+
+# Each step should end in exactly the same state as the engine's, given the
+# same random inputs, on every layout.
+generator = random.Random(1)
+num_deaths = 0
+for layout in layouts:
+    state = LevelState([layout])
+    stepper = LayoutStepper(layout)
+    snapshot = (stepper.spawn_state(False),)
+    assert snapshot == state.snapshot()
+
+    for tick in range(NUM_TICKS):
+        # Hold each random input for a while, as a player would.
+        if tick % 15 == 0:
+            inputs = generator.choice(INPUT_CHOICES)
+        # Start again once the layout is beaten, as it no longer steps.
+        if snapshot[0][4]:
+            snapshot = (stepper.spawn_state(snapshot[0][3]),)
+        snapshot = assert_steps_match(state, stepper, snapshot, inputs)
+        num_deaths += state.num_deaths
+
+# The random inputs should have run into spikes along the way.
+assert num_deaths > 0
+
+# Avatars far above the top of the layout should meet nothing there.
+layout = layouts[0]
+state = LevelState([layout])
+stepper = LayoutStepper(layout)
+for y in [-20, -60, -240, -1000]:
+    for inputs in INPUT_CHOICES:
+        assert_steps_match(state, stepper, ((100, y, -5, True, False),),
+                           inputs)
@@ -0,0 +1,132 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that Layouts index their LevelGraphicsObjects properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import gc
+import os
+import tempfile
+import tracemalloc
+
+import level_cache
+from layout import Layout, ARRAY_STORAGE, OBJECT_STORAGE
+from level_graphics_objects import Avatar, Block, Spikes, LevelEnding
+
+# Every object in the level file should be stored in the tile index under the
+# column and row of its character in the file.
+layout = Layout(file_name='level1.txt', drawing=None, avatar_color='gray')
+assert len(layout.tiles) == (len(layout.blocks) + len(layout.spikes) +
+                             len(layout.exits))
+assert isinstance(layout.tiles[(0, 3)], Block)
+assert isinstance(layout.tiles[(4, 4)], Spikes)
+assert isinstance(layout.tiles[(12, 2)], LevelEnding)
+assert (1, 3) not in layout.tiles
+
+# An Avatar resting in the middle of the layout should only be offered the
+# objects in the tiles around it, and those objects should include every
+# object it overlaps.
+avatar = Avatar(x_pos=275, y_pos=175, size=50)
+nearby_objects = layout.objects_near(avatar)
+assert len(nearby_objects) < len(layout.tiles)
+assert layout.tiles[(5, 4)] in nearby_objects
+assert layout.tiles[(12, 2)] not in nearby_objects
+for block in layout.blocks:
+    if avatar.colliding_with_block(block):
+        assert block in nearby_objects
+
+# Nearby objects should be listed in the same order as the layout file, so
+# collisions are resolved in the same order as scanning every object.
+order = [layout.blocks.index(block) for block in nearby_objects
+         if isinstance(block, Block)]
+assert order == sorted(order)
+
+# An Avatar outside of the layout should not be offered any objects.
+avatar = Avatar(x_pos=-500, y_pos=-500, size=50)
+assert layout.objects_near(avatar) == []
+
+# The Avatar should be drawn once and then moved in place, with no canvas calls
+# at all while it stands still, using a stand-in drawing which records the
+# canvas calls made on it.
+class RecordingDrawing:
+    def __init__(self):
+        self.tk = self
+        self.calls = []
+    def rectangle(self, *args, **kwargs):
+        self.calls.append('rectangle')
+        return len(self.calls)
+    def coords(self, *args):
+        self.calls.append('coords')
+    def delete(self, *args):
+        self.calls.append('delete')
+
+layout = Layout(file_name='level1.txt', drawing=RecordingDrawing())
+layout.update_avatar()
+layout.update_avatar()
+assert layout.drawing.calls == ['rectangle']
+layout.avatar.x += 4
+layout.update_avatar()
+assert layout.drawing.calls == ['rectangle', 'coords']
+layout.clear_avatar()
+layout.clear_avatar()
+assert layout.drawing.calls == ['rectangle', 'coords', 'delete']
+layout.update_avatar()
+assert layout.drawing.calls == ['rectangle', 'coords', 'delete', 'rectangle']
+
+# A Layout storing its objects in arrays should offer the same objects, in the
+# same order, as one storing a Python object per tile.
+array_layout = Layout(file_name='level1.txt', storage=ARRAY_STORAGE)
+assert len(array_layout.tiles) == len(layout.tiles)
+assert isinstance(array_layout.tiles[(0, 3)], Block)
+assert isinstance(array_layout.tiles[(4, 4)], Spikes)
+assert isinstance(array_layout.tiles[(12, 2)], LevelEnding)
+assert (1, 3) not in array_layout.tiles
+for objects, array_objects in [(layout.blocks, array_layout.blocks),
+                               (layout.spikes, array_layout.spikes),
+                               (layout.exits, array_layout.exits)]:
+    assert ([(level_object.x, level_object.y, level_object.size)
+             for level_object in objects] ==
+            [(level_object.x, level_object.y, level_object.size)
+             for level_object in array_objects])
+
+def describe(level_objects):
+    return [([kind for kind in [Block, Spikes, LevelEnding]
+              if isinstance(level_object, kind)], level_object.x,
+             level_object.y) for level_object in level_objects]
+
+avatar = Avatar(x_pos=275, y_pos=175, size=50)
+assert (describe(layout.objects_near(avatar)) ==
+        describe(array_layout.objects_near(avatar)))
+
+# A large layout should take only a few dozen bytes per object with array
+# storage (counting its cached map), and far less than with a Python object
+# per tile.
+with tempfile.TemporaryDirectory() as directory:
+    file_name = os.path.join(directory, 'level1.txt')
+    with open(file_name, 'w') as level_map:
+        for row in range(100):
+            level_map.write(''.join('#^#@'[(row + column) % 4]
+                                    if column % 5 else '-'
+                                    for column in range(200)) + '\n')
+        level_map.write('1, 1')
+
+    bytes_per_object = {}
+    for storage in [ARRAY_STORAGE, OBJECT_STORAGE]:
+        level_cache.memory_cache.clear()
+        gc.collect()
+        tracemalloc.start()
+        large_layout = Layout(file_name, storage=storage)
+        gc.collect()
+        bytes_per_object[storage] = (tracemalloc.get_traced_memory()[0] /
+                                     len(large_layout.tiles))
+        tracemalloc.stop()
+        del large_layout
+    level_cache.memory_cache.clear()
+
+assert bytes_per_object[ARRAY_STORAGE] < 40
+assert bytes_per_object[OBJECT_STORAGE] > 5 * bytes_per_object[ARRAY_STORAGE]
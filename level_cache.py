@@ -0,0 +1,124 @@
+"""CS 108 A Final Project
+
+Part of the model for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the load_layout_map function, which caches parsed layout
+files (LayoutMaps) both in memory and on disk, so reopening or restarting a
+level does not read and scan its files character by character again.
+
+Cached maps are checked against the layout file's modification time and size
+before being used. On disk, each layout file's map is stored as a small JSON
+file in a '.level_cache' directory beside it, along with a hash of the file's
+contents, so a file whose modification time changed but whose contents did
+not still does not need to be parsed again.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import hashlib
+import json
+import os
+
+from layout_map import parse_layout_file, layout_map_from_dict
+
+# The name of the directory holding cached maps beside the layout files.
+CACHE_DIRECTORY_NAME = '.level_cache'
+
+# The format version of the cached map files; cached maps of other versions
+# are ignored.
+CACHE_VERSION = 1
+
+# Maps each layout file's absolute path to its modification time, size, and
+# LayoutMap when it was last loaded.
+memory_cache = {}
+
+
+def load_layout_map(file_name):
+    """Returns the LayoutMap of the received layout file, from the memory cache
+       or the disk cache when they are up to date with the file, and otherwise
+       by parsing the file (and caching the result)."""
+
+    path = os.path.abspath(file_name)
+    file_stats = os.stat(path)
+    file_version = (file_stats.st_mtime_ns, file_stats.st_size)
+
+    cached = memory_cache.get(path)
+    if cached is not None and cached[0] == file_version:
+        return cached[1]
+
+    layout_map = load_from_disk(path, file_version)
+    if layout_map is None:
+        layout_map = parse_layout_file(path)
+        save_to_disk(path, file_version, layout_map)
+
+    memory_cache[path] = (file_version, layout_map)
+    return layout_map
+
+
+def cache_file_name(path):
+    """Returns the name of the disk cache file for the layout file of the
+       received absolute path."""
+
+    return os.path.join(os.path.dirname(path), CACHE_DIRECTORY_NAME,
+                        hashlib.sha1(path.encode()).hexdigest() + '.json')
+
+
+def content_hash(path):
+    """Returns a hash of the contents of the file of the received path."""
+
+    with open(path, 'rb') as layout_file:
+        return hashlib.sha1(layout_file.read()).hexdigest()
+
+
+def load_from_disk(path, file_version):
+    """Returns the LayoutMap cached on disk for the layout file of the received
+       absolute path and (modification time, size) version, or None if there
+       is no usable cached map."""
+
+    try:
+        with open(cache_file_name(path)) as cache_file:
+            cached = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+    if cached.get('version') != CACHE_VERSION or cached.get('path') != path:
+        return None
+
+    # A changed modification time is fine as long as the contents are the
+    # same; the cache is updated so the contents need not be hashed again.
+    if [cached.get('mtime_ns'), cached.get('size')] != list(file_version):
+        if cached.get('sha1') != content_hash(path):
+            return None
+        cached['mtime_ns'], cached['size'] = file_version
+        write_cache_file(path, cached)
+
+    return layout_map_from_dict(cached['map'])
+
+
+def save_to_disk(path, file_version, layout_map):
+    """Caches the received LayoutMap on disk for the layout file of the
+       received absolute path and (modification time, size) version."""
+
+    write_cache_file(path, dict(version=CACHE_VERSION, path=path,
+                                mtime_ns=file_version[0], size=file_version[1],
+                                sha1=content_hash(path),
+                                map=layout_map.to_dict()))
+
+
+def write_cache_file(path, cached):
+    """Writes the received cache dictionary to the disk cache file of the layout
+       file of the received absolute path, replacing any old one in a single
+       step; caching is skipped if the directory cannot be written to."""
+
+    file_name = cache_file_name(path)
+    try:
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        temporary_file_name = file_name + '.' + str(os.getpid()) + '.tmp'
+        with open(temporary_file_name, 'w') as cache_file:
+            json.dump(cached, cache_file, separators=(',', ':'))
+        os.replace(temporary_file_name, file_name)
+    except OSError:
+        pass
@@ -0,0 +1,52 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that parsed layout files are cached properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import os
+import tempfile
+
+import level_cache
+from layout import Layout
+from layout_map import parse_layout_file
+
+with tempfile.TemporaryDirectory() as directory:
+    file_name = os.path.join(directory, 'level1.txt')
+    with open(file_name, 'w') as level_map:
+        level_map.write('---@\n#^-#\n1, 1')
+
+    # Loading a layout file twice should parse it only once, and Layouts of
+    # the same file should share their unchanging level objects.
+    layout_map = level_cache.load_layout_map(file_name)
+    assert level_cache.load_layout_map(file_name) is layout_map
+    assert layout_map.block_tiles == [(0, 1), (3, 1)]
+    assert layout_map.spike_tiles == [(1, 1)]
+    assert layout_map.exit_tiles == [(3, 0)]
+    assert Layout(file_name).blocks is Layout(file_name).blocks
+
+    # The parsed map should be cached on disk, and reloading it from there
+    # should give the same map as parsing the file.
+    level_cache.memory_cache.clear()
+    assert os.path.exists(level_cache.cache_file_name(os.path.abspath(file_name)))
+    reloaded_map = level_cache.load_layout_map(file_name)
+    assert reloaded_map is not layout_map
+    assert reloaded_map.to_dict() == parse_layout_file(file_name).to_dict()
+    layout = Layout(file_name)
+    assert (layout.avatar.x, layout.avatar.y) == (75, 25)
+
+    # Changing the file should cause it to be parsed again.
+    with open(file_name, 'w') as level_map:
+        level_map.write('@---\n^^##\n-----\n2, 2')
+    os.utime(file_name, ns=(0, 0))
+    changed_map = level_cache.load_layout_map(file_name)
+    assert changed_map.exit_tiles == [(0, 0)]
+    assert changed_map.height_in_layout_units == 3
+    level_cache.memory_cache.clear()
+    assert level_cache.load_layout_map(file_name).to_dict() == \
+        changed_map.to_dict()
@@ -35,10 +35,8 @@ TO ADD/CREATE A LEVEL
         level.
       - Underneath the text block, write the desired starting coordinates for
         each layout's avatar in the format '#, #', without parentheses.
- - Create an empty text file named with the format 'min_attempts#.txt' (to store
-   the record of fewest attempts needed to beat the corresponding level).
- - Change NUM_LEVELS under the create_menu method to the number of desired
-   levels.
+ - The level menu finds every 'level#.txt' file beside the game on its own
+   (see level_index), so no code needs changing to add a level.
 
 @author: Jason Chew (jgc23)
 @author: Serita Nelesen (smn4)
@@ -51,6 +49,10 @@ TO ADD/CREATE A LEVEL
 class LevelGraphicObject:
     """Represents any object contained in a level layout."""
     
+    # Level objects are created for every tile of a layout, so they keep their
+    # attributes in slots rather than a dictionary per object.
+    __slots__ = ('x', 'y', 'size')
+    
     def __init__(self, x_pos, y_pos, size):
         """Initialize position and size attributes for the LevelObject."""
         
@@ -62,6 +64,8 @@ class LevelGraphicObject:
 class Block(LevelGraphicObject):
     """Represents a square Block LevelObject."""
     
+    __slots__ = ()
+    
     def __init__(self, x_pos, y_pos, size):
         """Constructor for Block."""
         LevelGraphicObject.__init__(self, x_pos, y_pos, size)
@@ -79,6 +83,8 @@ class Block(LevelGraphicObject):
 class Spikes(LevelGraphicObject):
     """Represents a three-pronged Spike LevelObject."""
     
+    __slots__ = ()
+    
     def __init__(self, x_pos, y_pos, size):
         """Constructor for Spikes."""
         LevelGraphicObject.__init__(self, x_pos, y_pos, size)
@@ -131,6 +137,8 @@ class Spikes(LevelGraphicObject):
 class LevelEnding(LevelGraphicObject):
     """Represents an ovular exit (finish line) to a level layout."""
     
+    __slots__ = ()
+    
     def __init__(self, x_pos, y_pos, size):
         """Constructor for LevelEnding."""
         LevelGraphicObject.__init__(self, x_pos, y_pos, size)
@@ -148,6 +156,15 @@ class LevelEnding(LevelGraphicObject):
 class Avatar(LevelGraphicObject):
     """Represents the player-controlled Avatar in a level layout."""
     
+    __slots__ = ('color', 'starting_x', 'starting_y', 'x_vel', 'y_vel',
+                 'in_air')
+    
+    # The Avatar's horizontal speed on the ground, upward velocity when it
+    # jumps, and fastest falling velocity, shared by every Avatar.
+    GROUND_X_SPEED = 4
+    JUMP_VEL = -14
+    TERMINAL_VELOCITY = 10
+    
     def __init__(self, x_pos, y_pos, size, color='gray'):
         """Initialize Avatar characteristics (visual/positional)."""
         
@@ -156,8 +173,6 @@ class Avatar(LevelGraphicObject):
         self.color = color
         self.starting_x = x_pos
         self.starting_y = y_pos
-        self.GROUND_X_SPEED = 4
-        self.JUMP_VEL = -14
         self.x_vel = 0
         self.y_vel = 0
         self.in_air = None
@@ -173,27 +188,45 @@ class Avatar(LevelGraphicObject):
                                  color = self.color, outline=True)
     
     
-    def move(self, drawing):
-        """Receives a GuiZero drawing; increments the Avatar's x-position by its
-           x-velocity and its y-position by its y-velocity, unless doing so
-           would cause it to move past the right, left, or bottom boundaries of
-           the drawing."""
+    def redraw(self, drawing, avatar_graphic):
+        """Moves the Avatar's existing Drawing (of the received Drawing ID) on
+           the received GuiZero drawing to the Avatar's current x and y
+           coordinates, without creating a new Drawing."""
+        
+        drawing.tk.coords(avatar_graphic,
+                          self.x - self.size/2, self.y - self.size/2,
+                          self.x + self.size/2, self.y + self.size/2)
+    
+    
+    def move(self, width, height):
+        """Receives the width and height of the Avatar's layout; increments the
+           Avatar's x-position by its x-velocity and its y-position by its
+           y-velocity, unless doing so would cause it to move past the right,
+           left, or bottom boundaries of the layout."""
         
         self.x += self.x_vel
         self.y += self.y_vel
         
-        # Stop the Avatar from moving past the horizontal drawing bounds.
-        if self.x + self.size/2 > drawing.width:
-            self.x = drawing.width - self.size/2
+        self.stay_in_layout(width, height)
+        
+        
+    def stay_in_layout(self, width, height):
+        """Receives the width and height of the Avatar's layout and moves the
+           Avatar back within its right, left, and bottom boundaries, stopping
+           it against them."""
+        
+        # Stop the Avatar from moving past the horizontal layout bounds.
+        if self.x + self.size/2 > width:
+            self.x = width - self.size/2
             self.x_vel = 0
         if self.x - self.size/2 < 0:
             self.x = self.size/2
             self.x_vel = 0
 
         # Stop the Avatar from falling through the floor.
-        if self.y + self.size/2 + 1 >= drawing.height:
+        if self.y + self.size/2 + 1 >= height:
             self.y_vel = 0
-            self.y = drawing.height - self.size/2 - 1
+            self.y = height - self.size/2 - 1
             self.in_air = False
         
         
@@ -201,8 +234,7 @@ class Avatar(LevelGraphicObject):
         """Increments the Avatar's downward velocity by 1 up to its terminal
            velocity."""
         
-        TERMINAL_VELOCITY = 10
-        if self.y_vel < TERMINAL_VELOCITY:
+        if self.y_vel < self.TERMINAL_VELOCITY:
             self.y_vel += 1
             
         self.in_air = True
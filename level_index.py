@@ -0,0 +1,207 @@
+"""CS 108 A Final Project
+
+Part of the "Out of Sync" parallel-dimensional 2D platforming puzzle, supplying
+the find_levels function, which finds every level installed in a directory,
+and the LevelIndex class, which keeps a small summary (metadata) of each level:
+the dimensions of its layouts and a hash of its layout files. (Records are
+kept by the RecordsStore; see records.)
+
+A level's metadata is only worked out the first time it is asked for, and is
+then cached in memory and in an index file in the '.level_cache' directory
+beside the levels (see level_cache), so finding levels stays quick however many
+are installed. Cached metadata is checked against the modification times and
+sizes of the level's files before being used.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from level_cache import CACHE_DIRECTORY_NAME
+
+# The name of the index file in the cache directory.
+INDEX_FILE_NAME = 'level_index.json'
+
+# The format version of the index file; indexes of other versions are ignored.
+INDEX_VERSION = 3
+
+# The letters ending the names of the layout files of a level's dimensions
+# after its main layout ('level#a.txt', 'level#b.txt', ...), in order.
+DIMENSION_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def find_levels(directory, complete_only=True):
+    """Returns a sorted list of the level IDs (ints) of every main level layout
+       file ('level#.txt') in the received directory which has an alt layout
+       file ('level#a.txt') beside it, so it can be loaded, or of every main
+       level layout file if complete_only is False."""
+
+    with os.scandir(directory) as entries:
+        file_names = {entry.name for entry in entries}
+
+    level_ids = []
+    for file_name in file_names:
+        match = re.fullmatch(r'level(\d+)\.txt', file_name)
+        if match and (not complete_only or
+                      'level' + match.group(1) + DIMENSION_LETTERS[0] +
+                      '.txt' in file_names):
+            level_ids.append(int(match.group(1)))
+
+    return sorted(level_ids)
+
+
+def level_file_paths(directory, level_id):
+    """Returns the paths of the layout files of the level of the received
+       level ID (int) in the received directory, one per dimension: the main
+       ('level#.txt') and alt ('level#a.txt') layout files, followed by any
+       further layout files ('level#b.txt', 'level#c.txt', ...) up to the
+       first one missing. The alt layout file is always included, so a level
+       missing it fails to load."""
+
+    path_start = os.path.join(directory, 'level' + str(level_id))
+    paths = [path_start + '.txt', path_start + DIMENSION_LETTERS[0] + '.txt']
+    for letter in DIMENSION_LETTERS[1:]:
+        path = path_start + letter + '.txt'
+        if not os.path.exists(path):
+            break
+        paths.append(path)
+
+    return paths
+
+
+def file_version(path):
+    """Returns the [modification time, size] of the file of the received path,
+       or None if it does not exist."""
+
+    try:
+        file_stats = os.stat(path)
+    except OSError:
+        return None
+
+    return [file_stats.st_mtime_ns, file_stats.st_size]
+
+
+def layout_dimensions(map_lines):
+    """Returns the [width, height] (in layout units) of the layout of the
+       received list of layout file lines (see Layout)."""
+
+    if not map_lines:
+        return [0, 0]
+
+    return [len(map_lines[0].strip()), len(map_lines) - 1]
+
+
+class LevelIndex:
+    """Represents the levels installed in a directory and their metadata."""
+
+    def __init__(self, directory='.'):
+        """Receives the directory the levels are installed in."""
+
+        self.directory = directory
+        self.index_file_name = os.path.join(directory, CACHE_DIRECTORY_NAME,
+                                            INDEX_FILE_NAME)
+        self.ids = None
+        # Maps each level ID (as a string, as in JSON) to its cached metadata,
+        # loaded from the index file when first needed.
+        self.entries = None
+        self.changed = False
+
+
+    def level_ids(self):
+        """Returns the sorted list of the IDs (ints) of the installed levels,
+           finding them the first time it is asked for."""
+
+        if self.ids is None:
+            self.ids = find_levels(self.directory)
+
+        return self.ids
+
+
+    def refresh(self):
+        """Forgets the installed levels, so they are found again."""
+
+        self.ids = None
+
+
+    def metadata(self, level_id):
+        """Returns a dictionary of the metadata of the level of the received ID
+           (int): the [width, height] of its main and alt layouts (in layout
+           units) as 'main_size' and 'alt_size', its number of layouts
+           ('num_dimensions'), and a hash of its layout files ('sha1')."""
+
+        if self.entries is None:
+            self.entries = self.load()
+
+        paths = level_file_paths(self.directory, level_id)
+        versions = [file_version(path) for path in paths]
+
+        entry = self.entries.get(str(level_id))
+        if entry is None or entry['versions'] != versions:
+            entry = self.read_metadata(paths)
+            entry['versions'] = versions
+            self.entries[str(level_id)] = entry
+            self.changed = True
+
+        return entry['metadata']
+
+
+    def read_metadata(self, paths):
+        """Returns a new index entry holding the metadata of the level of the
+           received list of layout file paths (see level_file_paths)."""
+
+        sha1 = hashlib.sha1()
+        sizes = []
+        for path in paths:
+            with open(path, 'rb') as layout_file:
+                contents = layout_file.read()
+            sha1.update(contents)
+            sizes.append(layout_dimensions(
+                contents.decode(errors='replace').splitlines()))
+
+        return dict(metadata=dict(main_size=sizes[0], alt_size=sizes[1],
+                                  num_dimensions=len(paths),
+                                  sha1=sha1.hexdigest()))
+
+
+    def load(self):
+        """Returns the entries stored in the index file, or an empty dictionary
+           if there is no usable index file."""
+
+        try:
+            with open(self.index_file_name) as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+
+        if index.get('version') != INDEX_VERSION:
+            return {}
+
+        return index['levels']
+
+
+    def save(self):
+        """Writes the entries to the index file if any have changed, replacing
+           the old file in a single step; saving is skipped if the directory
+           cannot be written to."""
+
+        if not self.changed:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.index_file_name), exist_ok=True)
+            temporary_file_name = (self.index_file_name + '.' +
+                                   str(os.getpid()) + '.tmp')
+            with open(temporary_file_name, 'w') as index_file:
+                json.dump(dict(version=INDEX_VERSION, levels=self.entries),
+                          index_file, separators=(',', ':'))
+            os.replace(temporary_file_name, self.index_file_name)
+            self.changed = False
+        except OSError:
+            pass
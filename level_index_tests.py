@@ -0,0 +1,81 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that installed levels are found and their metadata indexed properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import os
+import tempfile
+
+from level_index import LevelIndex, find_levels, level_file_paths
+
+with tempfile.TemporaryDirectory() as directory:
+    for level_id in [1, 2, 10]:
+        with open(os.path.join(directory, 'level' + str(level_id) + '.txt'),
+                  'w') as level_map:
+            level_map.write('---@\n#^-#\n1, 1')
+        with open(os.path.join(directory, 'level' + str(level_id) + 'a.txt'),
+                  'w') as level_map:
+            level_map.write('@-----\n######\n-----\n1, 1')
+    # Files which are not main layouts should not be taken for levels, and
+    # main layouts without alt layouts should only be found when asked for.
+    open(os.path.join(directory, 'level3a.txt'), 'w').close()
+    open(os.path.join(directory, 'levelx.txt'), 'w').close()
+    open(os.path.join(directory, 'level5.txt'), 'w').close()
+
+    # Levels should be found in numeric (not alphabetical) order.
+    assert find_levels(directory) == [1, 2, 10]
+    assert find_levels(directory, complete_only=False) == [1, 2, 5, 10]
+    level_index = LevelIndex(directory)
+    assert level_index.level_ids() == [1, 2, 10]
+
+    # Metadata should only be worked out when asked for.
+    assert level_index.entries is None
+    metadata = level_index.metadata(2)
+    assert metadata['main_size'] == [4, 2]
+    assert metadata['alt_size'] == [6, 3]
+    assert level_index.metadata(1)['main_size'] == [4, 2]
+    assert len(level_index.entries) == 2
+    assert level_index.metadata(2) is metadata
+
+    # Saved metadata should be reused by a new index.
+    level_index.save()
+    assert not level_index.changed
+    reloaded_index = LevelIndex(directory)
+    assert reloaded_index.metadata(2) == metadata
+    assert not reloaded_index.changed
+
+    # Changing a level's files should cause its metadata to be worked out
+    # again.
+    with open(os.path.join(directory, 'level2a.txt'), 'w') as level_map:
+        level_map.write('@-----\n######\n-----\n2, 1')
+    assert reloaded_index.metadata(2)['alt_size'] == [6, 3]
+    assert reloaded_index.metadata(2)['sha1'] != metadata['sha1']
+    assert reloaded_index.changed
+
+    # Adding a dimension to a level should add its layout file to the level,
+    # but files after a missing dimension should not be.
+    open(os.path.join(directory, 'level2b.txt'), 'w').close()
+    open(os.path.join(directory, 'level2d.txt'), 'w').close()
+    assert [os.path.basename(path) for path
+            in level_file_paths(directory, 2)] == \
+        ['level2.txt', 'level2a.txt', 'level2b.txt']
+    assert [os.path.basename(path) for path
+            in level_file_paths(directory, 3)] == ['level3.txt', 'level3a.txt']
+    assert metadata['num_dimensions'] == 2
+    assert reloaded_index.metadata(2)['num_dimensions'] == 3
+
+    # Newly installed levels should be found after refreshing.
+    assert reloaded_index.level_ids() == [1, 2, 10]
+    with open(os.path.join(directory, 'level4.txt'), 'w') as level_map:
+        level_map.write('@\n1, 1')
+    with open(os.path.join(directory, 'level4a.txt'), 'w') as level_map:
+        level_map.write('@\n1, 1')
+    assert reloaded_index.level_ids() == [1, 2, 10]
+    reloaded_index.refresh()
+    assert reloaded_index.level_ids() == [1, 2, 4, 10]
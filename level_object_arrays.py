@@ -0,0 +1,229 @@
+"""CS 108 A Final Project
+
+Part of the model for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the LevelObjectArrays class, a compact way for a Layout to
+store its blocks, spikes, and exits (see Layout's storage option).
+
+Rather than one Python object per tile, the x, y, and kind of every level
+object are kept in typed arrays (every object is a tile in size), in the same
+order as the lists of objects a Layout would otherwise hold (blocks, then
+spikes, then exits, each in file order), with the tile index kept as one array
+of object indexes per row. Light view objects, which subclass Block, Spikes,
+and LevelEnding and read their coordinates from the arrays, are only created
+when an object is asked for. Together with its cached LayoutMap (see
+layout_map), a layout takes about 25 bytes per object plus 4 bytes per tile of
+its tile index (about 30 bytes per object in all, against about 250 for a
+Python object per tile; see layout_tests).
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+from array import array
+
+from level_graphics_objects import Block, Spikes, LevelEnding
+
+# The kind numbers stored for each kind of level object.
+BLOCK_KIND = 0
+SPIKES_KIND = 1
+EXIT_KIND = 2
+
+# The index stored in the tile index for tiles without an object.
+EMPTY_TILE = -1
+
+
+class LevelObjectArrays:
+    """Represents the blocks, spikes, and exits of a layout as arrays of their
+       x and y coordinates and kinds, all of the same size."""
+
+    def __init__(self, block_coordinates, spike_coordinates, exit_coordinates,
+                 unit):
+        """Receives the sequences of alternating columns and rows of the tiles
+           of each kind of object in file order (see LayoutMap) and the size of
+           a tile (in pixels), which is the size of every object."""
+
+        self.unit = unit
+        self.x = array('d')
+        self.y = array('d')
+        self.kind = array('b')
+
+        kinds = [(BLOCK_KIND, block_coordinates),
+                 (SPIKES_KIND, spike_coordinates),
+                 (EXIT_KIND, exit_coordinates)]
+        for kind, coordinates in kinds:
+            self.x.extend(unit * column + unit/2
+                          for column in coordinates[0::2])
+            self.y.extend(unit * row + unit/2 for row in coordinates[1::2])
+            self.kind.extend(array('b', [kind]) * (len(coordinates) // 2))
+
+        self.num_blocks = len(block_coordinates) // 2
+        self.num_spikes = len(spike_coordinates) // 2
+        self.num_exits = len(exit_coordinates) // 2
+
+        # The index of the object in each (column, row) tile, as a list of rows
+        # of object indexes (EMPTY_TILE for empty tiles).
+        num_rows = max([max(coordinates[1::2], default=-1) + 1
+                        for kind, coordinates in kinds])
+        num_columns = max([max(coordinates[0::2], default=-1) + 1
+                           for kind, coordinates in kinds])
+        self.tile_rows = [array('i', [EMPTY_TILE]) * num_columns
+                          for row in range(num_rows)]
+        index = 0
+        for kind, coordinates in kinds:
+            for position in range(0, len(coordinates), 2):
+                self.tile_rows[coordinates[position + 1]][
+                    coordinates[position]] = index
+                index += 1
+
+
+    def view(self, index):
+        """Returns a view of the level object of the received index."""
+
+        return VIEW_CLASSES[self.kind[index]](self, index)
+
+
+    def level_objects(self):
+        """Returns sequences of the Block, Spikes, and LevelEnding views, and a
+           mapping of (column, row) tiles to views, standing in for the lists
+           and tile index of a Layout."""
+
+        first_spikes = self.num_blocks
+        first_exit = first_spikes + self.num_spikes
+        return (LevelObjectSequence(self, 0, first_spikes),
+                LevelObjectSequence(self, first_spikes, first_exit),
+                LevelObjectSequence(self, first_exit,
+                                    first_exit + self.num_exits),
+                TileIndex(self))
+
+
+class LevelObjectSequence:
+    """Represents a read-only sequence of views of a range of the level objects
+       in a LevelObjectArrays."""
+
+    def __init__(self, arrays, start, stop):
+        """Receives the LevelObjectArrays and the range of object indexes."""
+
+        self.arrays = arrays
+        self.indexes = range(start, stop)
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.arrays.view(object_index)
+                    for object_index in self.indexes[index]]
+        return self.arrays.view(self.indexes[index])
+
+    def __iter__(self):
+        for object_index in self.indexes:
+            yield self.arrays.view(object_index)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def index(self, level_object):
+        """Returns the position of the received view in the sequence."""
+
+        return self.indexes.index(level_object.index)
+
+
+class TileIndex:
+    """Represents a read-only mapping of (column, row) tiles to views of the
+       level objects occupying them in a LevelObjectArrays."""
+
+    def __init__(self, arrays):
+        """Receives the LevelObjectArrays."""
+
+        self.arrays = arrays
+
+    def object_index(self, tile):
+        """Returns the index of the object in the received (column, row) tile,
+           or EMPTY_TILE."""
+
+        column, row = tile
+        if (0 <= row < len(self.arrays.tile_rows) and
+            0 <= column < len(self.arrays.tile_rows[row])):
+            return self.arrays.tile_rows[row][column]
+        return EMPTY_TILE
+
+    def __getitem__(self, tile):
+        object_index = self.object_index(tile)
+        if object_index == EMPTY_TILE:
+            raise KeyError(tile)
+        return self.arrays.view(object_index)
+
+    def __contains__(self, tile):
+        return self.object_index(tile) != EMPTY_TILE
+
+    def __len__(self):
+        return len(self.arrays.kind)
+
+    def get(self, tile, default=None):
+        return self[tile] if tile in self else default
+
+
+class LevelObjectView:
+    """Mixin for the level object classes, reading the object's attributes from
+       a LevelObjectArrays rather than storing them."""
+
+    __slots__ = ()
+
+    @property
+    def x(self):
+        return self.arrays.x[self.index]
+
+    @property
+    def y(self):
+        return self.arrays.y[self.index]
+
+    @property
+    def size(self):
+        return self.arrays.unit
+
+    def __eq__(self, other):
+        return (isinstance(other, LevelObjectView) and
+                other.arrays is self.arrays and other.index == self.index)
+
+    def __hash__(self):
+        return hash((id(self.arrays), self.index))
+
+
+class BlockView(LevelObjectView, Block):
+    """Represents a Block stored in a LevelObjectArrays."""
+
+    __slots__ = ('arrays', 'index')
+
+    def __init__(self, arrays, index):
+        self.arrays = arrays
+        self.index = index
+
+
+class SpikesView(LevelObjectView, Spikes):
+    """Represents Spikes stored in a LevelObjectArrays."""
+
+    __slots__ = ('arrays', 'index')
+
+    def __init__(self, arrays, index):
+        self.arrays = arrays
+        self.index = index
+
+
+class LevelEndingView(LevelObjectView, LevelEnding):
+    """Represents a LevelEnding stored in a LevelObjectArrays."""
+
+    __slots__ = ('arrays', 'index')
+
+    def __init__(self, arrays, index):
+        self.arrays = arrays
+        self.index = index
+
+
+# The view class of each kind number.
+VIEW_CLASSES = [BlockView, SpikesView, LevelEndingView]
@@ -0,0 +1,115 @@
+"""CS 108 A Final Project
+
+Part of the GUI view for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the LevelPreloader class, which loads the level the player is
+likely to open next on a worker thread, so opening it only needs to draw it.
+
+Preloading a level reads and parses its layout files (see level_cache), builds
+its LevelState and level objects, and renders the images of the parts of its
+layouts shown first (see static_layer); none of this touches any GuiZero
+widgets, which may only be used from the GUI thread. A single level is
+preloaded at a time: guessing a different level replaces the guess. A
+preloaded level whose files have changed since is loaded again.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from engine import level_file_names, load_level
+from level_index import file_version
+
+
+def prepare_level(level_id):
+    """Returns a new LevelState for the level of the received level ID (int)
+       whose layouts' views are prepared for drawing."""
+
+    state = load_level(level_id)
+    for layout in state.layouts:
+        layout.prepare_view()
+
+    return state
+
+
+def level_files_version(level_id):
+    """Returns a list of the versions (see file_version) of the layout files of
+       the level of the received level ID (int)."""
+
+    return [file_version(file_name) for file_name in level_file_names(level_id)]
+
+
+class LevelPreloader:
+    """Represents the level being loaded ahead of time and the worker thread
+       loading it."""
+
+    def __init__(self, loader=prepare_level):
+        """Receives the function returning a new, prepared LevelState for a
+           level ID (int)."""
+
+        self.loader = loader
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+        # The ID of the level guessed, the versions of its files when it was
+        # guessed, and the Future of its LevelState (all None if there is no
+        # guess).
+        self.level_id = None
+        self.versions = None
+        self.future = None
+
+
+    def preload(self, level_id):
+        """Starts loading the level of the received level ID (int) on the
+           worker thread, unless it is already loaded or being loaded."""
+
+        if level_id == self.level_id:
+            return
+
+        self.forget()
+        self.level_id = level_id
+        self.versions = level_files_version(level_id)
+        self.future = self.executor.submit(self.loader, level_id)
+
+
+    def take(self, level_id):
+        """Returns the LevelState of the level of the received level ID (int),
+           taking the preloaded one if it was guessed (waiting for it to finish
+           loading if needed) and loading it right away otherwise."""
+
+        state = None
+        if (level_id == self.level_id and
+            self.versions == level_files_version(level_id)):
+            try:
+                state = self.future.result()
+            except Exception:
+                # Loading it again below raises the error where it is expected.
+                state = None
+
+        # A preloaded LevelState may only be played once.
+        self.forget()
+
+        if state is None:
+            state = self.loader(level_id)
+
+        return state
+
+
+    def forget(self):
+        """Drops the current guess, cancelling its loading if it has not
+           started."""
+
+        if self.future is not None:
+            self.future.cancel()
+        self.level_id = None
+        self.versions = None
+        self.future = None
+
+
+    def close(self):
+        """Drops the current guess and stops the worker thread."""
+
+        self.forget()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,85 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that levels are preloaded in the background properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import os
+import tempfile
+import threading
+
+from level_preloader import LevelPreloader, prepare_level
+
+# A preloaded level should have its layouts' views prepared, and drawing them
+# should use the prepared views.
+state = prepare_level(1)
+for layout in state.layouts:
+    assert layout.viewport is not None
+    assert layout.viewport.left is None
+
+# A level which was guessed should be loaded once, on the worker thread.
+loaded_on = []
+def loader(level_id):
+    loaded_on.append((level_id, threading.current_thread()))
+    return prepare_level(level_id)
+
+preloader = LevelPreloader(loader)
+preloader.preload(2)
+preloader.preload(2)
+state = preloader.take(2)
+assert [level_id for level_id, thread in loaded_on] == [2]
+assert loaded_on[0][1] is not threading.current_thread()
+assert (state.layouts[0].avatar.x, state.layouts[0].avatar.y) == \
+    (prepare_level(2).layouts[0].avatar.x, prepare_level(2).layouts[0].avatar.y)
+
+# A preloaded level may only be taken once; taking it again, or taking a level
+# which was not guessed, should load it right away.
+loaded_on.clear()
+assert preloader.take(2) is not state
+preloader.preload(3)
+preloader.take(1)
+assert loaded_on[0][0] == 2
+assert loaded_on[-1] == (1, threading.current_thread())
+assert preloader.level_id is None
+
+# A level which failed to preload should be loaded again, raising the error
+# where it is expected.
+attempts = []
+def failing_loader(level_id):
+    attempts.append(level_id)
+    raise OSError('missing level')
+
+failing_preloader = LevelPreloader(failing_loader)
+failing_preloader.preload(4)
+try:
+    failing_preloader.take(4)
+    assert False
+except OSError:
+    assert attempts == [4, 4]
+failing_preloader.close()
+
+# A preloaded level whose files have changed since should be loaded again.
+with tempfile.TemporaryDirectory() as directory:
+    old_directory = os.getcwd()
+    os.chdir(directory)
+    try:
+        for file_name in ['level1.txt', 'level1a.txt']:
+            with open(file_name, 'w') as level_map:
+                level_map.write('---@\n#^-#\n1, 1')
+        loaded_on.clear()
+        preloader.preload(1)
+        preloader.future.result()
+        with open('level1.txt', 'w') as level_map:
+            level_map.write('@----\n#####\n2, 1')
+        state = preloader.take(1)
+        assert len(loaded_on) == 2
+        assert len(state.layouts[0].blocks) == 5
+    finally:
+        os.chdir(old_directory)
+
+preloader.close()
@@ -0,0 +1,136 @@
+"""CS 108 A Final Project
+
+Part of the GUI view for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the FrameProfiler class, which times each phase of the work
+done every time the game window updates (a frame): moving the Avatars
+(physics), resolving their collisions (collision), updating the layout
+Drawings (canvas), and updating the death count (hud).
+
+The profiler keeps the phase times of the most recent frames to report their
+rolling minimum, average, and 99th percentile, and can stream every frame's
+times to a CSV file (for file names ending in '.csv') or a JSON lines file.
+Profiling is opt-in: the game only calls the profiler when one is given, so
+turning it off costs a single comparison per layout per tick.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import json
+from collections import deque
+from time import perf_counter
+
+# The phases of a frame, in the order they happen.
+PHASES = ['physics', 'collision', 'canvas', 'hud']
+
+# The number of recent frames the rolling statistics cover.
+WINDOW_FRAMES = 300
+
+
+class FrameProfiler:
+    """Represents the timings of the phases of the game window's frames."""
+
+    def __init__(self, window_frames=WINDOW_FRAMES, output_file_name=None,
+                 clock=perf_counter):
+        """Receives the number of recent frames to keep statistics over, the
+           name of a file to stream every frame's timings to (or None), and
+           the function returning the current time in seconds."""
+
+        self.clock = clock
+        self.recent_times = {phase: deque(maxlen=window_frames)
+                             for phase in PHASES + ['total']}
+        self.frame_times = dict.fromkeys(PHASES, 0)
+        self.frame_ticks = 0
+        self.frame_start_time = None
+        self.num_frames = 0
+
+        self.output_file = None
+        self.csv = False
+        if output_file_name is not None:
+            self.output_file = open(output_file_name, 'w')
+            self.csv = output_file_name.lower().endswith('.csv')
+            if self.csv:
+                self.output_file.write(','.join(['frame', 'ticks'] + PHASES +
+                                                ['total']) + '\n')
+
+
+    def start_frame(self):
+        """Starts timing a new frame."""
+
+        self.frame_times = dict.fromkeys(PHASES, 0)
+        self.frame_ticks = 0
+        self.frame_start_time = self.clock()
+
+
+    def add(self, phase, seconds):
+        """Adds the received number of seconds to the received phase of the
+           current frame."""
+
+        self.frame_times[phase] += seconds
+
+
+    def add_tick(self):
+        """Counts a tick simulated during the current frame."""
+
+        self.frame_ticks += 1
+
+
+    def end_frame(self):
+        """Finishes timing the current frame, adding its phase times to the
+           rolling statistics and the output file."""
+
+        total = self.clock() - self.frame_start_time
+        for phase in PHASES:
+            self.recent_times[phase].append(self.frame_times[phase])
+        self.recent_times['total'].append(total)
+        self.num_frames += 1
+
+        if self.output_file is not None:
+            if self.csv:
+                self.output_file.write(','.join(
+                    [str(self.num_frames), str(self.frame_ticks)] +
+                    [repr(self.frame_times[phase]) for phase in PHASES] +
+                    [repr(total)]) + '\n')
+            else:
+                self.output_file.write(json.dumps(dict(
+                    frame=self.num_frames, ticks=self.frame_ticks,
+                    total=total, **self.frame_times)) + '\n')
+
+
+    def statistics(self, phase):
+        """Returns the (minimum, average, 99th percentile) time in seconds of
+           the received phase (or 'total') over the recent frames, or None if
+           no frames have been timed."""
+
+        times = sorted(self.recent_times[phase])
+        if not times:
+            return None
+
+        percentile_index = min(len(times) - 1, int(len(times) * 0.99))
+        return times[0], sum(times) / len(times), times[percentile_index]
+
+
+    def summary(self):
+        """Returns a multi-line string of the rolling statistics of every
+           phase, in milliseconds, for display."""
+
+        lines = ['PHASE (MS)  MIN / AVG / P99']
+        for phase in PHASES + ['total']:
+            phase_statistics = self.statistics(phase)
+            if phase_statistics is not None:
+                lines.append(phase.upper() + '  ' + ' / '.join(
+                    format(seconds * 1000, '.2f')
+                    for seconds in phase_statistics))
+
+        return '\n'.join(lines)
+
+
+    def close(self):
+        """Closes the output file, if any."""
+
+        if self.output_file is not None:
+            self.output_file.close()
+            self.output_file = None
@@ -0,0 +1,81 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that frames are profiled and their timings exported properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import json
+import os
+import tempfile
+
+from engine import load_level, step, MOVE_RIGHT
+from profiler import FrameProfiler, PHASES
+
+
+class FakeClock:
+    """A clock which only moves forward when told to."""
+
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+with tempfile.TemporaryDirectory() as directory:
+    for file_name in ['frames.csv', 'frames.jsonl']:
+        # Time 100 frames whose physics take 1 to 100 ms, in a window of 50.
+        clock = FakeClock()
+        output_file_name = os.path.join(directory, file_name)
+        profiler = FrameProfiler(window_frames=50,
+                                 output_file_name=output_file_name,
+                                 clock=clock)
+        assert profiler.statistics('physics') is None
+        for frame in range(1, 101):
+            profiler.start_frame()
+            profiler.add('physics', frame / 1000)
+            profiler.add_tick()
+            clock.time += frame / 1000
+            profiler.end_frame()
+        profiler.close()
+
+        # The statistics should only cover the most recent frames.
+        minimum, average, percentile = profiler.statistics('physics')
+        assert minimum == 0.051
+        assert abs(average - 0.0755) < 1e-9
+        assert percentile == 0.1
+        assert profiler.statistics('hud') == (0, 0, 0)
+        assert abs(profiler.statistics('total')[2] - 0.1) < 1e-9
+        assert 'PHYSICS  51.00 / 75.50 / 100.00' in profiler.summary()
+
+        # Every frame should be written to the file.
+        with open(output_file_name) as output_file:
+            lines = output_file.read().splitlines()
+        if file_name.endswith('.csv'):
+            assert lines[0] == ','.join(['frame', 'ticks'] + PHASES +
+                                        ['total'])
+            assert len(lines) == 101
+            assert lines[1].split(',')[:3] == ['1', '1', '0.001']
+        else:
+            assert len(lines) == 100
+            assert json.loads(lines[-1])['physics'] == 0.1
+            assert json.loads(lines[-1])['ticks'] == 1
+
+# Stepping with a profiler should time physics and collisions without changing
+# the simulation.
+profiled_level = load_level(1)
+level = load_level(1)
+profiler = FrameProfiler()
+profiler.start_frame()
+for tick in range(100):
+    step(profiled_level, MOVE_RIGHT, profiler)
+    step(level, MOVE_RIGHT)
+profiler.end_frame()
+assert profiled_level.snapshot() == level.snapshot()
+assert profiler.statistics('physics')[0] > 0
+assert profiler.statistics('collision')[0] > 0
@@ -0,0 +1,197 @@
+"""CS 108 A Final Project
+
+Part of the "Out of Sync" parallel-dimensional 2D platforming puzzle, supplying
+the RecordsStore class, which keeps every level's record of fewest attempts
+needed to beat it, and statistics of every attempt at each level, in a single
+SQLite database file beside the levels.
+
+Every record is read at once when the store is opened, so the level menu can
+show them without touching the disk. Changes are kept in memory and written
+together in a single transaction by flush (which the game calls when a level
+is closed), so a crash never leaves a record half written.
+
+The first time a store is opened in a directory, the records of the old
+'min_attempts#.txt' files found there (one per level, each holding a number or
+nothing) are copied into it; those files are not used afterwards.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import os
+import re
+import sqlite3
+import time
+
+# The name of the records database file beside the levels.
+RECORDS_FILE_NAME = 'records.db'
+
+# The version of the database's tables, stored as its user_version; databases
+# of older versions are upgraded when opened.
+SCHEMA_VERSION = 1
+
+
+def legacy_records(directory):
+    """Returns a dictionary mapping level IDs (ints) to the records (ints)
+       held by the old 'min_attempts#.txt' files in the received directory;
+       empty files and files not holding a number are left out."""
+
+    records = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            match = re.fullmatch(r'min_attempts(\d+)\.txt', entry.name)
+            if match:
+                with open(entry.path) as min_attempts:
+                    score = min_attempts.readline().strip()
+                if score.isdigit() and int(score) > 0:
+                    records[int(match.group(1))] = int(score)
+
+    return records
+
+
+def read_records(directory, file_name=RECORDS_FILE_NAME):
+    """Returns a dictionary mapping level IDs (ints) to the records (ints) in
+       the records database in the received directory, without creating or
+       changing it; returns an empty dictionary if there is no database."""
+
+    path = os.path.join(directory, file_name)
+    if not os.path.exists(path):
+        return {}
+
+    connection = sqlite3.connect('file:' + path + '?mode=ro', uri=True)
+    try:
+        return dict(connection.execute(
+            'SELECT level_id, fewest_attempts FROM records'))
+    except sqlite3.OperationalError:
+        # The database does not have its tables yet.
+        return {}
+    finally:
+        connection.close()
+
+
+class RecordsStore:
+    """Represents the records and attempt statistics of every level."""
+
+    def __init__(self, directory='.', file_name=RECORDS_FILE_NAME):
+        """Receives the directory the levels are installed in and the name of
+           the database file in it, which is created if needed."""
+
+        self.directory = directory
+        self.connection = sqlite3.connect(os.path.join(directory, file_name))
+        self.upgrade()
+
+        # Maps each level ID (int) to its record (int).
+        self.level_records = dict(self.connection.execute(
+            'SELECT level_id, fewest_attempts FROM records'))
+
+        # The records and attempts not yet written to the database.
+        self.changed_records = {}
+        self.new_attempts = []
+
+
+    def upgrade(self):
+        """Creates the database's tables, copying in the records of the old
+           record files, if it has not been done."""
+
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS records ('
+                'level_id INTEGER PRIMARY KEY, '
+                'fewest_attempts INTEGER NOT NULL)')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS attempts ('
+                'level_id INTEGER NOT NULL, '
+                'ticks INTEGER NOT NULL, '
+                'beaten INTEGER NOT NULL, '
+                'finished_at REAL NOT NULL)')
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS attempts_by_level '
+                'ON attempts (level_id)')
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO records VALUES (?, ?)',
+                legacy_records(self.directory).items())
+            self.connection.execute('PRAGMA user_version = ' +
+                                    str(SCHEMA_VERSION))
+
+
+    def records(self):
+        """Returns a dictionary mapping the ID (int) of every level with a
+           record to its record (int)."""
+
+        return self.level_records
+
+
+    def record(self, level_id):
+        """Returns the record (int) of the level of the received ID (int), or
+           None if it has none yet."""
+
+        return self.level_records.get(level_id)
+
+
+    def submit_record(self, level_id, num_attempts):
+        """Makes the received number of attempts (int) the record of the level
+           of the received ID (int) if it beats the current one, and returns
+           whether or not it did."""
+
+        record = self.level_records.get(level_id)
+        if record is not None and record <= num_attempts:
+            return False
+
+        self.level_records[level_id] = num_attempts
+        self.changed_records[level_id] = num_attempts
+        return True
+
+
+    def add_attempt(self, level_id, ticks, beaten):
+        """Adds an attempt at the level of the received ID (int) lasting the
+           received number of ticks (int), which either beat the level or
+           ended in death."""
+
+        self.new_attempts.append((level_id, ticks, int(beaten), time.time()))
+
+
+    def attempt_stats(self, level_id):
+        """Returns a dictionary of the statistics of the attempts at the level
+           of the received ID (int): the number of attempts ('attempts'), how
+           many beat it ('beaten'), and their average length in ticks
+           ('average_ticks', None if there are no attempts)."""
+
+        self.flush()
+        attempts, beaten, average_ticks = self.connection.execute(
+            'SELECT COUNT(*), TOTAL(beaten), AVG(ticks) FROM attempts '
+            'WHERE level_id = ?', (level_id,)).fetchone()
+
+        return dict(attempts=attempts, beaten=int(beaten),
+                    average_ticks=average_ticks)
+
+
+    def flush(self):
+        """Writes every changed record and new attempt to the database in a
+           single transaction."""
+
+        if not self.changed_records and not self.new_attempts:
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO records VALUES (?, ?)',
+                self.changed_records.items())
+            self.connection.executemany(
+                'INSERT INTO attempts VALUES (?, ?, ?, ?)', self.new_attempts)
+
+        self.changed_records = {}
+        self.new_attempts = []
+
+
+    def close(self):
+        """Writes any changes and closes the database."""
+
+        self.flush()
+        self.connection.close()
@@ -0,0 +1,57 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that level records and attempt statistics are stored properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import os
+import tempfile
+
+from records import RecordsStore, legacy_records, read_records
+
+with tempfile.TemporaryDirectory() as directory:
+    # Old record files holding numbers should be copied into a new store;
+    # empty and corrupt ones should be skipped.
+    for level_id, score in [(1, '4\n'), (2, ''), (3, 'many'), (12, '9')]:
+        with open(os.path.join(directory, 'min_attempts' + str(level_id) +
+                               '.txt'), 'w') as min_attempts:
+            min_attempts.write(score)
+    assert legacy_records(directory) == {1: 4, 12: 9}
+    assert read_records(directory) == {}
+
+    store = RecordsStore(directory)
+    assert store.records() == {1: 4, 12: 9}
+    assert store.record(2) is None
+
+    # Only lower attempt counts should become records.
+    assert not store.submit_record(1, 5)
+    assert store.submit_record(1, 3)
+    assert store.submit_record(2, 7)
+    assert store.record(1) == 3
+
+    # Changes should only be written when flushed.
+    assert read_records(directory) == {1: 4, 12: 9}
+    store.add_attempt(2, 100, False)
+    store.add_attempt(2, 300, True)
+    store.flush()
+    assert read_records(directory) == {1: 3, 2: 7, 12: 9}
+    assert store.attempt_stats(2) == dict(attempts=2, beaten=1,
+                                          average_ticks=200)
+    assert store.attempt_stats(1) == dict(attempts=0, beaten=0,
+                                          average_ticks=None)
+    store.add_attempt(1, 50, False)
+    store.close()
+
+    # Reopening the store should keep its records and statistics, without
+    # copying the old record files in again.
+    with open(os.path.join(directory, 'min_attempts1.txt'), 'w') as min_attempts:
+        min_attempts.write('1')
+    store = RecordsStore(directory)
+    assert store.records() == {1: 3, 2: 7, 12: 9}
+    assert store.attempt_stats(1)['attempts'] == 1
+    store.close()
@@ -0,0 +1,100 @@
+"""CS 108 A Final Project
+
+Part of the "Out of Sync" parallel-dimensional 2D platforming puzzle, supplying
+the HudText class, which updates a GuiZero Text widget only when the value it
+shows changes, and the RenderScheduler class, which decides which layouts to
+redraw each frame.
+
+Every change to a Tk widget or canvas costs a Tk call, even when it leaves the
+window looking the same. A RenderScheduler only redraws layouts whose Drawings
+are visible and whose Avatars have changed (moved, or beaten or unbeaten their
+layouts) since they were last drawn. The hidden layout of a level keeps being
+simulated but is not drawn at all until it is shown, when render_layout brings
+it up to date in one step: its view jumps straight to its Avatar's current
+position, drawing only the chunks near it (see viewport).
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+
+class HudText:
+    """Represents a GuiZero Text widget showing a label followed by a value,
+       which is only updated when the value changes."""
+
+    def __init__(self, widget, label):
+        """Receives the Text widget to update and the label (str) to show
+           before its value; the widget should already show the label
+           alone."""
+
+        self.widget = widget
+        self.label = label
+        # The value the widget currently shows (None for none).
+        self.value = None
+
+
+    def show(self, value):
+        """Shows the received value (or none, if None) after the label, and
+           returns whether or not the widget had to be updated."""
+
+        if value == self.value:
+            return False
+
+        self.widget.value = self.label + ('' if value is None else str(value))
+        self.value = value
+
+        return True
+
+
+class RenderScheduler:
+    """Represents the record of what was last drawn of each layout of the open
+       level, deciding which layouts need drawing."""
+
+    def __init__(self):
+        """Initializes an empty record of drawn layouts."""
+
+        # The (x, y, beaten) state of each Layout's Avatar when it was last
+        # drawn, by Layout.
+        self.drawn_states = {}
+
+
+    def render(self, layouts):
+        """Draws each of the received Layouts which is visible and has changed
+           since it was last drawn, and returns the number of them drawn."""
+
+        num_drawn = 0
+        for layout in layouts:
+            if layout.drawing.visible and self.render_layout(layout):
+                num_drawn += 1
+
+        return num_drawn
+
+
+    def render_layout(self, layout):
+        """Brings the drawing of the received Layout up to date, scrolling it to
+           follow its Avatar and moving its Avatar's drawing (or removing it
+           once the layout is beaten), unless nothing has changed since it was
+           last drawn; returns whether or not it was drawn."""
+
+        avatar = layout.avatar
+        state = (avatar.x, avatar.y, layout.beaten)
+        if self.drawn_states.get(layout) == state:
+            return False
+
+        layout.update_view()
+        if not layout.beaten:
+            layout.update_avatar()
+        else:
+            layout.clear_avatar()
+        self.drawn_states[layout] = state
+
+        return True
+
+
+    def forget(self):
+        """Forgets every drawn layout (for when the level is closed)."""
+
+        self.drawn_states.clear()
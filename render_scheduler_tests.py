@@ -0,0 +1,98 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that only changed widgets and visible layouts are redrawn.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+from engine import JUMP, NO_INPUT, load_level, step
+from render_scheduler import HudText, RenderScheduler
+
+
+class CountingText:
+    """A stand-in for a GuiZero Text widget which counts its updates."""
+
+    def __init__(self, text):
+        self._value = text
+        self.num_updates = 0
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, text):
+        self._value = text
+        self.num_updates += 1
+
+
+class CountingDrawing:
+    """A stand-in for a GuiZero Drawing which counts the canvas calls made on
+       it."""
+
+    def __init__(self, visible):
+        self.tk = self
+        self.visible = visible
+        self.num_calls = 0
+
+    def count_call(self, *args, **kwargs):
+        self.num_calls += 1
+        return self.num_calls
+
+    (rectangle, triangle, oval, line, image, delete, coords, configure,
+     xview_moveto, yview_moveto, tag_raise) = [count_call] * 11
+
+
+# A HUD widget should only be updated when its value changes.
+death_score = CountingText('DEATH COUNT\n')
+death_hud = HudText(death_score, 'DEATH COUNT\n')
+assert not death_hud.show(None)
+assert death_hud.show(0)
+assert not death_hud.show(0)
+assert death_hud.show(2)
+assert death_score.value == 'DEATH COUNT\n2'
+assert death_hud.show(None)
+assert death_score.value == 'DEATH COUNT\n'
+assert death_score.num_updates == 3
+
+# Only the visible layout should be drawn, and only when it has changed.
+level = load_level(1)
+main_layout, alt_layout = level.layouts
+main_layout.drawing = CountingDrawing(visible=True)
+alt_layout.drawing = CountingDrawing(visible=False)
+for layout in level.layouts:
+    layout.draw()
+scheduler = RenderScheduler()
+assert scheduler.render(level.layouts) == 1
+assert scheduler.render(level.layouts) == 0
+
+alt_calls = alt_layout.drawing.num_calls
+for tick in range(20):
+    step(level, JUMP)
+    scheduler.render(level.layouts)
+assert alt_layout.drawing.num_calls == alt_calls
+assert alt_layout.avatar_graphic_position != (alt_layout.avatar.x,
+                                              alt_layout.avatar.y)
+
+# Once shown, the hidden layout should be brought up to date in one step.
+alt_layout.drawing.visible = True
+assert scheduler.render_layout(alt_layout)
+assert alt_layout.avatar_graphic_position == (alt_layout.avatar.x,
+                                              alt_layout.avatar.y)
+assert not scheduler.render_layout(alt_layout)
+
+# Standing still should need no drawing, until the scheduler is reset.
+for tick in range(100):
+    step(level, NO_INPUT)
+scheduler.render(level.layouts)
+num_calls = main_layout.drawing.num_calls + alt_layout.drawing.num_calls
+step(level, NO_INPUT)
+assert scheduler.render(level.layouts) == 0
+assert main_layout.drawing.num_calls + alt_layout.drawing.num_calls == \
+    num_calls
+scheduler.forget()
+assert scheduler.render(level.layouts) == 2
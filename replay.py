@@ -0,0 +1,243 @@
+"""CS 108 A Final Project
+
+Part of the "Out of Sync" parallel-dimensional 2D platforming puzzle, supplying
+the InputRecorder class, which records a level attempt tick by tick (the
+movement input flags held during each tick, and the ticks at which the player
+switched to the next layout), and the replay function, which
+feeds a recording back through the engine without any GuiZero widgets, as fast
+as the CPU allows.
+
+Since the engine is deterministic, replaying a recording ends in exactly the
+same state as the attempt it was recorded from; each recording also stores the
+final number of deaths and Avatar states so replays can be checked against it.
+Recordings are saved as small JSON files, with the inputs run-length encoded as
+[input flags, number of ticks] pairs.
+
+Run this file to replay recordings from the command line and measure the tick
+throughput, e.g. 'python replay.py recordings/*.json' (the game saves each
+attempt there when run with 'python gui.py --record').
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import json
+import os
+import sys
+from time import perf_counter, strftime
+
+from engine import load_level, step
+from layout import OBJECT_STORAGE
+
+# The format version of recording files; files of other versions are refused.
+RECORDING_VERSION = 1
+
+
+class Recording:
+    """Represents a recorded level attempt: the level's ID, the input flags
+       held during each tick, the ticks at which the player switched layouts,
+       and how the attempt ended."""
+
+    def __init__(self, level_id, inputs=None, switches=None, num_deaths=None,
+                 beaten=None, final_snapshot=None):
+        """Receives the level ID (int), the list of input flags (ints) of each
+           tick, the list of ticks (ints) at which the layouts were switched,
+           and the number of deaths, whether the level was beaten, and the
+           LevelState snapshot (see engine) at the end of the attempt, if
+           known."""
+
+        self.level_id = level_id
+        self.inputs = inputs if inputs is not None else []
+        self.switches = switches if switches is not None else []
+        self.num_deaths = num_deaths
+        self.beaten = beaten
+        self.final_snapshot = final_snapshot
+
+
+    def to_dict(self):
+        """Returns a dictionary of the recording which can be stored as JSON,
+           with the inputs run-length encoded."""
+
+        runs = []
+        for inputs in self.inputs:
+            if runs and runs[-1][0] == inputs:
+                runs[-1][1] += 1
+            else:
+                runs.append([inputs, 1])
+
+        return dict(version=RECORDING_VERSION, level_id=self.level_id,
+                    inputs=runs, switches=self.switches,
+                    num_deaths=self.num_deaths, beaten=self.beaten,
+                    final_snapshot=self.final_snapshot)
+
+
+def recording_from_dict(recording_data):
+    """Returns a Recording from the received dictionary (see
+       Recording.to_dict); raises a ValueError for other format versions."""
+
+    if recording_data.get('version') != RECORDING_VERSION:
+        raise ValueError('unsupported recording version: ' +
+                         repr(recording_data.get('version')))
+
+    inputs = []
+    for run_inputs, num_ticks in recording_data['inputs']:
+        inputs.extend([run_inputs] * num_ticks)
+
+    final_snapshot = recording_data.get('final_snapshot')
+    if final_snapshot is not None:
+        final_snapshot = tuple(tuple(avatar_state)
+                               for avatar_state in final_snapshot)
+
+    return Recording(recording_data['level_id'], inputs,
+                     recording_data['switches'],
+                     recording_data.get('num_deaths'),
+                     recording_data.get('beaten'), final_snapshot)
+
+
+def save_recording(recording, file_name):
+    """Saves the received Recording as a JSON file of the received name."""
+
+    with open(file_name, 'w') as recording_file:
+        json.dump(recording.to_dict(), recording_file, separators=(',', ':'))
+
+
+def load_recording(file_name):
+    """Returns the Recording saved in the JSON file of the received name."""
+
+    with open(file_name) as recording_file:
+        return recording_from_dict(json.load(recording_file))
+
+
+class InputRecorder:
+    """Represents the recording of a level attempt in progress."""
+
+    def __init__(self, level_id):
+        """Receives the ID (int) of the level being attempted."""
+
+        self.recording = Recording(level_id)
+
+
+    def record_tick(self, inputs):
+        """Records the input flags (int) held during the next tick."""
+
+        self.recording.inputs.append(inputs)
+
+
+    def record_switch(self):
+        """Records a switch between layouts before the next tick."""
+
+        self.recording.switches.append(len(self.recording.inputs))
+
+
+    def rewind(self, num_ticks):
+        """Forgets everything recorded after the first num_ticks ticks (int),
+           for when the level is rewound to that tick (see rewind), so the
+           recording replays the attempt as it now stands."""
+
+        del self.recording.inputs[num_ticks:]
+        while (self.recording.switches and
+               self.recording.switches[-1] > num_ticks):
+            self.recording.switches.pop()
+
+
+    def finish(self, state):
+        """Records the end of the attempt in the received LevelState and
+           returns the finished Recording."""
+
+        self.recording.num_deaths = state.num_deaths
+        self.recording.beaten = state.beaten()
+        self.recording.final_snapshot = state.snapshot()
+
+        return self.recording
+
+
+    def save(self, directory):
+        """Saves the Recording in the received directory (creating it if
+           needed) under a name made of its level ID and the current time, and
+           returns the file name."""
+
+        os.makedirs(directory, exist_ok=True)
+        base_name = os.path.join(directory,
+                                 'level' + str(self.recording.level_id) + '-' +
+                                 strftime('%Y%m%d-%H%M%S'))
+        file_name = base_name + '.json'
+        # Never overwrite an attempt saved within the same second.
+        attempt = 1
+        while os.path.exists(file_name):
+            attempt += 1
+            file_name = base_name + '_' + str(attempt) + '.json'
+
+        save_recording(self.recording, file_name)
+        return file_name
+
+
+class ReplayResult:
+    """Represents the outcome of replaying a Recording: the final LevelState,
+       the number of ticks stepped, and the seconds spent stepping them."""
+
+    def __init__(self, recording, state, num_ticks, seconds):
+        """Receives the Recording replayed, the final LevelState, the number of
+           ticks stepped, and the seconds spent stepping them."""
+
+        self.recording = recording
+        self.state = state
+        self.num_ticks = num_ticks
+        self.seconds = seconds
+
+
+    def matches(self):
+        """Returns whether or not the replay ended the way the recorded attempt
+           did (as far as the recording knows how it ended)."""
+
+        recording = self.recording
+        return ((recording.num_deaths is None or
+                 recording.num_deaths == self.state.num_deaths) and
+                (recording.beaten is None or
+                 recording.beaten == self.state.beaten()) and
+                (recording.final_snapshot is None or
+                 recording.final_snapshot == self.state.snapshot()))
+
+
+def replay(recording, storage=OBJECT_STORAGE):
+    """Steps a new LevelState of the received Recording's level through its
+       recorded inputs, with the level's layouts storing their objects in the
+       received way (see Layout), stopping early if the level is beaten, and
+       returns a ReplayResult."""
+
+    state = load_level(recording.level_id, storage)
+
+    start_time = perf_counter()
+    for inputs in recording.inputs:
+        step(state, inputs)
+        if state.beaten():
+            break
+    seconds = perf_counter() - start_time
+
+    return ReplayResult(recording, state, state.tick, seconds)
+
+
+if __name__ == '__main__':
+    total_ticks = 0
+    total_seconds = 0
+    all_match = True
+
+    for file_name in sys.argv[1:]:
+        result = replay(load_recording(file_name))
+        total_ticks += result.num_ticks
+        total_seconds += result.seconds
+        all_match = all_match and result.matches()
+
+        print(file_name + ': level ' + str(result.recording.level_id) + ', ' +
+              str(result.num_ticks) + ' ticks, ' +
+              str(result.state.num_deaths) + ' deaths, ' +
+              ('beaten' if result.state.beaten() else 'not beaten') +
+              ('' if result.matches() else ' (DOES NOT MATCH RECORDING)'))
+
+    if total_seconds > 0:
+        print(str(total_ticks) + ' ticks in ' + str(round(total_seconds, 3)) +
+              ' s (' + str(round(total_ticks / total_seconds)) + ' ticks/s)')
+
+    sys.exit(0 if all_match else 1)
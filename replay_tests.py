@@ -0,0 +1,61 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that level attempts are recorded and replayed exactly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import os
+import random
+import tempfile
+
+from engine import load_level, step, MOVE_LEFT, MOVE_RIGHT, JUMP
+from layout import ARRAY_STORAGE, OBJECT_STORAGE
+from replay import InputRecorder, load_recording, replay
+
+INPUT_CHOICES = [0, MOVE_LEFT, MOVE_RIGHT, JUMP, MOVE_LEFT | JUMP,
+                 MOVE_RIGHT | JUMP]
+
+# Record an attempt of random inputs, held for a while as a player would, with
+# a few layout switches.
+generator = random.Random(12)
+level = load_level(2)
+recorder = InputRecorder(2)
+for tick in range(2000):
+    if tick % 20 == 0:
+        inputs = generator.choice(INPUT_CHOICES)
+    if tick % 500 == 0:
+        recorder.record_switch()
+    recorder.record_tick(inputs)
+    step(level, inputs)
+recording = recorder.finish(level)
+assert recording.switches == [0, 500, 1000, 1500]
+assert recording.num_deaths == level.num_deaths
+
+with tempfile.TemporaryDirectory() as directory:
+    # A saved recording should load with the same inputs, run-length encoded
+    # into far fewer entries than ticks.
+    file_name = recorder.save(directory)
+    assert os.path.basename(file_name).startswith('level2-')
+    assert recorder.save(directory) != file_name
+    loaded = load_recording(file_name)
+    assert loaded.inputs == recording.inputs
+    assert loaded.switches == recording.switches
+    assert len(recording.to_dict()['inputs']) <= 100
+
+# Replaying the recording should end in exactly the same state, with either
+# way of storing level objects.
+for storage in [OBJECT_STORAGE, ARRAY_STORAGE]:
+    result = replay(loaded, storage)
+    assert result.num_ticks == 2000
+    assert result.matches()
+    assert result.state.snapshot() == level.snapshot()
+
+# A recording changed along the way should not match.
+loaded.inputs[1000] = MOVE_LEFT if loaded.inputs[1000] != MOVE_LEFT else 0
+loaded.inputs[1001:] = [MOVE_RIGHT] * 999
+assert not replay(loaded).matches()
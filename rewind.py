@@ -0,0 +1,301 @@
+"""CS 108 A Final Project
+
+Part of the model for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the RewindBuffer class, which keeps the recent history of a
+LevelState (see engine) so play can be rewound to any recent tick, or
+restarted from the beginning, at once.
+
+The history is kept compactly in arrays allocated once, when the buffer is
+made, so recording a tick never allocates more memory however long the level
+is played; once full, the oldest ticks are forgotten. Most ticks are stored as
+the changes to each Avatar's position and vertical velocity since the tick
+before, in units of 1/DELTA_SCALE pixels (2 bytes each), with whether it is in
+the air and whether its layout is beaten. Every KEYFRAME_INTERVAL ticks, and
+whenever a change can not be stored exactly that way (e.g. respawning far
+away), the full state is stored instead as a keyframe, so restoring a tick
+only needs to add up the changes since the keyframe before it.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+from array import array
+
+# The number of ticks of history kept by default (five minutes at 100 ticks
+# per second).
+HISTORY_TICKS = 30000
+
+# The largest number of ticks between keyframes.
+KEYFRAME_INTERVAL = 100
+
+# The number of units per pixel the changes between ticks are stored in.
+DELTA_SCALE = 2
+
+# The smallest and largest changes which can be stored (in 2-byte ints).
+MIN_DELTA = -2 ** 15
+MAX_DELTA = 2 ** 15 - 1
+
+# The flags stored for each Avatar every tick.
+IN_AIR_FLAG = 1
+BEATEN_FLAG = 2
+
+# The number of values stored per Avatar each tick: the changes to its x, y,
+# and vertical velocity, and its flags.
+TICK_VALUES = 4
+
+# The number of values stored per Avatar in a keyframe: its x, y, and vertical
+# velocity.
+KEYFRAME_VALUES = 3
+
+
+class RewindBuffer:
+    """Represents the recent history of a LevelState, one entry per tick,
+       stored in a fixed amount of memory."""
+
+    def __init__(self, state, capacity=HISTORY_TICKS,
+                 keyframe_interval=KEYFRAME_INTERVAL):
+        """Receives the LevelState to keep the history of, which is recorded
+           as its first tick and kept as the state restarting returns to, the
+           largest number of ticks to keep, and the largest number of ticks
+           between keyframes."""
+
+        if capacity < 1 or keyframe_interval < 1:
+            raise ValueError('capacity and keyframe_interval must be positive')
+
+        self.num_layouts = len(state.layouts)
+        self.capacity = capacity
+        self.keyframe_interval = keyframe_interval
+
+        # The values stored for each tick, and the number of deaths added
+        # during it, by slot; each tick takes the slot after the one before,
+        # starting over from the first slot after the last.
+        self.tick_size = TICK_VALUES * self.num_layouts + 1
+        self.ticks = array('h', [0]) * (capacity * self.tick_size)
+        # The index of the keyframe of each slot's tick, or -1 for ticks stored
+        # as changes.
+        self.slot_keyframes = array('i', [-1]) * capacity
+
+        # Room for a keyframe per interval, and as many again for keyframes
+        # taken early. The keyframes take turns in the same way as the slots.
+        self.keyframe_size = KEYFRAME_VALUES * self.num_layouts + 1
+        self.num_keyframes = 2 * (capacity // keyframe_interval + 1)
+        self.keyframes = array('d', [0.0]) * (self.num_keyframes *
+                                              self.keyframe_size)
+        self.keyframe_ticks = array('q', [-1]) * self.num_keyframes
+        self.next_keyframe = 0
+
+        # The full values (see keyframes) of the newest tick recorded, from
+        # which the next tick's changes are measured, and space to work out
+        # the values of a tick being recorded or restored.
+        self.newest_values = array('d', [0.0]) * self.keyframe_size
+        self.values = array('d', [0.0]) * self.keyframe_size
+
+        # The slot and tick number of the oldest tick kept, the number of ticks
+        # kept, and the number recorded since the last keyframe.
+        self.first_slot = 0
+        self.first_tick = 0
+        self.length = 0
+        self.ticks_since_keyframe = 0
+
+        # The state restarting returns to.
+        self.origin = (state.snapshot(), state.num_deaths, state.tick)
+        self.record(state)
+
+
+    def oldest_tick(self):
+        """Returns the number (int) of the oldest tick kept."""
+
+        return self.first_tick
+
+
+    def newest_tick(self):
+        """Returns the number (int) of the newest tick kept."""
+
+        return self.first_tick + self.length - 1
+
+
+    def clear(self):
+        """Forgets every tick kept."""
+
+        self.length = 0
+
+
+    def record(self, state):
+        """Records the received LevelState as the tick after the newest one
+           kept; if it is not (e.g. it was changed some other way), the ticks
+           kept so far are forgotten first."""
+
+        if self.length and state.tick != self.newest_tick() + 1:
+            self.clear()
+
+        # Make room for the tick, forgetting the oldest ticks if needed.
+        if self.length == self.capacity:
+            self.drop_oldest()
+
+        values = self.values
+        index = 0
+        for layout in state.layouts:
+            avatar = layout.avatar
+            values[index] = avatar.x
+            values[index + 1] = avatar.y
+            values[index + 2] = avatar.y_vel
+            index += KEYFRAME_VALUES
+        values[index] = state.num_deaths
+
+        slot = (self.first_slot + self.length) % self.capacity
+        if self.length == 0:
+            self.first_slot = slot
+            self.first_tick = state.tick
+        self.length += 1
+
+        start = slot * self.tick_size
+        if (self.length == 1 or
+            self.ticks_since_keyframe + 1 >= self.keyframe_interval or
+            not self.encode_changes(start)):
+            # Mark the slot as a keyframe first, so forgetting the oldest
+            # ticks to make room for the keyframe stops at it.
+            self.slot_keyframes[slot] = self.next_keyframe
+            self.store_keyframe(state.tick)
+            self.ticks_since_keyframe = 0
+        else:
+            self.slot_keyframes[slot] = -1
+            self.ticks_since_keyframe += 1
+
+        # The flags are stored for every tick, keyframe or not.
+        index = start
+        for layout in state.layouts:
+            self.ticks[index + 3] = (
+                (IN_AIR_FLAG if layout.avatar.in_air else 0) |
+                (BEATEN_FLAG if layout.beaten else 0))
+            index += TICK_VALUES
+
+        self.newest_values[:] = values
+
+
+    def encode_changes(self, start):
+        """Stores the changes from the newest tick's values to the values being
+           recorded in the tick values from the received index on, and returns
+           whether or not every change could be stored exactly."""
+
+        values = self.values
+        newest_values = self.newest_values
+        ticks = self.ticks
+
+        for layout_index in range(self.num_layouts):
+            value_index = layout_index * KEYFRAME_VALUES
+            tick_index = start + layout_index * TICK_VALUES
+            for offset in range(KEYFRAME_VALUES):
+                newest_value = newest_values[value_index + offset]
+                value = values[value_index + offset]
+                scaled_change = round((value - newest_value) * DELTA_SCALE)
+                if (not MIN_DELTA <= scaled_change <= MAX_DELTA or
+                    newest_value + scaled_change / DELTA_SCALE != value):
+                    return False
+                ticks[tick_index + offset] = scaled_change
+
+        deaths_change = int(values[-1] - newest_values[-1])
+        if not 0 <= deaths_change <= MAX_DELTA:
+            return False
+        ticks[start + self.tick_size - 1] = deaths_change
+
+        return True
+
+
+    def store_keyframe(self, tick):
+        """Stores the values being recorded as the keyframe of the received
+           tick, forgetting the oldest ticks if they still need the keyframe
+           it replaces."""
+
+        keyframe = self.next_keyframe
+        self.next_keyframe = (keyframe + 1) % self.num_keyframes
+
+        replaced_tick = self.keyframe_ticks[keyframe]
+        while self.length > 1 and self.first_tick <= replaced_tick:
+            self.drop_oldest()
+
+        start = keyframe * self.keyframe_size
+        self.keyframes[start:start + self.keyframe_size] = self.values
+        self.keyframe_ticks[keyframe] = tick
+
+
+    def drop_oldest(self):
+        """Forgets the oldest tick kept, and the ticks after it up to the next
+           keyframe, which can not be restored without it."""
+
+        while True:
+            self.first_slot = (self.first_slot + 1) % self.capacity
+            self.first_tick += 1
+            self.length -= 1
+            if self.length == 0 or self.slot_keyframes[self.first_slot] != -1:
+                return
+
+
+    def rewind(self, state, tick):
+        """Returns the received LevelState to the kept tick nearest the
+           received tick (int), forgetting the ticks after it, and returns the
+           number of the tick it was returned to."""
+
+        tick = min(max(tick, self.oldest_tick()), self.newest_tick())
+        offset = tick - self.first_tick
+        slot = (self.first_slot + offset) % self.capacity
+
+        # Find the keyframe at or before the tick, and add up the changes
+        # since it.
+        keyframe_slot = slot
+        while self.slot_keyframes[keyframe_slot] == -1:
+            keyframe_slot = (keyframe_slot - 1) % self.capacity
+        keyframe = self.slot_keyframes[keyframe_slot]
+        start = keyframe * self.keyframe_size
+        values = self.values
+        values[:] = self.keyframes[start:start + self.keyframe_size]
+
+        ticks = self.ticks
+        while keyframe_slot != slot:
+            keyframe_slot = (keyframe_slot + 1) % self.capacity
+            tick_start = keyframe_slot * self.tick_size
+            for layout_index in range(self.num_layouts):
+                value_index = layout_index * KEYFRAME_VALUES
+                tick_index = tick_start + layout_index * TICK_VALUES
+                for change in range(KEYFRAME_VALUES):
+                    values[value_index + change] += (
+                        ticks[tick_index + change] / DELTA_SCALE)
+            values[-1] += ticks[tick_start + self.tick_size - 1]
+
+        tick_index = slot * self.tick_size
+        value_index = 0
+        for layout in state.layouts:
+            avatar = layout.avatar
+            avatar.x = values[value_index]
+            avatar.y = values[value_index + 1]
+            avatar.y_vel = values[value_index + 2]
+            avatar.x_vel = 0
+            flags = ticks[tick_index + 3]
+            avatar.in_air = bool(flags & IN_AIR_FLAG)
+            layout.beaten = bool(flags & BEATEN_FLAG)
+            value_index += KEYFRAME_VALUES
+            tick_index += TICK_VALUES
+        state.num_deaths = int(values[-1])
+        state.tick = tick
+
+        # Later ticks will be recorded from this one.
+        self.length = offset + 1
+        self.newest_values[:] = values
+        self.ticks_since_keyframe = tick - self.keyframe_ticks[keyframe]
+
+        return tick
+
+
+    def restart(self, state):
+        """Returns the received LevelState to the state it was in when the
+           buffer was made, forgetting every tick kept."""
+
+        snapshot, num_deaths, tick = self.origin
+        state.restore(snapshot)
+        state.num_deaths = num_deaths
+        state.tick = tick
+
+        self.clear()
+        self.record(state)
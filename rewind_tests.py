@@ -0,0 +1,85 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that levels are rewound and restarted exactly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import random
+
+from engine import (JUMP, MOVE_LEFT, MOVE_RIGHT, SWEPT_COLLISION, load_level,
+                    step)
+from replay import InputRecorder, replay
+from rewind import RewindBuffer
+
+INPUT_CHOICES = [0, MOVE_LEFT, MOVE_RIGHT, JUMP, MOVE_LEFT | JUMP,
+                 MOVE_RIGHT | JUMP]
+
+# Rewinding should return the level to exactly the state it was in at any
+# kept tick, through deaths and in either collision mode.
+for level_id, collision in [(1, 'classic'), (4, SWEPT_COLLISION)]:
+    generator = random.Random(level_id)
+    level = load_level(level_id, collision=collision)
+    buffer = RewindBuffer(level)
+    history = [(level.snapshot(), level.num_deaths)]
+    for tick in range(1500):
+        if tick % 20 == 0:
+            inputs = generator.choice(INPUT_CHOICES)
+        step(level, inputs)
+        buffer.record(level)
+        history.append((level.snapshot(), level.num_deaths))
+    assert level.num_deaths > 0
+    assert (buffer.oldest_tick(), buffer.newest_tick()) == (0, 1500)
+
+    for tick in [1499, 1234, 700, 3, 0]:
+        assert buffer.rewind(level, tick) == tick == level.tick
+        assert (level.snapshot(), level.num_deaths) == history[tick]
+        assert buffer.newest_tick() == tick
+
+    # Play should carry on from a rewound tick the way it did the first time.
+    step(level, MOVE_RIGHT)
+    buffer.record(level)
+    assert buffer.newest_tick() == 1
+
+# A full buffer should forget its oldest ticks, a keyframe span at a time,
+# without growing.
+level = load_level(2)
+buffer = RewindBuffer(level, capacity=50, keyframe_interval=10)
+num_values = len(buffer.ticks)
+for tick in range(1000):
+    step(level, [MOVE_RIGHT, MOVE_RIGHT | JUMP, MOVE_LEFT][tick//40 % 3])
+    buffer.record(level)
+    assert buffer.newest_tick() - buffer.oldest_tick() < 50
+assert buffer.oldest_tick() >= 1000 - 50
+assert len(buffer.ticks) == num_values
+assert buffer.rewind(level, 0) == buffer.oldest_tick()
+
+# Restarting should return the level to its beginning, forgetting the rest.
+buffer.restart(level)
+assert level.tick == 0 and level.num_deaths == 0
+assert level.snapshot() == load_level(2).snapshot()
+assert buffer.oldest_tick() == buffer.newest_tick() == 0
+
+# A recording rewound along with the level should still replay exactly.
+level = load_level(1)
+buffer = RewindBuffer(level)
+recorder = InputRecorder(1)
+for tick in range(400):
+    if tick == 300:
+        recorder.record_switch()
+    recorder.record_tick(MOVE_RIGHT)
+    step(level, MOVE_RIGHT)
+    buffer.record(level)
+recorder.rewind(buffer.rewind(level, 250))
+assert recorder.recording.switches == []
+for tick in range(50):
+    recorder.record_tick(JUMP)
+    step(level, JUMP)
+    buffer.record(level)
+result = replay(recorder.finish(level))
+assert result.num_ticks == 300
+assert result.matches()
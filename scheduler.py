@@ -0,0 +1,91 @@
+"""CS 108 A Final Project
+
+Part of the "Out of Sync" parallel-dimensional 2D platforming puzzle, supplying
+the FixedTimestep class which decides how many simulation ticks to run and
+whether to render a frame each time the GUI's timer fires, so the game runs at
+the same speed no matter how late the timer is.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+from time import perf_counter
+
+
+class FixedTimestep:
+    """Represents a fixed-timestep schedule of simulation ticks and rendered
+       frames, measured against a real-time clock."""
+
+    def __init__(self, tick_rate=100, frame_rate=60, max_catch_up_ticks=10,
+                 clock=perf_counter):
+        """Receives the number of simulation ticks to run per second, the
+           maximum number of frames to render per second, the maximum number
+           of ticks to run in a single timer callback when catching up after a
+           delay, and a function returning the current time in seconds."""
+
+        self.tick_interval = 1 / tick_rate
+        self.frame_interval = 1 / frame_rate
+        self.max_catch_up_ticks = max_catch_up_ticks
+        self.clock = clock
+
+        self.last_time = None
+        self.last_frame_time = None
+        # Real time which has passed but has not yet been simulated.
+        self.unsimulated_time = 0
+
+
+    def start(self):
+        """Starts (or restarts) the schedule from the current time."""
+
+        self.last_time = self.clock()
+        self.last_frame_time = None
+        self.unsimulated_time = 0
+
+
+    def callback_interval(self):
+        """Returns how often, in whole milliseconds, the GUI's timer should
+           call back so that no tick or frame is left waiting long."""
+
+        return max(1, int(1000 * min(self.tick_interval,
+                                     self.frame_interval) / 2))
+
+
+    def ticks_due(self):
+        """Returns the number of simulation ticks (0 or more) needed to catch
+           the simulation up to the current time, up to the catch-up maximum;
+           time beyond the maximum is dropped so a long stall slows the game
+           down briefly rather than freezing it while it catches up."""
+
+        if self.last_time is None:
+            self.start()
+
+        now = self.clock()
+        self.unsimulated_time += now - self.last_time
+        self.last_time = now
+
+        num_ticks = int(self.unsimulated_time // self.tick_interval)
+
+        if num_ticks > self.max_catch_up_ticks:
+            num_ticks = self.max_catch_up_ticks
+            self.unsimulated_time = 0
+        else:
+            self.unsimulated_time -= num_ticks * self.tick_interval
+
+        return num_ticks
+
+
+    def frame_due(self):
+        """Returns whether or not a frame should be rendered now, which is at
+           most once per frame interval."""
+
+        now = self.clock()
+
+        if (self.last_frame_time is not None and
+            now - self.last_frame_time < self.frame_interval):
+            return False
+
+        self.last_frame_time = now
+        return True
@@ -0,0 +1,49 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that simulation ticks and frames are scheduled properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+from scheduler import FixedTimestep
+
+# A clock whose current time (in 1/128ths of a second, which floats store
+# exactly) is set by the tests.
+now = [0]
+def clock():
+    return now[0] / 128
+
+timestep = FixedTimestep(tick_rate=64, frame_rate=32, max_catch_up_ticks=5,
+                         clock=clock)
+timestep.start()
+
+# No ticks should be due before a tick interval has passed.
+now[0] = 1
+assert timestep.ticks_due() == 0
+
+# Leftover time should carry over to the next call.
+now[0] = 5
+assert timestep.ticks_due() == 2
+now[0] = 6
+assert timestep.ticks_due() == 1
+
+# After a long stall, only the catch-up maximum of ticks should be run, and the
+# rest of the stalled time should be dropped.
+now[0] = 134
+assert timestep.ticks_due() == 5
+now[0] = 135
+assert timestep.ticks_due() == 0
+
+# Frames should be rendered at most once per frame interval.
+assert timestep.frame_due()
+now[0] = 137
+assert not timestep.frame_due()
+now[0] = 139
+assert timestep.frame_due()
+
+# The GUI timer should fire at least twice per tick.
+assert timestep.callback_interval() == 7
@@ -0,0 +1,355 @@
+"""CS 108 A Final Project
+
+Part of the "Out of Sync" parallel-dimensional 2D platforming puzzle, supplying
+the solve function, which checks whether a level can be beaten by searching
+every combination of Avatar states its layouts can reach under the same inputs.
+
+Each layout is first explored on its own (a LayoutGraph), recording where its
+Avatar goes under each input and how many ticks it needs at least to reach an
+exit from each state. Since the layouts only affect each other when an Avatar
+dies and the level restarts, the combined (joint) states of the level can then
+be stepped with lookups into those graphs, and searched with A* using the
+slowest layout's ticks-to-exit as the estimate; the first solution found is a
+shortest one, and if the search runs out of joint states without beating the
+level, no solution exists.
+
+Run this file to solve levels from the command line, e.g.
+'python solver.py 1 2 3'.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import sys
+from collections import deque
+from heapq import heappush, heappop
+from time import perf_counter
+
+from engine import (load_level, step, LevelState, CLASSIC_COLLISION,
+                    NO_INPUT, MOVE_LEFT, MOVE_RIGHT, JUMP)
+from layout_stepper import LayoutStepper
+
+# Every distinct combination of held inputs; the jumping ones only differ from
+# the walking ones when some Avatar is on the ground.
+WALKING_INPUTS = [NO_INPUT, MOVE_LEFT, MOVE_RIGHT]
+JUMPING_INPUTS = [NO_INPUT | JUMP, MOVE_LEFT | JUMP, MOVE_RIGHT | JUMP]
+ALL_INPUTS = WALKING_INPUTS + JUMPING_INPUTS
+
+# The ticks-to-exit of states from which an exit can never be reached.
+UNREACHABLE = float('inf')
+
+
+class LayoutGraph:
+    """Represents every state a single Layout's Avatar can reach from its spawn
+       point, the state each input leads to from each of them, and the fewest
+       ticks needed to beat the layout from each of them."""
+
+    def __init__(self, layout, collision=CLASSIC_COLLISION):
+        """Receives a Layout and the collision mode (see engine) to simulate
+           it with, and explores every state its Avatar can reach. Leaves the
+           Layout's Avatar in an arbitrary state."""
+
+        self.state = LevelState([layout], collision)
+        # Classic collisions are stepped far faster without the engine's
+        # objects, with the same results (see layout_stepper).
+        if collision == CLASSIC_COLLISION:
+            self.stepper = LayoutStepper(layout)
+        else:
+            self.stepper = None
+
+        # Each state is given an ID: its index in these lists.
+        self.snapshots = []
+        self.ids = {}
+        # For each state, the IDs of the states reached by each of ALL_INPUTS
+        # and whether or not the Avatar died along the way.
+        self.successors = []
+        self.deaths = []
+
+        # Respawning keeps whether or not the Avatar is in the air, so there
+        # is a spawn state for each.
+        avatar = layout.avatar
+        self.spawn_ids = [self.state_id(((avatar.starting_x,
+                                          avatar.starting_y, 0, in_air,
+                                          False),))
+                          for in_air in (False, True)]
+
+        self.explore()
+        self.ticks_to_exit = self.measure_ticks_to_exit()
+
+        # The fewest ticks to beat the layout after being respawned, which
+        # bounds the ticks needed from any state when dying is an option.
+        self.spawn_ticks_to_exit = min(self.ticks_to_exit[spawn_id]
+                                       for spawn_id in self.spawn_ids)
+
+
+    def state_id(self, snapshot):
+        """Returns the ID of the state of the received one-layout snapshot,
+           giving it a new ID if it has not been seen before."""
+
+        if snapshot not in self.ids:
+            self.ids[snapshot] = len(self.snapshots)
+            self.snapshots.append(snapshot)
+            self.successors.append(None)
+            self.deaths.append(None)
+
+        return self.ids[snapshot]
+
+
+    def explore(self):
+        """Steps every reachable unbeaten state with each input, breadth-first
+           from the spawn states."""
+
+        unexplored = deque(self.spawn_ids)
+        while unexplored:
+            current_id = unexplored.popleft()
+            if (self.successors[current_id] is not None or
+                self.beaten(current_id)):
+                continue
+
+            successors = []
+            deaths = []
+            for inputs in ALL_INPUTS:
+                # Jumping does nothing in the air, so the jumping inputs lead
+                # where the walking ones do.
+                if inputs & JUMP and self.in_air(current_id):
+                    walking_index = ALL_INPUTS.index(inputs & ~JUMP)
+                    successors.append(successors[walking_index])
+                    deaths.append(deaths[walking_index])
+                    continue
+
+                following, died = self.step_snapshot(
+                    self.snapshots[current_id], inputs)
+                following_id = self.state_id(following)
+                successors.append(following_id)
+                deaths.append(died)
+                if self.successors[following_id] is None:
+                    unexplored.append(following_id)
+
+            self.successors[current_id] = successors
+            self.deaths[current_id] = deaths
+
+
+    def step_snapshot(self, snapshot, inputs):
+        """Returns the one-layout snapshot reached from the received one in
+           one tick of the received input flags, and whether or not the
+           Avatar died along the way."""
+
+        if self.stepper is not None:
+            avatar_state, died = self.stepper.step(snapshot[0], inputs)
+            return (avatar_state,), died
+
+        self.state.restore(snapshot)
+        self.state.num_deaths = 0
+        step(self.state, inputs)
+        return self.state.snapshot(), self.state.num_deaths > 0
+
+
+    def measure_ticks_to_exit(self):
+        """Returns a list of the fewest ticks needed to beat the layout from
+           each state (UNREACHABLE if it cannot be beaten), found by searching
+           backwards from the beaten states."""
+
+        predecessors = [[] for snapshot in self.snapshots]
+        for current_id, successors in enumerate(self.successors):
+            if successors is not None:
+                for following_id in set(successors):
+                    predecessors[following_id].append(current_id)
+
+        ticks_to_exit = [UNREACHABLE] * len(self.snapshots)
+        unexplored = deque()
+        for current_id in range(len(self.snapshots)):
+            if self.beaten(current_id):
+                ticks_to_exit[current_id] = 0
+                unexplored.append(current_id)
+
+        while unexplored:
+            current_id = unexplored.popleft()
+            for previous_id in predecessors[current_id]:
+                if ticks_to_exit[previous_id] == UNREACHABLE:
+                    ticks_to_exit[previous_id] = ticks_to_exit[current_id] + 1
+                    unexplored.append(previous_id)
+
+        return ticks_to_exit
+
+
+    def beaten(self, state_id):
+        """Returns whether or not the layout is beaten in the state of the
+           received ID."""
+
+        return self.snapshots[state_id][0][4]
+
+
+    def in_air(self, state_id):
+        """Returns whether or not the Avatar is in the air in the state of the
+           received ID."""
+
+        return self.snapshots[state_id][0][3]
+
+
+    def estimate(self, state_id):
+        """Returns a lower bound on the ticks needed to beat the layout from
+           the state of the received ID, allowing for the Avatar to be respawned
+           by a death in another layout."""
+
+        return min(self.ticks_to_exit[state_id], self.spawn_ticks_to_exit)
+
+
+class Solution:
+    """Represents the result of searching a level: whether it can be beaten,
+       a shortest list of per-tick input flags that beats it (or None), the
+       number of distinct joint states searched, and whether the search was
+       completed (so that an unsolvable result proves there is no solution)
+       rather than stopped early."""
+
+    def __init__(self, inputs, num_states, complete=True):
+        """Receives the winning list of input flags (or None if there is none),
+           the number of distinct joint states searched, and whether or not
+           the search was completed."""
+
+        self.inputs = inputs
+        self.solvable = inputs is not None
+        self.num_states = num_states
+        self.complete = complete
+
+
+def solve(state, max_states=None, graphs=None):
+    """Searches the received LevelState, from its spawn points, for a shortest
+       list of per-tick input flags (see engine) which beats every layout, and
+       returns a Solution. Stops early, returning an incomplete unsolvable
+       Solution, after finding max_states distinct joint states if max_states
+       is not None. Receives the LayoutGraphs of the LevelState's layouts if
+       they have already been built. Leaves the LevelState's Avatars in an
+       arbitrary state."""
+
+    if graphs is None:
+        graphs = [LayoutGraph(layout, state.collision)
+                  for layout in state.layouts]
+
+    # A joint state is a tuple of the state IDs of every layout.
+    start = tuple(graph.spawn_ids[False] for graph in graphs)
+
+    if estimate(graphs, start) == UNREACHABLE:
+        return Solution(None, 1)
+
+    # Maps every joint state found to the fewest ticks it was reached in, the
+    # joint state it was reached from that way, and the inputs which did it.
+    parents = {start: (0, None, None)}
+    # A* queue of (estimated total ticks, -ticks so far, joint state), which
+    # prefers deeper joint states among equally promising ones.
+    unexpanded = [(estimate(graphs, start), 0, start)]
+
+    while unexpanded:
+        total_estimate, negative_ticks, current = heappop(unexpanded)
+        ticks = -negative_ticks
+
+        # Skip queue entries made stale by a shorter route found later.
+        if parents[current][0] < ticks:
+            continue
+
+        if all(graph.beaten(state_id)
+               for graph, state_id in zip(graphs, current)):
+            return Solution(winning_inputs(parents, current), len(parents))
+
+        for input_index in joint_input_indexes(graphs, current):
+            following = joint_step(graphs, current, input_index)
+            following_estimate = estimate(graphs, following)
+            if following_estimate == UNREACHABLE:
+                continue
+
+            if following in parents and parents[following][0] <= ticks + 1:
+                continue
+            parents[following] = (ticks + 1, current, ALL_INPUTS[input_index])
+
+            if max_states is not None and len(parents) >= max_states:
+                return Solution(None, len(parents), complete=False)
+
+            heappush(unexpanded, (ticks + 1 + following_estimate, -ticks - 1,
+                                  following))
+
+    return Solution(None, len(parents))
+
+
+def joint_input_indexes(graphs, joint_state):
+    """Returns the indexes into ALL_INPUTS of the inputs worth trying from the
+       received joint state; jumping is skipped when every unbeaten Avatar is
+       already in the air."""
+
+    for graph, state_id in zip(graphs, joint_state):
+        if not graph.beaten(state_id) and not graph.in_air(state_id):
+            return range(len(ALL_INPUTS))
+
+    return range(len(WALKING_INPUTS))
+
+
+def joint_step(graphs, joint_state, input_index):
+    """Returns the joint state following the received one under the inputs of
+       the received index into ALL_INPUTS, stepping the layouts in order like
+       the engine does: when an Avatar dies, every other layout is respawned
+       (and unbeaten), and the layouts after it step from their spawn points."""
+
+    following = list(joint_state)
+
+    for layout_index, graph in enumerate(graphs):
+        state_id = following[layout_index]
+        if graph.beaten(state_id):
+            continue
+
+        following[layout_index] = graph.successors[state_id][input_index]
+
+        if graph.deaths[state_id][input_index]:
+            for other_index, other_graph in enumerate(graphs):
+                if other_index != layout_index:
+                    other_id = following[other_index]
+                    following[other_index] = \
+                        other_graph.spawn_ids[other_graph.in_air(other_id)]
+
+    return tuple(following)
+
+
+def estimate(graphs, joint_state):
+    """Returns a lower bound on the ticks needed to beat every layout from the
+       received joint state."""
+
+    return max(graph.estimate(state_id)
+               for graph, state_id in zip(graphs, joint_state))
+
+
+def winning_inputs(parents, final_state):
+    """Returns the list of input flags leading from the starting joint state to
+       the received final joint state, following the received parent links."""
+
+    inputs = []
+    ticks, previous_state, previous_inputs = parents[final_state]
+    while previous_state is not None:
+        inputs.append(previous_inputs)
+        ticks, previous_state, previous_inputs = parents[previous_state]
+
+    inputs.reverse()
+    return inputs
+
+
+def solve_level(level_id, max_states=None):
+    """Loads the level of the received level ID (int) and returns a Solution
+       for it (see solve)."""
+
+    return solve(load_level(level_id), max_states)
+
+
+if __name__ == '__main__':
+    for level_id in sys.argv[1:]:
+        start_time = perf_counter()
+        solution = solve_level(int(level_id))
+        elapsed_time = perf_counter() - start_time
+
+        if solution.solvable:
+            result = 'solvable in ' + str(len(solution.inputs)) + ' ticks'
+        elif solution.complete:
+            result = 'unsolvable'
+        else:
+            result = 'unknown (search stopped early)'
+        print('Level ' + level_id + ': ' + result + ' (' +
+              str(solution.num_states) + ' states, ' +
+              str(round(elapsed_time, 2)) + ' s)')
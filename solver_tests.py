@@ -0,0 +1,38 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that levels are solved properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+from engine import load_level, step
+from solver import solve_level
+
+# Level 1 should be solvable, and playing the solution's inputs should beat
+# both of its layouts without dying.
+solution = solve_level(1)
+assert solution.solvable
+assert len(solution.inputs) == 128
+level = load_level(1)
+for inputs in solution.inputs:
+    assert not level.beaten()
+    step(level, inputs)
+assert level.beaten()
+assert level.num_deaths == 0
+
+# Level 3 has no exits, so it should be found unsolvable without searching.
+solution = solve_level(3)
+assert not solution.solvable
+assert solution.inputs is None
+assert solution.complete
+assert solution.num_states == 1
+
+# A search cut off early should not claim to have found a solution.
+solution = solve_level(1, max_states=100)
+assert not solution.solvable
+assert not solution.complete
+assert solution.num_states == 100
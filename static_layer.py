@@ -0,0 +1,227 @@
+"""CS 108 A Final Project
+
+Part of the GUI view for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the render_chunk function, which rasterizes the blocks,
+spikes, and exits of a chunk of a layout (see viewport) into a single image, so
+each chunk is shown on the Drawing as one image item rather than an item for
+every shape.
+
+Rendered chunks are kept in memory and, given a cache directory, saved there as
+PNG files named after a hash of the chunk's contents, so reopening a level or
+switching dimensions does not render them again. Both caches are bounded: the
+memory cache keeps only the MEMORY_CACHE_CHUNKS images used most recently, and
+each cache directory keeps only the DISK_CACHE_CHUNKS images used most recently
+(by file modification time, which is updated whenever an image is loaded).
+
+Rendering needs the Pillow library (which GuiZero also uses for images, when
+installed); without it, available() returns False and chunks should be drawn
+shape by shape instead.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:
+    Image = None
+
+# The format version of rendered chunk images; bump it when the look of any
+# level object changes so that old cached images are not used.
+RENDER_VERSION = 1
+
+# The largest number of chunk images kept in memory: enough for every chunk
+# drawn around the largest view (see viewport), 7 chunks across by 6 down, of
+# two layouts, so switching dimensions never renders or loads chunks again.
+MEMORY_CACHE_CHUNKS = 2 * 7 * 6
+
+# The largest number of chunk images kept in each cache directory.
+DISK_CACHE_CHUNKS = 1000
+
+# Maps the hash of each chunk rendered to its image, least recently used
+# first.
+memory_cache = OrderedDict()
+
+
+def available():
+    """Returns whether or not chunks can be rendered to images."""
+
+    return Image is not None
+
+
+def render_chunk(level_objects, left, top, width, height, cache_directory=None):
+    """Returns an image of the received list of LevelGraphicsObjects covering
+       the received width and height (in pixels) of the layout, starting from
+       the received left and top coordinates, transparent where there are no
+       objects. Uses and fills the cache directory if one is received."""
+
+    key = chunk_key(level_objects, left, top, width, height)
+    image = memory_cache.get(key)
+    if image is not None:
+        # Chunks may be rendered on a worker thread (see level_preloader) and
+        # forgotten there at any moment.
+        try:
+            memory_cache.move_to_end(key)
+        except KeyError:
+            pass
+        return image
+
+    file_name = None
+    image = None
+    if cache_directory is not None:
+        file_name = os.path.join(cache_directory, 'chunk-' + key + '.png')
+        try:
+            image = Image.open(file_name)
+            image.load()
+            # Mark the image as recently used, so pruning keeps it.
+            os.utime(file_name)
+        except (OSError, ValueError):
+            image = None
+
+    if image is None:
+        image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+        image_drawing = ImageDrawing(image, left, top)
+        for level_object in level_objects:
+            level_object.draw(image_drawing)
+
+        if file_name is not None:
+            save_image(image, file_name)
+            prune_directory(cache_directory)
+
+    memory_cache[key] = image
+    while len(memory_cache) > MEMORY_CACHE_CHUNKS:
+        try:
+            memory_cache.popitem(last=False)
+        except KeyError:
+            break
+
+    return image
+
+
+def chunk_key(level_objects, left, top, width, height):
+    """Returns a hash (string) of everything that affects the image of the
+       received chunk."""
+
+    contents = [RENDER_VERSION, left, top, width, height]
+    for level_object in level_objects:
+        contents.append((type(level_object).__name__, level_object.x,
+                         level_object.y, level_object.size))
+
+    return hashlib.sha1(repr(contents).encode()).hexdigest()
+
+
+def save_image(image, file_name):
+    """Saves the received image as a PNG file, replacing any old one in a single
+       step; saving is skipped if the directory cannot be written to."""
+
+    try:
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        temporary_file_name = file_name + '.' + str(os.getpid()) + '.tmp'
+        image.save(temporary_file_name, format='PNG')
+        os.replace(temporary_file_name, file_name)
+    except OSError:
+        pass
+
+
+def prune_directory(cache_directory, max_chunks=None):
+    """Deletes the least recently used chunk images from the received cache
+       directory until at most max_chunks of them (DISK_CACHE_CHUNKS if None)
+       are left; images which cannot be deleted are left alone."""
+
+    if max_chunks is None:
+        max_chunks = DISK_CACHE_CHUNKS
+
+    try:
+        images = [(entry.stat().st_mtime_ns, entry.path)
+                  for entry in os.scandir(cache_directory)
+                  if entry.name.startswith('chunk-') and
+                  entry.name.endswith('.png')]
+    except OSError:
+        return
+    if len(images) <= max_chunks:
+        return
+
+    images.sort()
+    for modification_time, path in images[:len(images) - max_chunks]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def clear_cache(cache_directory=None):
+    """Forgets every chunk image kept in memory and, given a cache directory,
+       deletes the chunk images saved there."""
+
+    memory_cache.clear()
+    if cache_directory is not None:
+        prune_directory(cache_directory, 0)
+
+
+def pillow_color(color):
+    """Returns the Pillow name of the received Tk color name."""
+
+    return color.replace(' ', '')
+
+
+class ImageDrawing:
+    """Represents an image which LevelGraphicsObjects can draw themselves on as
+       if it were a GuiZero Drawing, with the image's top left corner at the
+       received coordinates of the layout."""
+
+    def __init__(self, image, left, top):
+        """Receives the image to draw on and the layout coordinates of its top
+           left corner."""
+
+        self.image_drawing = ImageDraw.Draw(image)
+        self.left = left
+        self.top = top
+
+
+    def shift(self, coordinates):
+        """Returns the received list of alternating x and y layout coordinates
+           as image coordinates."""
+
+        return [coordinate - (self.left if index % 2 == 0 else self.top)
+                for index, coordinate in enumerate(coordinates)]
+
+
+    def rectangle(self, x1, y1, x2, y2, color='black', outline=False,
+                  outline_color='black'):
+        """Draws a rectangle between the received corners, like
+           Drawing.rectangle."""
+
+        self.image_drawing.rectangle(self.shift([x1, y1, x2, y2]),
+                                     fill=pillow_color(color),
+                                     outline=(pillow_color(outline_color)
+                                              if outline else None),
+                                     width=int(outline))
+
+
+    def triangle(self, x1, y1, x2, y2, x3, y3, color='black', outline=False,
+                 outline_color='black'):
+        """Draws a triangle between the received corners, like
+           Drawing.triangle."""
+
+        self.image_drawing.polygon(self.shift([x1, y1, x2, y2, x3, y3]),
+                                   fill=pillow_color(color),
+                                   outline=(pillow_color(outline_color)
+                                            if outline else None))
+
+
+    def oval(self, x1, y1, x2, y2, color='black', outline=False,
+             outline_color='black'):
+        """Draws an oval within the received corners, like Drawing.oval."""
+
+        self.image_drawing.ellipse(self.shift([x1, y1, x2, y2]),
+                                   fill=pillow_color(color),
+                                   outline=(pillow_color(outline_color)
+                                            if outline else None),
+                                   width=int(outline))
@@ -0,0 +1,97 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that chunks of level objects are pre-rendered and cached properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import os
+import sys
+import tempfile
+
+import static_layer
+from layout import Layout
+from level_graphics_objects import Block, LevelEnding
+from viewport import Viewport
+
+# Without Pillow, chunks cannot be rendered, and views should fall back to
+# drawing them shape by shape; the rest of the tests need Pillow.
+if not static_layer.available():
+    assert not Viewport(Layout(file_name='level2.txt')).prerender
+    print('Pillow is not installed; skipping the chunk rendering tests.')
+    sys.exit()
+
+block = Block(x_pos=125, y_pos=75, size=50)
+level_ending = LevelEnding(x_pos=175, y_pos=75, size=50)
+
+with tempfile.TemporaryDirectory() as directory:
+    # A chunk should be rendered relative to its top left corner, with its
+    # objects in their colors and the rest left transparent.
+    image = static_layer.render_chunk([block, level_ending], 100, 50, 102, 52,
+                                      directory)
+    assert image.size == (102, 52)
+    assert image.getpixel((25, 25)) == (255, 255, 255, 255)
+    assert image.getpixel((0, 25)) == (0, 0, 0, 255)
+    assert image.getpixel((75, 25)) == (0, 0, 0, 255)
+    assert image.getpixel((55, 2))[3] == 0
+
+    # The image should be saved to the cache directory and reused from memory.
+    file_names = os.listdir(directory)
+    assert len(file_names) == 1 and file_names[0].endswith('.png')
+    assert static_layer.render_chunk([block, level_ending], 100, 50, 102, 52,
+                                     directory) is image
+
+    # Once forgotten in memory, the image should be loaded from disk.
+    static_layer.memory_cache.clear()
+    reloaded = static_layer.render_chunk([block, level_ending], 100, 50, 102,
+                                         52, directory)
+    assert reloaded is not image
+    assert reloaded.tobytes() == image.tobytes()
+
+    # A chunk with different contents should be rendered again.
+    other = static_layer.render_chunk([block], 100, 50, 102, 52, directory)
+    assert other.getpixel((75, 25))[3] == 0
+    assert len(os.listdir(directory)) == 2
+
+    # Only the chunks used most recently should be kept in memory and on
+    # disk, the rest being forgotten and deleted.
+    saved_limits = (static_layer.MEMORY_CACHE_CHUNKS,
+                    static_layer.DISK_CACHE_CHUNKS)
+    static_layer.MEMORY_CACHE_CHUNKS = 2
+    static_layer.DISK_CACHE_CHUNKS = 2
+    static_layer.clear_cache(directory)
+    assert len(static_layer.memory_cache) == 0 and os.listdir(directory) == []
+
+    chunks = [[Block(x_pos=100 + 50*column, y_pos=50, size=50)]
+              for column in range(3)]
+    file_names = [os.path.join(directory, 'chunk-' +
+                               static_layer.chunk_key(chunk, 100, 50, 202, 52)
+                               + '.png')
+                  for chunk in chunks]
+    images = []
+    for time, chunk in enumerate(chunks[:2]):
+        images.append(static_layer.render_chunk(chunk, 100, 50, 202, 52,
+                                                directory))
+        os.utime(file_names[time], ns=(time, time))
+
+    # Using the first chunk again should keep it over the second.
+    assert static_layer.render_chunk(chunks[0], 100, 50, 202, 52,
+                                     directory) is images[0]
+    os.utime(file_names[0], ns=(5, 5))
+    static_layer.render_chunk(chunks[2], 100, 50, 202, 52, directory)
+    assert len(static_layer.memory_cache) == 2
+    assert sorted(os.listdir(directory)) == sorted(
+        os.path.basename(file_name) for file_name in [file_names[0],
+                                                      file_names[2]])
+    assert static_layer.render_chunk(chunks[0], 100, 50, 202, 52,
+                                     directory) is images[0]
+    assert static_layer.render_chunk(chunks[1], 100, 50, 202, 52,
+                                     directory) is not images[1]
+
+    static_layer.MEMORY_CACHE_CHUNKS, static_layer.DISK_CACHE_CHUNKS = \
+        saved_limits
+    static_layer.clear_cache()
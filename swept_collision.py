@@ -0,0 +1,174 @@
+"""CS 108 A Final Project
+
+Part of the model for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the sweep_avatar function, a continuous (swept box) way of
+moving an Avatar through its layout's tile grid, used by the engine's swept
+collision mode (see engine).
+
+The classic collision mode moves the Avatar by its whole velocity and then
+pushes it back out of every block it overlaps, one block at a time, so a fast
+enough Avatar can pass through a block or be pushed out of the wrong side. The
+swept mode instead moves the Avatar along one axis at a time (horizontally,
+then vertically), stepping through the columns or rows of tiles its leading
+edge crosses and stopping it against the first one holding a block, so it
+stops at the first block in its way at any velocity, and only ever looks at
+the tiles along its path. Spikes are checked against the whole path swept, so
+they cannot be jumped through either.
+
+An Avatar already overlapping a block (which the classic mode can leave it
+in) is not pushed out of it, but is not stopped by it either.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import math
+
+from level_graphics_objects import Block, Spikes
+
+
+def sweep_avatar(layout):
+    """Moves the Avatar of the received Layout by its velocities, stopping it
+       against the first block in its way along each axis and within the
+       layout's boundaries, and returns the list of boxes (left, top, right,
+       bottom) it swept through."""
+
+    avatar = layout.avatar
+    half_size = avatar.size/2
+    swept_boxes = []
+
+    # Move horizontally, along the Avatar's current rows.
+    start_x = avatar.x
+    if avatar.x_vel > 0:
+        column = first_block_column(layout, avatar.x + half_size,
+                                    avatar.x + half_size + avatar.x_vel,
+                                    rows_spanned(layout, avatar))
+        if column is None:
+            avatar.x += avatar.x_vel
+        else:
+            avatar.x = layout.UNIT * column - half_size
+            avatar.x_vel = 0
+    elif avatar.x_vel < 0:
+        column = first_block_column(layout, avatar.x - half_size,
+                                    avatar.x - half_size + avatar.x_vel,
+                                    rows_spanned(layout, avatar))
+        if column is None:
+            avatar.x += avatar.x_vel
+        else:
+            avatar.x = layout.UNIT * (column + 1) + half_size
+            avatar.x_vel = 0
+    swept_boxes.append((min(start_x, avatar.x) - half_size,
+                        avatar.y - half_size,
+                        max(start_x, avatar.x) + half_size,
+                        avatar.y + half_size))
+
+    # Then move vertically, along the Avatar's new columns.
+    start_y = avatar.y
+    if avatar.y_vel > 0:
+        row = first_block_row(layout, avatar.y + half_size,
+                              avatar.y + half_size + avatar.y_vel,
+                              columns_spanned(layout, avatar))
+        if row is None:
+            avatar.y += avatar.y_vel
+        else:
+            avatar.y = layout.UNIT * row - half_size
+            avatar.y_vel = 0
+            avatar.in_air = False
+    elif avatar.y_vel < 0:
+        row = first_block_row(layout, avatar.y - half_size,
+                              avatar.y - half_size + avatar.y_vel,
+                              columns_spanned(layout, avatar))
+        if row is None:
+            avatar.y += avatar.y_vel
+        else:
+            avatar.y = layout.UNIT * (row + 1) + half_size
+            avatar.y_vel = 0
+    swept_boxes.append((avatar.x - half_size,
+                        min(start_y, avatar.y) - half_size,
+                        avatar.x + half_size,
+                        max(start_y, avatar.y) + half_size))
+
+    avatar.stay_in_layout(layout.layout_width, layout.layout_height)
+
+    return swept_boxes
+
+
+def rows_spanned(layout, avatar):
+    """Returns the range of rows of tiles the received Avatar overlaps."""
+
+    return range(math.floor((avatar.y - avatar.size/2) / layout.UNIT),
+                 math.ceil((avatar.y + avatar.size/2) / layout.UNIT))
+
+
+def columns_spanned(layout, avatar):
+    """Returns the range of columns of tiles the received Avatar overlaps."""
+
+    return range(math.floor((avatar.x - avatar.size/2) / layout.UNIT),
+                 math.ceil((avatar.x + avatar.size/2) / layout.UNIT))
+
+
+def crossed_lines(layout, start_edge, end_edge):
+    """Returns the range of indexes of the tiles whose near edges are crossed
+       by an edge moving from start_edge to end_edge (in pixels), in the order
+       they are crossed; an edge only touching a tile does not cross it."""
+
+    if end_edge > start_edge:
+        # Tiles whose left (top) edges are at or past the starting edge and
+        # before the ending edge.
+        return range(math.ceil(start_edge / layout.UNIT),
+                     math.ceil(end_edge / layout.UNIT))
+
+    # Tiles whose right (bottom) edges are at or before the starting edge and
+    # past the ending edge.
+    return range(math.floor(start_edge / layout.UNIT) - 1,
+                 math.floor(end_edge / layout.UNIT) - 1, -1)
+
+
+def first_block_column(layout, start_edge, end_edge, rows):
+    """Returns the first column of tiles crossed by a vertical edge moving
+       from start_edge to end_edge (in pixels) holding a block in any of the
+       received rows, or None if there is none."""
+
+    for column in crossed_lines(layout, start_edge, end_edge):
+        for row in rows:
+            if isinstance(layout.tiles.get((column, row)), Block):
+                return column
+
+    return None
+
+
+def first_block_row(layout, start_edge, end_edge, columns):
+    """Returns the first row of tiles crossed by a horizontal edge moving from
+       start_edge to end_edge (in pixels) holding a block in any of the
+       received columns, or None if there is none."""
+
+    for row in crossed_lines(layout, start_edge, end_edge):
+        for column in columns:
+            if isinstance(layout.tiles.get((column, row)), Block):
+                return row
+
+    return None
+
+
+def swept_spikes(layout, swept_boxes):
+    """Returns whether or not any of the received swept boxes (left, top,
+       right, bottom) overlap the spiked (bottom) half of any Spikes in the
+       received Layout."""
+
+    for left, top, right, bottom in swept_boxes:
+        for row in range(math.floor(top / layout.UNIT),
+                         math.ceil(bottom / layout.UNIT)):
+            for column in range(math.floor(left / layout.UNIT),
+                                math.ceil(right / layout.UNIT)):
+                spikes = layout.tiles.get((column, row))
+                if (isinstance(spikes, Spikes) and
+                    spikes.x - spikes.size/2 < right and
+                    spikes.x + spikes.size/2 > left and
+                    spikes.y + spikes.size/2 > top and
+                    spikes.y < bottom):
+                    return True
+
+    return False
@@ -0,0 +1,124 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that swept collisions stop Avatars at the first block in their way at
+any velocity.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import os
+import random
+import tempfile
+
+from engine import (load_level, step, resolve_collisions,
+                    resolve_swept_motion, LevelState, CLASSIC_COLLISION,
+                    SWEPT_COLLISION, NO_INPUT, MOVE_LEFT, MOVE_RIGHT, JUMP)
+from layout import Layout
+
+
+def write_layout(directory, lines, spawn):
+    """Writes a layout file of the received map lines and spawn line to the
+       received directory and returns its name."""
+
+    file_name = os.path.join(directory, 'level1.txt')
+    with open(file_name, 'w') as level_map:
+        level_map.write('\n'.join(lines + [spawn]))
+    return file_name
+
+
+def overlaps_block(layout):
+    """Returns whether or not the Layout's Avatar overlaps any of its
+       blocks."""
+
+    return any(layout.avatar.colliding_with_block(block)
+               for block in layout.blocks)
+
+
+with tempfile.TemporaryDirectory() as directory:
+    # A wall one tile thick, with the Avatar resting on the floor to its left.
+    file_name = write_layout(directory, ['-----#-----',
+                                         '-----#-----',
+                                         '###########'], '1, 1')
+
+    # Moving far faster than a tile per tick, the classic mode passes through
+    # the wall, while the swept mode stops against it.
+    for collision, final_x in [(CLASSIC_COLLISION, 375),
+                               (SWEPT_COLLISION, 225)]:
+        layout = Layout(file_name)
+        level = LevelState([layout], collision)
+        step(level, NO_INPUT)
+        layout.avatar.x_vel = 300
+        if collision == CLASSIC_COLLISION:
+            layout.avatar.move(layout.layout_width, layout.layout_height)
+            resolve_collisions(level, layout)
+        else:
+            resolve_swept_motion(level, layout)
+        assert layout.avatar.x == final_x
+        assert not overlaps_block(layout)
+
+    # Falling far faster than terminal velocity should land exactly on the
+    # floor, even through the floor of a platform only one tile thick.
+    file_name = write_layout(directory, ['---',
+                                         '---',
+                                         '---',
+                                         '---',
+                                         '###',
+                                         '---'], '1, 5')
+    layout = Layout(file_name)
+    level = LevelState([layout], SWEPT_COLLISION)
+    layout.avatar.y_vel = 199
+    step(level, NO_INPUT)
+    assert layout.avatar.y == 175
+    assert layout.avatar.y_vel == 0
+    assert not layout.avatar.in_air
+
+    # Jumping fast into a ceiling should stop just beneath it.
+    file_name = write_layout(directory, ['###',
+                                         '---',
+                                         '---',
+                                         '---',
+                                         '###'], '1, 1')
+    layout = Layout(file_name)
+    level = LevelState([layout], SWEPT_COLLISION)
+    step(level, NO_INPUT)
+    layout.avatar.y_vel = -300
+    step(level, NO_INPUT)
+    assert layout.avatar.y == 75
+    assert layout.avatar.y_vel == 0
+
+    # Falling fast through spikes should be fatal, even when landing past
+    # them.
+    file_name = write_layout(directory, ['---',
+                                         '---',
+                                         '-^-',
+                                         '---',
+                                         '###'], '1, 4')
+    layout = Layout(file_name)
+    level = LevelState([layout], SWEPT_COLLISION)
+    layout.avatar.y_vel = 149
+    step(level, NO_INPUT)
+    assert level.num_deaths == 1
+    assert layout.avatar.y == layout.avatar.starting_y
+
+# Playing the real levels at random, swept Avatars should never end a tick
+# inside a block.
+generator = random.Random(16)
+for level_id in range(1, 4):
+    level = load_level(level_id, collision=SWEPT_COLLISION)
+    for tick in range(1500):
+        if tick % 15 == 0:
+            inputs = generator.choice([NO_INPUT, MOVE_LEFT, MOVE_RIGHT, JUMP,
+                                       MOVE_LEFT | JUMP, MOVE_RIGHT | JUMP])
+        step(level, inputs)
+        for layout in level.layouts:
+            assert not overlaps_block(layout)
+
+try:
+    LevelState([], 'sideways')
+    assert False
+except ValueError:
+    pass
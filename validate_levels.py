@@ -0,0 +1,263 @@
+"""CS 108 A Final Project
+
+Part of the "Out of Sync" parallel-dimensional 2D platforming puzzle, supplying
+the validate_levels function, which finds every level in a directory (each a
+'level#.txt' and 'level#a.txt' file, and any further 'level#b.txt', ...
+dimension files) and checks them all at once across a pool of processes,
+producing a single JSON report.
+
+Each level is checked for:
+ - parse: every layout file follows the layout file format and can be loaded
+ - spawn: each Avatar starts inside its layout, clear of blocks and spikes
+ - exits: each Avatar can reach an exit of its own layout
+ - solvable: every layout can be beaten together under the same inputs
+ - records: the level's record in the records database (see records), if any,
+   is a positive number, as is any old 'min_attempts#.txt' record file still to
+   be copied into it (which may also be empty)
+
+Run this file to validate a directory from the command line, e.g.
+'python validate_levels.py . --output report.json'.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from engine import LevelState
+from layout import Layout
+from level_index import find_levels, level_file_paths
+from records import read_records
+from solver import LayoutGraph, UNREACHABLE, solve
+
+# The names of the checks, in the order they are run.
+CHECK_NAMES = ['parse', 'spawn', 'exits', 'solvable', 'records']
+
+
+def check_layout_file(file_name):
+    """Returns a list of problems (strings) with the format of the received
+       layout file; an empty list means the file can be loaded."""
+
+    if not os.path.exists(file_name):
+        return [file_name + ' is missing']
+
+    with open(file_name) as level_map:
+        map_lines = [line.rstrip('\r\n') for line in level_map.readlines()]
+
+    return check_layout_lines(file_name, map_lines)
+
+
+def check_layout_lines(file_name, map_lines):
+    """Returns a list of problems (strings) with the format of the received
+       list of lines (without line endings) of the layout file of the received
+       name; an empty list means the lines can be parsed."""
+
+    if len(map_lines) < 2:
+        return [file_name + ' needs at least one map line and a spawn line']
+
+    problems = []
+    width = len(map_lines[0].strip())
+    for line_index, line in enumerate(map_lines[:-1]):
+        if line.strip() == '':
+            problems.append(file_name + ' line ' + str(line_index + 1) +
+                            ' is empty')
+        elif len(line.strip()) != width:
+            problems.append(file_name + ' line ' + str(line_index + 1) +
+                            ' is ' + str(len(line.strip())) +
+                            ' characters wide, but the top line is ' +
+                            str(width))
+
+    avatar_coords = map_lines[-1].split(',')
+    try:
+        if len(avatar_coords) != 2:
+            raise ValueError
+        float(avatar_coords[0].strip())
+        float(avatar_coords[1].strip())
+    except ValueError:
+        problems.append(file_name + ' spawn line ' + repr(map_lines[-1]) +
+                        " is not in the format '#, #'")
+
+    return problems
+
+
+def spawn_problems(file_name, layout):
+    """Returns a list of problems (strings) with the spawn point of the
+       received Layout, loaded from the received file."""
+
+    avatar = layout.avatar
+    problems = []
+
+    if (avatar.x - avatar.size/2 < 0 or
+        avatar.x + avatar.size/2 > layout.layout_width or
+        avatar.y - avatar.size/2 < 0 or
+        avatar.y + avatar.size/2 > layout.layout_height):
+        problems.append(file_name + ' spawn point is outside of the layout')
+
+    for block in layout.blocks:
+        if avatar.colliding_with_block(block):
+            problems.append(file_name + ' spawn point is inside a block')
+            break
+
+    for spikes in layout.spikes:
+        if avatar.is_impaled(spikes):
+            problems.append(file_name + ' spawn point is on spikes')
+            break
+
+    return problems
+
+
+def record_problems(directory, level_id):
+    """Returns a list of problems (strings) with the records of the level of
+       the received level ID (int) in the received directory."""
+
+    problems = []
+
+    file_name = os.path.join(directory,
+                             'min_attempts' + str(level_id) + '.txt')
+    if os.path.exists(file_name):
+        with open(file_name) as min_attempts:
+            score = min_attempts.readline().strip()
+        if score != '' and not (score.isdigit() and int(score) > 0):
+            problems.append(file_name + ' holds ' + repr(score) +
+                            ', not a positive number')
+
+    record = read_records(directory).get(level_id)
+    if record is not None and record < 1:
+        problems.append('the record of level ' + str(level_id) + ' is ' +
+                        str(record) + ', not a positive number')
+
+    return problems
+
+
+def validate_level(directory, level_id, max_states=None):
+    """Runs every check on the level of the received level ID (int) in the
+       received directory, searching at most max_states joint states for a
+       solution if max_states is not None, and returns a dictionary report of
+       the results and timings."""
+
+    start_time = perf_counter()
+    file_names = level_file_paths(directory, level_id)
+    checks = {}
+
+    def record(check_name, check_start_time, problems, **details):
+        checks[check_name] = dict(passed=not problems, problems=problems,
+                                  seconds=perf_counter() - check_start_time,
+                                  **details)
+
+    check_start_time = perf_counter()
+    problems = []
+    for file_name in file_names:
+        problems += check_layout_file(file_name)
+    layouts = []
+    if not problems:
+        try:
+            layouts = [Layout(file_name) for file_name in file_names]
+        except Exception as error:
+            problems.append('loading failed: ' + repr(error))
+    record('parse', check_start_time, problems)
+
+    if layouts:
+        check_start_time = perf_counter()
+        problems = []
+        for file_name, layout in zip(file_names, layouts):
+            problems += spawn_problems(file_name, layout)
+        record('spawn', check_start_time, problems)
+
+        check_start_time = perf_counter()
+        graphs = [LayoutGraph(layout) for layout in layouts]
+        problems = []
+        ticks_to_exit = []
+        for file_name, graph in zip(file_names, graphs):
+            ticks = graph.ticks_to_exit[graph.spawn_ids[False]]
+            if ticks == UNREACHABLE:
+                problems.append(file_name + ' has no exit its Avatar can reach')
+                ticks_to_exit.append(None)
+            else:
+                ticks_to_exit.append(ticks)
+        record('exits', check_start_time, problems,
+               ticks_to_exit=ticks_to_exit)
+
+        check_start_time = perf_counter()
+        solution = solve(LevelState(layouts), max_states, graphs)
+        if solution.solvable:
+            problems = []
+        elif solution.complete:
+            problems = ['no inputs beat every layout together']
+        else:
+            problems = ['no solution found within ' + str(max_states) +
+                        ' states']
+        record('solvable', check_start_time, problems,
+               solution_ticks=solution.solvable and len(solution.inputs) or None,
+               num_states=solution.num_states)
+
+    check_start_time = perf_counter()
+    record('records', check_start_time, record_problems(directory, level_id))
+
+    passed = len(checks) == len(CHECK_NAMES) and all(
+        check['passed'] for check in checks.values())
+
+    return dict(level_id=level_id, files=file_names,
+                passed=passed, checks=checks,
+                seconds=perf_counter() - start_time)
+
+
+def validate_levels(directory, max_states=None, max_workers=None):
+    """Validates every level in the received directory across a pool of at
+       most max_workers processes (one per CPU core if None), and returns a
+       dictionary report of every level's results."""
+
+    start_time = perf_counter()
+    # Levels missing layout files are validated too, so they are reported.
+    level_ids = find_levels(directory, complete_only=False)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        levels = list(executor.map(validate_level,
+                                   [directory] * len(level_ids), level_ids,
+                                   [max_states] * len(level_ids)))
+
+    return dict(directory=os.path.abspath(directory),
+                passed=all(level['passed'] for level in levels),
+                levels=levels, seconds=perf_counter() - start_time)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Check every level in a directory across all CPU cores.')
+    parser.add_argument('directory', nargs='?', default='.')
+    parser.add_argument('--output', help='file to write the JSON report to '
+                                         '(printed if not given)')
+    parser.add_argument('--max-states', type=int, default=None,
+                        help='joint states to search per level before giving '
+                             'up on finding a solution')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes')
+    arguments = parser.parse_args()
+
+    report = validate_levels(arguments.directory, arguments.max_states,
+                             arguments.workers)
+
+    if arguments.output:
+        with open(arguments.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    for level in report['levels']:
+        failures = [name for name in CHECK_NAMES
+                    if name in level['checks'] and
+                    not level['checks'][name]['passed']]
+        print('Level ' + str(level['level_id']) + ': ' +
+              ('passed' if level['passed'] else
+               'FAILED ' + ', '.join(failures)) +
+              ' (' + str(round(level['seconds'], 2)) + ' s)', file=sys.stderr)
+
+    sys.exit(0 if report['passed'] else 1)
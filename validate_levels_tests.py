@@ -0,0 +1,60 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that level files are validated properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import os
+import tempfile
+
+from validate_levels import find_levels, validate_level, validate_levels
+
+# Every level shipped with the game should be found.
+assert find_levels('.') == [1, 2, 3, 4]
+
+# Level 4 has four dimensions, which should all be checked and beaten
+# together.
+report = validate_level('.', 4)
+assert report['passed']
+assert [os.path.basename(file_name) for file_name in report['files']] == \
+    ['level4.txt', 'level4a.txt', 'level4b.txt', 'level4c.txt']
+assert len(report['checks']['exits']['ticks_to_exit']) == 4
+
+# Level 3 has no exits, so it should parse but fail the exit and solvability
+# checks.
+report = validate_level('.', 3)
+assert not report['passed']
+assert report['checks']['parse']['passed']
+assert report['checks']['spawn']['passed']
+assert not report['checks']['exits']['passed']
+assert not report['checks']['solvable']['passed']
+assert report['checks']['records']['passed']
+
+# A level with a ragged map and a corrupt old record file, and a level missing
+# its alt layout, should fail the matching checks (skipping the checks which
+# need loaded layouts), in a report covering every level found.
+with tempfile.TemporaryDirectory() as directory:
+    with open(os.path.join(directory, 'level8.txt'), 'w') as level_map:
+        level_map.write('---@\n####\n0, 0')
+    with open(os.path.join(directory, 'level7.txt'), 'w') as level_map:
+        level_map.write('---@\n-----\n####\n0, 0')
+    with open(os.path.join(directory, 'level7a.txt'), 'w') as level_map:
+        level_map.write('---@\n----\n####\n0, -1')
+    with open(os.path.join(directory, 'min_attempts7.txt'), 'w') as record:
+        record.write('many')
+    report = validate_levels(directory, max_workers=1)
+
+assert not report['passed']
+assert [level['level_id'] for level in report['levels']] == [7, 8]
+checks = report['levels'][0]['checks']
+assert not checks['parse']['passed']
+assert 'spawn' not in checks
+assert not checks['records']['passed']
+checks = report['levels'][1]['checks']
+assert not checks['parse']['passed']
+assert checks['parse']['problems'][0].endswith('level8a.txt is missing')
@@ -0,0 +1,222 @@
+"""CS 108 A Final Project
+
+Part of the GUI view for the "Out of Sync" parallel-dimensional 2D platforming
+puzzle, supplying the Viewport class, which shows a window-sized part of a
+Layout's Drawing, scrolling to follow the Avatar through levels larger than the
+window, and only keeps the level objects near the visible part drawn.
+
+The layout is divided into square chunks of tiles (a single chunk, if the whole
+layout fits in the view). Every chunk within one chunk of the visible part of
+the layout has its objects drawn; chunks are drawn and deleted as the view
+scrolls, so the number of canvas items depends on the size of the window
+rather than the size of the level. Each chunk is drawn as a single pre-rendered
+image when possible (see static_layer).
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+
+"""
+
+import os
+
+import static_layer
+from level_cache import CACHE_DIRECTORY_NAME
+
+# The largest Drawing size (in pixels) shown for a layout; larger layouts are
+# scrolled. Big enough to show every level shipped with the game in full.
+MAX_VIEW_WIDTH = 1401
+MAX_VIEW_HEIGHT = 801
+
+# The width and height, in tiles, of the chunks the layout is drawn in.
+CHUNK_TILES = 8
+
+
+class Viewport:
+    """Represents the visible part of a Layout's Drawing and the chunks of the
+       layout currently drawn on it."""
+
+    def __init__(self, layout, max_width=MAX_VIEW_WIDTH,
+                 max_height=MAX_VIEW_HEIGHT, chunk_tiles=CHUNK_TILES,
+                 prerender=True):
+        """Receives the Layout to show, the largest size (in pixels) to show of
+           it at once, the width and height of its chunks in tiles, and whether
+           or not to draw chunks as pre-rendered images when possible."""
+
+        self.layout = layout
+        self.width = min(layout.layout_width, max_width)
+        self.height = min(layout.layout_height, max_height)
+
+        # A layout which fits in the view is drawn as a single chunk.
+        if (self.width == layout.layout_width and
+            self.height == layout.layout_height):
+            chunk_tiles = max(layout.width_in_layout_units,
+                              layout.height_in_layout_units, 1)
+        self.chunk_size = chunk_tiles * layout.UNIT
+
+        self.prerender = prerender and static_layer.available()
+        # Rendered chunks are cached beside the layout's file.
+        self.cache_directory = os.path.join(
+            os.path.dirname(os.path.abspath(layout.file_name)),
+            CACHE_DIRECTORY_NAME)
+
+        # The layout's objects grouped by chunk, each group in drawing order
+        # (exits, then blocks, then spikes).
+        self.chunk_objects = {}
+        for level_objects in [layout.exits, layout.blocks, layout.spikes]:
+            for level_object in level_objects:
+                chunk = (int(level_object.x // self.chunk_size),
+                         int(level_object.y // self.chunk_size))
+                self.chunk_objects.setdefault(chunk, []).append(level_object)
+
+        # The Drawing IDs of the items of each chunk currently drawn.
+        self.chunk_graphics = {}
+
+        # The position of the top left corner of the view within the layout.
+        self.left = None
+        self.top = None
+
+
+    def start(self):
+        """Sizes the layout's Drawing to the view and lets it scroll over the
+           whole layout."""
+
+        drawing = self.layout.drawing
+        drawing.width = self.width
+        drawing.height = self.height
+        drawing.tk.configure(scrollregion=(0, 0, self.layout.layout_width,
+                                           self.layout.layout_height))
+
+
+    def follow(self, avatar):
+        """Centers the view on the received Avatar (without going past the edges
+           of the layout), scrolling the Drawing and drawing or deleting chunks
+           as needed; does nothing if the view has not moved."""
+
+        left, top = self.position_for(avatar)
+
+        if (left, top) == (self.left, self.top):
+            return
+        self.left = left
+        self.top = top
+
+        canvas = self.layout.drawing.tk
+        canvas.xview_moveto(left / self.layout.layout_width)
+        canvas.yview_moveto(top / self.layout.layout_height)
+
+        self.update_chunks()
+
+
+    def position_for(self, avatar):
+        """Returns the (left, top) position of the view centered on the
+           received Avatar, without going past the edges of the layout."""
+
+        left = int(min(max(avatar.x - self.width/2, 0),
+                       self.layout.layout_width - self.width))
+        top = int(min(max(avatar.y - self.height/2, 0),
+                      self.layout.layout_height - self.height))
+
+        return left, top
+
+
+    def prepare(self, avatar):
+        """Renders the images of the chunks which will be drawn when the view
+           first follows the received Avatar, without touching the Drawing, so
+           it can be done away from the GUI (e.g. on a worker thread) and
+           drawing them later only needs the cached images (see
+           static_layer)."""
+
+        if not self.prerender:
+            return
+
+        left, top = self.position_for(avatar)
+        for chunk in self.visible_chunks(left, top):
+            static_layer.render_chunk(self.chunk_objects[chunk],
+                                      *self.chunk_bounds(chunk),
+                                      self.cache_directory)
+
+
+    def visible_chunks(self, left=None, top=None):
+        """Returns the set of chunks within one chunk of the view, or of a view
+           at the received left and top position."""
+
+        if left is None:
+            left, top = self.left, self.top
+
+        first_column = left//self.chunk_size - 1
+        last_column = (left + self.width)//self.chunk_size + 1
+        first_row = top//self.chunk_size - 1
+        last_row = (top + self.height)//self.chunk_size + 1
+
+        chunks = set()
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                if (column, row) in self.chunk_objects:
+                    chunks.add((column, row))
+
+        return chunks
+
+
+    def update_chunks(self):
+        """Draws the chunks which have come near the view and deletes the
+           chunks which have left it."""
+
+        drawing = self.layout.drawing
+        visible_chunks = self.visible_chunks()
+
+        for chunk in list(self.chunk_graphics):
+            if chunk not in visible_chunks:
+                for graphic in self.chunk_graphics.pop(chunk):
+                    drawing.delete(graphic)
+
+        for chunk in visible_chunks:
+            if chunk not in self.chunk_graphics:
+                self.chunk_graphics[chunk] = self.draw_chunk(chunk)
+
+        # Keep the avatar in front of newly drawn chunks.
+        if self.layout.avatar_graphic is not None:
+            drawing.tk.tag_raise(self.layout.avatar_graphic)
+
+
+    def draw_chunk(self, chunk):
+        """Draws the objects of the received chunk and returns a list of the
+           Drawing IDs of their items."""
+
+        if self.prerender:
+            left, top, width, height = self.chunk_bounds(chunk)
+            image = static_layer.render_chunk(self.chunk_objects[chunk],
+                                              left, top, width, height,
+                                              self.cache_directory)
+            return [self.layout.drawing.image(left, top, image)]
+
+        graphics = []
+        for level_object in self.chunk_objects[chunk]:
+            graphic = level_object.draw(self.layout.drawing)
+            # Spikes are drawn as several items.
+            if isinstance(graphic, list):
+                graphics.extend(graphic)
+            else:
+                graphics.append(graphic)
+
+        return graphics
+
+
+    def chunk_bounds(self, chunk):
+        """Returns the (left, top, width, height), in pixels, of the image of
+           the received chunk."""
+
+        # Chunks along the far edges of the layout stop at its edges; leave
+        # room past them for the outlines of the objects along them.
+        left = chunk[0] * self.chunk_size
+        top = chunk[1] * self.chunk_size
+        width = min(self.chunk_size, self.layout.layout_width - left) + 2
+        height = min(self.chunk_size, self.layout.layout_height - top) + 2
+
+        return left, top, width, height
+
+
+    def num_graphics(self):
+        """Returns the number of canvas items drawn for the layout's chunks."""
+
+        return sum(len(graphics) for graphics in self.chunk_graphics.values())
@@ -0,0 +1,107 @@
+"""CS 108 A Final Project
+
+Tests for the "Out of Sync" parallel-dimensional 2D platforming puzzle which
+ensure that large layouts are scrolled and culled properly.
+
+@author: Jason Chew (jgc23)
+@author: Serita Nelesen (smn4)
+@author: Keith Vander Linden (kvlinden)
+@date: Fall, 2021
+"""
+
+import os
+import tempfile
+
+import static_layer
+from layout import Layout
+from viewport import MAX_VIEW_WIDTH, MAX_VIEW_HEIGHT
+
+
+class RecordingDrawing:
+    """A stand-in for a GuiZero Drawing which records the canvas items drawn
+       on it and how it is scrolled."""
+
+    def __init__(self):
+        self.tk = self
+        self.items = set()
+        self.next_item = 0
+        self.scroll = None
+        self.width = None
+        self.height = None
+        self.bg = None
+
+    def add_item(self, *args, **kwargs):
+        self.next_item += 1
+        self.items.add(self.next_item)
+        return self.next_item
+
+    rectangle = triangle = oval = line = image = add_item
+
+    def delete(self, item):
+        self.items.remove(item)
+
+    def coords(self, *args):
+        pass
+
+    def configure(self, scrollregion):
+        self.scrollregion = scrollregion
+
+    def xview_moveto(self, fraction):
+        self.scroll = (fraction, self.scroll and self.scroll[1])
+
+    def yview_moveto(self, fraction):
+        self.scroll = (self.scroll[0], fraction)
+
+    def tag_raise(self, item):
+        pass
+
+
+# A small level should be shown whole, with every object drawn.
+layout = Layout(file_name='level2.txt', drawing=RecordingDrawing())
+layout.draw()
+assert layout.drawing.width == layout.layout_width
+assert layout.drawing.height == layout.layout_height
+if static_layer.available():
+    # The whole layout should be drawn as a single pre-rendered image (along
+    # with the bottom line and the avatar).
+    assert layout.viewport.num_graphics() == 1
+    assert len(layout.drawing.items) == 3
+else:
+    num_items = (1 + len(layout.blocks) + 4 * len(layout.spikes) +
+                 len(layout.exits) + 1)
+    assert len(layout.drawing.items) == num_items
+
+with tempfile.TemporaryDirectory() as directory:
+    # A level 400 tiles wide with a floor of blocks and spikes.
+    file_name = os.path.join(directory, 'level1.txt')
+    with open(file_name, 'w') as level_map:
+        for row in range(19):
+            level_map.write('-' * 400 + '\n')
+        level_map.write('#^' * 200 + '\n')
+        level_map.write('0, 1')
+
+    # A large level should only be shown a window's worth at a time, with only
+    # the objects near the window drawn.
+    layout = Layout(file_name=file_name, drawing=RecordingDrawing())
+    layout.draw()
+    assert layout.drawing.width == MAX_VIEW_WIDTH
+    assert layout.drawing.height == MAX_VIEW_HEIGHT
+    assert layout.drawing.scroll == (0, (layout.layout_height -
+                                         MAX_VIEW_HEIGHT) /
+                                     layout.layout_height)
+    items_at_start = len(layout.drawing.items)
+    assert items_at_start < len(layout.blocks) + 4 * len(layout.spikes)
+
+    # Moving the avatar far to the right should scroll the view to keep it
+    # centered, replacing the drawn objects with the ones near it.
+    layout.avatar.x += 10000
+    layout.update_view()
+    assert layout.viewport.left == int(layout.avatar.x - MAX_VIEW_WIDTH/2)
+    assert layout.drawing.scroll[0] == (layout.viewport.left /
+                                        layout.layout_width)
+    assert len(layout.drawing.items) <= items_at_start + 5 * 8
+
+    # The view should stop at the right edge of the layout.
+    layout.avatar.x = layout.layout_width
+    layout.update_view()
+    assert layout.viewport.left == layout.layout_width - MAX_VIEW_WIDTH